@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import argparse
 import sys
 from typing import Optional
 
-from .game_loop import abilities_bar, handle_ability_selection, load_content_and_init, render_ascii, try_move, end_combat_turn
-from ..engine.content import load_shop
+from .game_loop import CONTENT_DIR, abilities_bar, apply_content_changes, handle_ability_selection, load_content_and_init, render_ascii, try_move, end_combat_turn
+from ..engine.content import ContentWatcher, load_shop
 from ..engine.inventory import get_item_by_id
 from pathlib import Path
 from ..engine.content import load_shop
@@ -34,9 +35,10 @@ def draw(state, inventory_mode: bool = False, selected_item: int = 0, selected_t
 		print(f"\n🎯 COMBAT MODE - Turn {state.combat_state.current_turn}")
 		print("=" * 60)
 		print(f"👤 YOU:     HP:{state.player.get_total_stats().current_hp:3d}/{state.player.get_total_stats().hp:3d} | AP:{state.combat_state.player_ap:2d} | MP:{state.combat_state.player_mp:2d}")
-		if state.combat_state.monsters:
-			monster = state.combat_state.monsters[0]
-			print(f"👹 ENEMY:   HP:{monster.stats.current_hp:3d}/{monster.stats.hp:3d} | AP:{state.combat_state.monster_ap:2d} | MP:{state.combat_state.monster_mp:2d}")
+		for monster in state.combat_state.monsters[:6]:
+			print(f"👹 ENEMY:   HP:{monster.stats.current_hp:3d}/{monster.stats.hp:3d} | AP:{monster.combat_ap:2d} | MP:{monster.combat_mp:2d} | {monster.position}")
+		if len(state.combat_state.monsters) > 6:
+			print(f"👹 ... and {len(state.combat_state.monsters) - 6} more")
 		print("=" * 60)
 		print(f"📋 Phase: {state.combat_state.current_phase.upper()}")
 		if getattr(state, 'targeting_mode', False) and getattr(state, 'target_cursor', None) is not None:
@@ -183,7 +185,13 @@ def read_key() -> str:
 
 
 def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Terminal Dofus-like")
+	parser.add_argument("--watch", action="store_true", help="reload edited content files while playing")
+	args = parser.parse_args(argv)
 	state = load_content_and_init()
+	watcher = ContentWatcher(CONTENT_DIR) if args.watch else None
+	if watcher is not None:
+		watcher.start()
 	inventory_mode = False
 	selected_item = 0
 	selected_tab = 0
@@ -257,7 +265,7 @@ def main(argv: Optional[list[str]] = None) -> int:
 					item_model = shop.items[shop_selected]
 					item = get_item_by_id(item_model.item_id)
 					if item and state.player.can_afford(item_model.price):
-						state.player.gold -= item_model.price
+						state.player.add_gold(-item_model.price)
 						state.player.inventory.add_item(item)
 						state.log.entries.append(f"Bought {item.name} for {item_model.price}")
 				elif ch == "\x1b":
@@ -289,6 +297,8 @@ def main(argv: Optional[list[str]] = None) -> int:
 				end_combat_turn(state.combat_state)
 			elif ch == "h":
 				state.log.entries.append("help shown")
+		if watcher is not None:
+			apply_content_changes(state, watcher.drain())
 		draw(state, inventory_mode, selected_item, selected_tab)
 		if shop_mode:
 			adj = None
@@ -303,6 +313,8 @@ def main(argv: Optional[list[str]] = None) -> int:
 					marker = "▶" if i == shop_selected else " "
 					print(f" {marker} {it.item_id} - {it.price} gold")
 				print("Enter: Buy | Esc: Close")
+	if watcher is not None:
+		watcher.stop()
 	return 0
 
 
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Set, Tuple, Optional
 
-from ..engine.ability import Ability, REGISTRY, register, create_weapon_abilities, get_abilities_for_weapon, in_range
-from ..engine.combat import CombatState, CombatArena, IntentLog, validate_in_bounds_and_log, resolve_ability_effects, check_combat_trigger, end_combat_turn, render_combat_arena, try_move_in_combat, has_line_of_sight
-from ..engine.content import MapModel, MonsterModel, SpellModel, AbilityModel, load_map, load_monster, load_spells, load_abilities
+from ..engine.ability import Ability, REGISTRY, register, swap_abilities, create_weapon_abilities, get_abilities_for_weapon, in_range
+from ..engine.effects import Damage, Push, BuffAp, Charge
+from ..engine.combat import CombatState, IntentLog, arena_for, validate_in_bounds_and_log, resolve_ability_effects, check_combat_trigger, end_combat_turn, render_combat_arena, render_combat_arena_with_cursor, try_move_in_combat, has_line_of_sight
+from ..engine.ai import SearchPolicy
+from ..engine.content import ContentChange, MapModel, MonsterModel, SpellModel, AbilityModel, load_map, load_monster, load_spells, load_abilities
 from ..engine.entities import Player, Monster, Merchant, Npc, Portal
+from ..engine.chunks import ChunkedGrid, make_grid_from_cells
 from ..engine.grid import Grid
+from ..engine.monster_store import MonsterStore, MonsterView
+from ..engine.pathfinding import MapLayout, RouteLeg, astar, find_path, plan_route
+from ..engine.procgen import generate_zone, nearest_open, zone_seed
 from ..engine.stats import Stats
+from ..engine.tags import MELEE, RANGED
 from ..engine.progression import Progression, WeaponSkills
+from ..engine.targeting import CastOverlay, OverlayCache
 from ..engine.inventory import Inventory, EquipmentSlots, get_item_by_id
 from ..engine.quests import QuestLog, get_quest_by_id, check_quest_requirements
 from ..engine.progression import WeaponSkills
@@ -18,12 +27,26 @@ from ..engine.progression import WeaponSkills
 
 CONTENT_DIR = Path(__file__).resolve().parents[1] / "content"
 
+# Zones whose terrain comes from the generator (kind, width, height) instead of the
+# blocked list in their map file; the seed comes from GameState.world_seed
+PROCEDURAL_ZONES: Dict[str, Tuple[str, int, int]] = {
+	"zone_exploration": ("caves", 256, 256),
+	"zone_dungeon": ("rooms", 96, 64),
+}
+
+# Monsters per fight on maps that host group encounters; anything else is a duel
+ENCOUNTER_SIZES: Dict[str, int] = {
+	"zone_dungeon": 5,
+	"zone_daily_boss": 8,
+	"zone_raid": 20,
+}
+
 
 @dataclass
 class GameState:
-	grid: Grid
+	grid: Grid | ChunkedGrid
 	player: Player
-	monsters: List[Monster]
+	monsters: List[Monster] | MonsterStore
 	merchants: List[Merchant]
 	map_name: str
 	log: IntentLog
@@ -33,11 +56,15 @@ class GameState:
 	combat_state: Optional[CombatState] = None
 	in_combat: bool = False
 	player_world_pos: Optional[Tuple[int, int]] = None
+	ai_budget_ms: float = 20.0
+	encounter_size: int = 1
+	world_seed: int = 0
+	map_id: str = "zone_001"
+	cast_overlays: OverlayCache = field(default_factory=OverlayCache, repr=False)
 
 
 def build_grid_from_map(m: MapModel) -> Grid:
-	blocked = {(c.x, c.y) for c in m.blocked}
-	return Grid(width=m.width, height=m.height, blocked=set(blocked))
+	return make_grid_from_cells(m.width, m.height, m.cells())
 
 
 def create_monster_from_model(model: MonsterModel, position: Tuple[int, int]) -> Monster:
@@ -52,7 +79,8 @@ def create_monster_from_model(model: MonsterModel, position: Tuple[int, int]) ->
 			res=model.stats.res
 		),
 		position=position,
-		tags=set(model.tags)
+		tags=set(model.tags),
+		abilities=list(model.abilities)
 	)
 
 
@@ -102,6 +130,20 @@ def create_player_with_progression() -> Player:
 	return player
 
 
+def ability_from_model(m: SpellModel | AbilityModel) -> Ability:
+	effects = []
+	for e in m.effects:
+		if e.type == "damage" and e.amount is not None:
+			effects.append(Damage(amount=e.amount))
+		elif e.type == "push" and e.distance is not None:
+			effects.append(Push(distance=e.distance))
+		elif e.type == "buff_ap" and e.amount is not None and e.duration is not None:
+			effects.append(BuffAp(amount=e.amount, duration=e.duration))
+		elif e.type == "charge" and e.amount is not None:
+			effects.append(Charge(amount=e.amount))
+	return Ability(id=m.id, name=m.name, tags=m.tags, cost_ap=m.cost_ap, range_min=m.range_min, range_max=m.range_max, effects=effects, weapon_type=getattr(m, "weapon_type", ""), area_shape=m.area.shape, area_size=m.area.size)
+
+
 def load_content_and_init() -> GameState:
 	map_model = load_map(CONTENT_DIR / "maps" / "zone_001.json")
 	monster_model = load_monster(CONTENT_DIR / "monsters" / "slime.json")
@@ -109,23 +151,15 @@ def load_content_and_init() -> GameState:
 	# Load abilities from JSON if present; fallback to built-ins
 	abilities_path = CONTENT_DIR / "abilities" / "weapons.json"
 	if abilities_path.exists():
-		models = load_abilities(abilities_path)
-		from ..engine.ability import Ability, register
-		from ..engine.effects import Damage, Push, BuffAp, Charge
-		for m in models:
-			effects = []
-			for e in m.effects:
-				if e.type == "damage" and e.amount is not None:
-					effects.append(Damage(amount=e.amount))
-				elif e.type == "push" and e.distance is not None:
-					effects.append(Push(distance=e.distance))
-				elif e.type == "buff_ap" and e.amount is not None and e.duration is not None:
-					effects.append(BuffAp(amount=e.amount, duration=e.duration))
-				elif e.type == "charge" and e.amount is not None:
-					effects.append(Charge(amount=e.amount))
-			register(Ability(id=m.id, name=m.name, tags=m.tags, cost_ap=m.cost_ap, range_min=m.range_min, range_max=m.range_max, effects=effects, weapon_type=m.weapon_type))
+		for m in load_abilities(abilities_path):
+			register(ability_from_model(m))
 	else:
 		create_weapon_abilities()
+	# Monster spells are registered without a weapon type so they never show on the player's bar
+	spells_path = CONTENT_DIR / "spells" / "basic.json"
+	if spells_path.exists():
+		for m in load_spells(spells_path):
+			register(ability_from_model(m))
 	
 	grid = build_grid_from_map(map_model)
 	player = create_player_with_progression()
@@ -145,13 +179,7 @@ def load_content_and_init() -> GameState:
 	npcs = [
 		Npc(id="npc1", name="Villager", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=(3, 2), tags={"npc"}, dialogue_id="greeting_1")
 	]
-	portals = [
-		Portal(id="p_db", name="Daily Boss", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=(8, 8), tags={"portal"}, destination_id="zone_daily_boss", kind="daily_boss", state="available"),
-		Portal(id="p_ex", name="Exploration", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=(12, 6), tags={"portal"}, destination_id="zone_exploration", kind="exploration", state="available"),
-		Portal(id="p_dg", name="Dungeon", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=(6, 12), tags={"portal"}, destination_id="zone_dungeon", kind="dungeon", state="available"),
-		Portal(id="p_pv", name="PvP Arena", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=(16, 10), tags={"portal"}, destination_id="zone_pvp", kind="pvp", state="locked"),
-		Portal(id="p_rd", name="Raid", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=(20, 8), tags={"portal"}, destination_id="zone_raid", kind="raid", state="locked"),
-	]
+	portals = zone_portals("zone_001", grid, player.position)
 	return GameState(
 		grid=grid,
 		player=player,
@@ -165,6 +193,44 @@ def load_content_and_init() -> GameState:
 	)
 
 
+def refresh_monster(monster: Monster, model: MonsterModel) -> None:
+	s = model.stats
+	monster.name = model.name
+	monster.stats.rebase(s.hp, s.ap, s.mp, s.atk, s.res)
+	monster.tags = set(model.tags)
+	monster.abilities = list(model.abilities)
+
+
+# Applies what a ContentWatcher reloaded: abilities and spells are swapped in the
+# registry (bars and cast overlays pick them up on the next frame), live monsters of
+# a changed kind get the new stats and abilities, and cached map layouts are dropped
+# so the next visit reads the new file. Files that failed validation change nothing.
+def apply_content_changes(state: GameState, changes: List[ContentChange]) -> None:
+	for change in changes:
+		name = change.path.name
+		if change.error is not None:
+			state.chat.add("System", f"Reload of {name} failed, keeping the old content: {change.error.splitlines()[0]}")
+			continue
+		if change.kind in ("abilities", "spells"):
+			swap_abilities([ability_from_model(m) for m in change.models], change.removed)
+			state.cast_overlays.invalidate()
+		elif change.kind == "monsters":
+			models = {m.id: m for m in change.models}
+			if isinstance(state.monsters, MonsterStore):
+				for model in models.values():
+					state.monsters.update_kind(create_monster_from_model(model, (0, 0)))
+			live = [] if isinstance(state.monsters, MonsterStore) else list(state.monsters)
+			if state.combat_state is not None:
+				live.extend(state.combat_state.monsters)
+			for monster in live:
+				model = models.get(monster.id)
+				if model is not None:
+					refresh_monster(monster, model)
+		elif change.kind == "maps":
+			_zone_layout.cache_clear()
+		state.chat.add("System", f"Reloaded {name}")
+
+
 @dataclass
 class ChatMessage:
 	timestamp: str
@@ -182,32 +248,84 @@ class ChatLog:
 		self.entries.append(ChatMessage(timestamp=datetime.now().strftime("%H:%M"), author=author, text=text, type=type))
 
 
-def travel_to_map(state: GameState, destination_id: str) -> None:
-	path = CONTENT_DIR / "maps" / f"{destination_id}.json"
-	model = load_map(path)
-	state.grid = build_grid_from_map(model)
-	state.map_name = model.name
-	state.in_combat = False
-	state.combat_state = None
-	state.player.position = (2, 2)
-	if destination_id == "zone_001":
-		state.portals = [
+# Terrain of a map: (display name, grid, arrival cell)
+def zone_terrain(map_id: str, world_seed: int) -> Tuple[str, Grid | ChunkedGrid, Tuple[int, int]]:
+	model = load_map(CONTENT_DIR / "maps" / f"{map_id}.json")
+	procedural = PROCEDURAL_ZONES.get(map_id)
+	if procedural is not None:
+		kind, width, height = procedural
+		zone = generate_zone(kind, width, height, zone_seed(world_seed, map_id))
+		return model.name, zone.grid(), zone.start
+	return model.name, build_grid_from_map(model), (2, 2)
+
+
+def zone_portals(map_id: str, grid: Grid | ChunkedGrid, arrival: Tuple[int, int]) -> List[Portal]:
+	if map_id == "zone_001":
+		return [
 			Portal(id="p_db", name="Daily Boss", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=(8, 8), tags={"portal"}, destination_id="zone_daily_boss", kind="daily_boss", state="available"),
 			Portal(id="p_ex", name="Exploration", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=(12, 6), tags={"portal"}, destination_id="zone_exploration", kind="exploration", state="available"),
 			Portal(id="p_dg", name="Dungeon", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=(6, 12), tags={"portal"}, destination_id="zone_dungeon", kind="dungeon", state="available"),
 			Portal(id="p_pv", name="PvP Arena", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=(16, 10), tags={"portal"}, destination_id="zone_pvp", kind="pvp", state="locked"),
 			Portal(id="p_rd", name="Raid", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=(20, 8), tags={"portal"}, destination_id="zone_raid", kind="raid", state="locked"),
 		]
+	return_pos = nearest_open(grid, (arrival[0], arrival[1] + 1), avoid=(arrival,))
+	return [Portal(id="p_return", name="Return", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=return_pos, tags={"portal"}, destination_id="zone_001", kind="return", state="available")]
+
+
+def travel_to_map(state: GameState, destination_id: str) -> None:
+	state.map_name, state.grid, arrival = zone_terrain(destination_id, state.world_seed)
+	state.map_id = destination_id
+	state.in_combat = False
+	state.combat_state = None
+	state.player.position = arrival
+	stream_world(state)
+	state.encounter_size = ENCOUNTER_SIZES.get(destination_id, 1)
+	state.portals = zone_portals(destination_id, state.grid, arrival)
+	mon_model = load_monster(CONTENT_DIR / "monsters" / "slime.json")
+	if destination_id == "zone_001":
 		state.merchants = [Merchant(id="m1", name="Trader", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=(5, 10), tags={"merchant"}, shop_id="general_store")]
 		state.npcs = [Npc(id="npc1", name="Villager", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=(3, 2), tags={"npc"}, dialogue_id="greeting_1")]
-		mon_model = load_monster(CONTENT_DIR / "monsters" / "slime.json")
 		state.monsters = [create_monster_from_model(mon_model, (10, 10))]
 	else:
-		state.portals = [Portal(id="p_return", name="Return", stats=Stats(hp=1, ap=0, mp=0, atk=0, res=0), position=(2, 3), tags={"portal"}, destination_id="zone_001", kind="return", state="available")]
 		state.merchants = []
 		state.npcs = []
-		mon_model = load_monster(CONTENT_DIR / "monsters" / "slime.json")
-		state.monsters = [create_monster_from_model(mon_model, (6, 6))]
+		avoid = (arrival,) + tuple(p.position for p in state.portals)
+		state.monsters = [create_monster_from_model(mon_model, nearest_open(state.grid, (arrival[0] + 4, arrival[1] + 4), avoid=avoid))]
+
+
+def _exits(portals: List[Portal]) -> Tuple[Tuple[Tuple[int, int], str], ...]:
+	return tuple((p.position, p.destination_id) for p in portals if getattr(p, 'state', 'available') == 'available')
+
+
+# Maps other than the current one, as they are on arrival; only used for planning
+@lru_cache(maxsize=32)
+def _zone_layout(map_id: str, world_seed: int) -> MapLayout:
+	_, grid, arrival = zone_terrain(map_id, world_seed)
+	return MapLayout(map_id, grid, arrival, _exits(zone_portals(map_id, grid, arrival)))
+
+
+# Route from the player to goal on to_map, through portals if needed: one (map id,
+# path) leg per map, each but the last ending on a portal
+def plan_travel(state: GameState, to_map: str, goal: Tuple[int, int]) -> Optional[List[RouteLeg]]:
+	def layout_of(map_id: str) -> MapLayout:
+		layout = _zone_layout(map_id, state.world_seed)
+		if map_id == state.map_id:
+			return layout._replace(grid=state.grid, exits=_exits(state.portals or []))
+		return layout
+	return plan_route(layout_of, state.map_id, state.player.position, to_map, goal)
+
+
+# Click-to-move: A* on the combat grid, find_path (method as given, or picked by map
+# size) on the world map. World monsters are stepped around unless they are the goal.
+def path_to(state: GameState, goal: Tuple[int, int], method: Optional[str] = None) -> Optional[List[Tuple[int, int]]]:
+	if state.in_combat and state.combat_state:
+		return astar(state.combat_state.combat_grid, state.player.position, goal, set(state.combat_state.cells))
+	return find_path(state.grid, state.player.position, goal, world_monster_cells(state), method)
+
+
+def stream_world(state: GameState) -> None:
+	if isinstance(state.grid, ChunkedGrid):
+		state.grid.stream_around(state.player.position)
 
 
 def try_move(state: GameState, dx: int, dy: int) -> None:
@@ -220,6 +338,7 @@ def try_move(state: GameState, dx: int, dy: int) -> None:
 	new_y = state.player.position[1] + dy
 	if state.grid.walkable(new_x, new_y):
 		state.player.position = (new_x, new_y)
+		stream_world(state)
 		for p in getattr(state, 'portals', []) or []:
 			if (new_x, new_y) == p.position and getattr(p, 'state', 'available') == 'available':
 				travel_to_map(state, p.destination_id)
@@ -230,22 +349,41 @@ def try_move(state: GameState, dx: int, dy: int) -> None:
 			start_combat(state, triggered_monster)
 
 
-def start_combat(state: GameState, monster: Monster) -> None:
+def world_monster_cells(state: GameState) -> Set[Tuple[int, int]]:
+	if state.in_combat:
+		return set()
+	if isinstance(state.monsters, MonsterStore):
+		return state.monsters.positions()
+	return {m.position for m in state.monsters}
+
+
+def spawn_pack(leader: Monster, size: int) -> List[Monster]:
+	pack = [leader]
+	for _ in range(size - 1):
+		pack.append(replace(leader, stats=replace(leader.stats), abilities=list(leader.abilities)))
+	return pack
+
+
+def start_combat(state: GameState, monster: Monster, size: Optional[int] = None) -> None:
+	if isinstance(monster, MonsterView):
+		monster = monster.to_monster()
 	state.in_combat = True
 	state.player_world_pos = state.player.position
 	
-	arena = CombatArena()
+	monsters = spawn_pack(monster, max(1, size or state.encounter_size))
+	arena = arena_for(len(monsters))
 	combat_grid = arena.create_combat_grid()
 	
 	state.combat_state = CombatState(
 		player=state.player,
-		monsters=[monster],
+		monsters=monsters,
 		current_turn=1,
 		player_ap=state.player.get_total_stats().ap,
 		player_mp=state.player.get_total_stats().mp,
 		log=state.log,
 		arena=arena,
-		combat_grid=combat_grid
+		combat_grid=combat_grid,
+		ai_policy=SearchPolicy(budget_ms=state.ai_budget_ms),
 	)
 	
 	state.combat_state.start_combat()
@@ -279,7 +417,7 @@ def update_quest_progress(state: GameState, objective_type: str, target: str) ->
 		for objective in quest.objectives:
 			if (objective.objective_type.value == objective_type and 
 				(objective.target == target or objective.target == "any")):
-				objective.update_progress()
+				state.player.quest_log.update_objective(quest_id, objective.id)
 				state.log.log(f"📋 Quest progress: {objective.description}")
 
 
@@ -306,8 +444,13 @@ def check_quest_completion(state: GameState) -> None:
 
 def render_ascii(state: GameState) -> List[str]:
 	if state.in_combat and state.combat_state:
+		pending = getattr(state, 'pending_ability', None)
+		if getattr(state, 'targeting_mode', False) and pending is not None:
+			castable = castable_overlays(state).get(pending.id)
+			return render_combat_arena_with_cursor(state.combat_state, state.target_cursor, castable)
 		return render_combat_arena(state.combat_state)
 	
+	monster_cells = world_monster_cells(state)
 	lines: List[str] = []
 	for y in range(state.grid.height):
 		row_chars: List[str] = []
@@ -316,9 +459,9 @@ def render_ascii(state: GameState) -> List[str]:
 				row_chars.append("@")
 			elif any(getattr(m, 'position', None) == (x, y) for m in getattr(state, 'merchants', [])):
 				row_chars.append("$")
-			elif any(m.position == (x, y) for m in state.monsters):
+			elif (x, y) in monster_cells:
 				row_chars.append("M")
-			elif (x, y) in state.grid.blocked:
+			elif state.grid.is_blocked(x, y):
 				row_chars.append("#")
 			else:
 				row_chars.append(".")
@@ -363,11 +506,11 @@ def handle_ability_selection(state: GameState, index: int) -> None:
 		state.log.log(f"Not enough AP! Need {ab.cost_ap}, have {state.combat_state.player_ap}")
 		return
 
-	# Instant cast at current enemy
+	# Instant cast at the nearest enemy the ability can reach, else the nearest one
 	src = state.player.position
-	tgt = state.combat_state.monsters[0].position
+	tgt = pick_target(state.combat_state, ab, src)
 	# Optional melee adjacency only for true CQC (range_max<=1)
-	if "melee" in ab.tags and ab.range_max <= 1:
+	if ab.tag_mask & MELEE and ab.range_max <= 1:
 		dist = abs(tgt[0] - src[0]) + abs(tgt[1] - src[1])
 		if dist != 1:
 			state.log.log("Target not adjacent for melee ability")
@@ -375,20 +518,33 @@ def handle_ability_selection(state: GameState, index: int) -> None:
 	if not in_range(ab, src, tgt):
 		state.log.log(f"Target out of range! Range: {ab.range_min}-{ab.range_max}")
 		return
-	if "ranged" in ab.tags and not has_line_of_sight(state.combat_state.combat_grid, src, tgt):
+	if ab.tag_mask & RANGED and not has_line_of_sight(state.combat_state.combat_grid, src, tgt):
 		state.log.log("🚫 No line of sight")
 		return
 
-	monster_before = state.combat_state.monsters[0]
-	resolve_ability_effects(ab, state.player, tgt, state.combat_state, state.combat_state.monsters)
-	if not state.combat_state.monsters:
-		handle_monster_defeat(state, monster_before)
+	resolve_ability_effects(ab, state.player, tgt, state.combat_state)
+	after_player_cast(state)
+
+
+def pick_target(combat_state: CombatState, ab: Ability, src: Tuple[int, int]) -> Tuple[int, int]:
+	by_distance = sorted(combat_state.monsters, key=lambda m: abs(m.position[0] - src[0]) + abs(m.position[1] - src[1]))
+	for m in by_distance:
+		if in_range(ab, src, m.position) and (not ab.tag_mask & RANGED or has_line_of_sight(combat_state.combat_grid, src, m.position)):
+			return m.position
+	return by_distance[0].position if by_distance else src
+
+
+def after_player_cast(state: GameState) -> None:
+	cs = state.combat_state
+	for monster in cs.drain_defeated():
+		handle_monster_defeat(state, monster)
+	if not cs.monsters:
 		state.log.log("🏆 Victory! All monsters defeated!")
 		end_combat(state)
-	elif state.combat_state.player_ap <= 0:
-		state.log.log("No AP left! Press 'e' to end turn.")
-	elif not state.combat_state.is_active:
-		state.log.log("💀 Defeat! Combat ended.")
+	elif cs.player_ap <= 0:
+		cs.log.log("No AP left! Press 'e' to end turn.")
+	elif not cs.is_active:
+		cs.log.log("💀 Defeat! Combat ended.")
 		end_combat(state)
 
 
@@ -399,38 +555,39 @@ def cast_ability_at(state: GameState, index: int, target: Tuple[int, int]) -> No
 	if index < 1 or index > len(weapon_abilities):
 		return
 	ab = weapon_abilities[index - 1]
+	castable = castable_overlays(state).get(ab.id)
+	if castable is None or not castable.contains(target):
+		explain_untargetable(state, ab, state.player.position, target)
+		return
+	resolve_ability_effects(ab, state.player, target, state.combat_state)
+	after_player_cast(state)
+
+
+def explain_untargetable(state: GameState, ab: Ability, src: Tuple[int, int], target: Tuple[int, int]) -> None:
 	if state.combat_state.player_ap < ab.cost_ap:
 		state.log.log(f"Not enough AP! Need {ab.cost_ap}, have {state.combat_state.player_ap}")
-		return
-	src = state.player.position
 	# True melee adjacency only when range_max<=1
-	if "melee" in ab.tags and ab.range_max <= 1:
-		dist = abs(target[0] - src[0]) + abs(target[1] - src[1])
-		if dist != 1:
-			state.log.log("Target not adjacent for melee ability")
-			return
-	if not in_range(ab, src, target):
+	elif ab.tag_mask & MELEE and ab.range_max <= 1 and abs(target[0] - src[0]) + abs(target[1] - src[1]) != 1:
+		state.log.log("Target not adjacent for melee ability")
+	elif not in_range(ab, src, target):
 		state.log.log(f"Target out of range! Range: {ab.range_min}-{ab.range_max}")
-		return
-	if "ranged" in ab.tags and not has_line_of_sight(state.combat_state.combat_grid, src, target):
+	elif ab.tag_mask & RANGED and not has_line_of_sight(state.combat_state.combat_grid, src, target):
 		state.log.log("🚫 No line of sight")
-		return
-	monster_before = state.combat_state.monsters[0] if state.combat_state.monsters else None
-	resolve_ability_effects(ab, state.player, target, state.combat_state, state.combat_state.monsters)
-	if not state.combat_state.monsters and monster_before is not None:
-		handle_monster_defeat(state, monster_before)
-		state.log.log("🏆 Victory! All monsters defeated!")
-		end_combat(state)
-	elif state.combat_state.player_ap <= 0:
-		state.combat_state.log.log("No AP left! Press 'e' to end turn.")
-	elif not state.combat_state.is_active:
-		state.combat_state.log.log("💀 Defeat! Combat ended.")
-		end_combat(state)
+	else:
+		state.log.log("Can't target that cell")
+
+
+def castable_overlays(state: GameState) -> Dict[str, CastOverlay]:
+	cs = state.combat_state
+	weapon = state.player.progression.equipped_weapon
+	if not state.in_combat or cs is None or not weapon:
+		return {}
+	return state.cast_overlays.refresh(cs.combat_grid, state.player.position, cs.player_ap, get_abilities_for_weapon(weapon))
 
 
 def begin_targeting(state: GameState, ability: Ability) -> None:
 	state.targeting_mode = True
-	state.target_cursor = state.combat_state.monsters[0].position if state.combat_state and state.combat_state.monsters else state.player.position
+	state.target_cursor = pick_target(state.combat_state, ability, state.player.position) if state.combat_state else state.player.position
 	state.pending_ability = ability
 
 
@@ -438,8 +595,19 @@ def move_target_cursor(state: GameState, dx: int, dy: int) -> None:
 	if not state.combat_state or state.target_cursor is None:
 		return
 	x, y = state.target_cursor
-	x = max(1, min(state.combat_state.combat_grid.width - 2, x + dx))
-	y = max(1, min(state.combat_state.combat_grid.height - 2, y + dy))
+	grid = state.combat_state.combat_grid
+	pending = getattr(state, 'pending_ability', None)
+	castable = castable_overlays(state).get(pending.id) if pending is not None else None
+	if castable:
+		# Skip straight to the next legal cell in that direction
+		nx, ny = x + dx, y + dy
+		while 1 <= nx <= grid.width - 2 and 1 <= ny <= grid.height - 2:
+			if castable.contains((nx, ny)):
+				state.target_cursor = (nx, ny)
+				return
+			nx, ny = nx + dx, ny + dy
+	x = max(1, min(grid.width - 2, x + dx))
+	y = max(1, min(grid.height - 2, y + dy))
 	state.target_cursor = (x, y)
 
 
@@ -450,34 +618,13 @@ def confirm_target_and_cast(state: GameState) -> None:
 	ab = state.pending_ability
 	src = state.player.position
 	tgt = state.target_cursor or src
-	if not in_range(ab, src, tgt):
-		state.combat_state.log.log(f"Target out of range! Range: {ab.range_min}-{ab.range_max}")
-		return
-	if "ranged" in ab.tags and not has_line_of_sight(state.combat_state.combat_grid, src, tgt):
-		state.combat_state.log.log("🚫 No line of sight")
+	castable = castable_overlays(state).get(ab.id)
+	if castable is None or not castable.contains(tgt):
+		explain_untargetable(state, ab, src, tgt)
 		return
-	monster_before = state.combat_state.monsters[0] if state.combat_state.monsters else None
-	resolve_ability_effects(ab, state.player, tgt, state.combat_state, state.combat_state.monsters)
-	if not state.combat_state.monsters and monster_before is not None:
-		handle_monster_defeat(state, monster_before)
-		state.combat_state.log.log("🏆 Victory! All monsters defeated!")
-		end_combat(state)
-	elif state.combat_state.player_ap <= 0:
-		state.combat_state.log.log("No AP left! Press 'e' to end turn.")
-	elif not state.combat_state.is_active:
-		state.combat_state.log.log("💀 Defeat! Combat ended.")
-		end_combat(state)
+	resolve_ability_effects(ab, state.player, tgt, state.combat_state)
 	state.targeting_mode = False
 	state.pending_ability = None
-	
-	if not state.combat_state.monsters:
-		handle_monster_defeat(state, monster_before)
-		state.log.log("🏆 Victory! All monsters defeated!")
-		end_combat(state)
-	elif state.combat_state.player_ap <= 0:
-		state.log.log("No AP left! Press 'e' to end turn.")
-	elif not state.combat_state.is_active:
-		state.log.log("💀 Defeat! Combat ended.")
-		end_combat(state)
+	after_player_cast(state)
 
 
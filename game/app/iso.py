@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import argparse
+import math
 import sys
-from typing import Tuple
+from typing import Iterator, Optional, Tuple
 
 import pygame
 
-from .game_loop import load_content_and_init, try_move, handle_ability_selection, end_combat_turn, abilities_bar, cast_ability_at, start_combat, travel_to_map
+from .game_loop import CONTENT_DIR, apply_content_changes, load_content_and_init, try_move, stream_world, path_to, handle_ability_selection, abilities_bar, cast_ability_at, castable_overlays, start_combat, travel_to_map
 from .ui.panels import (
     draw_inventory_panel,
     draw_profile_panel,
@@ -13,11 +15,18 @@ from .ui.panels import (
     draw_npc_dialog,
     draw_merchant_dialog,
 )
-from ..engine.ability import Ability
-from ..engine.content import load_shop
+from .timestep import FixedTimestep, lerp2
+from .ui.atlas import atlas_for, blit_sorted
+from .ui.log_view import LogView
+from .ui.scheduler import RenderScheduler
+from ..engine.ability import Ability, get_abilities_for_weapon
+from ..engine.ai import AiWorker, execute_monster_plans
+from ..engine.combat import area_cells, check_combat_trigger
+from ..engine.content import ContentWatcher, load_shop
 from ..engine.inventory import get_item_by_id
+from ..engine.monster_store import MonsterStore
+from ..engine.pathfinding import astar
 from pathlib import Path
-import heapq
 
 
 TILE_W = 64
@@ -41,7 +50,58 @@ def iso_coords_scaled(x: int, y: int, tw: int, th: int) -> Tuple[int, int]:
     return sx, sy
 
 
-def main() -> int:
+def screen_to_cell(px: float, py: float, tw: int, th: int) -> Tuple[int, int]:
+    gx = int(py / (th / 2.0) + px / (tw / 2.0)) // 2
+    gy = int(py / (th / 2.0) - px / (tw / 2.0)) // 2
+    return gx, gy
+
+
+def visible_rows(cam_x: float, cam_y: float, tw: int, th: int, width: int, height: int) -> Iterator[Tuple[int, int, int]]:
+    # A tile's diamond spans [sx, sx + tw] x [sy, sy + th] on screen, so the visible
+    # tiles are bounded by x - y (screen columns) and x + y (screen rows); the extra
+    # tile of slack on each side also covers screen shake.
+    hw = tw // 2
+    hh = th // 2
+    d_min = math.floor((cam_x - tw) / hw) - 1
+    d_max = math.ceil((cam_x + SCREEN_W) / hw) + 1
+    s_min = math.floor((cam_y - th) / hh) - 1
+    s_max = math.ceil((cam_y + SCREEN_H) / hh) + 1
+    y0 = max(0, (s_min - d_max) // 2)
+    y1 = min(height - 1, (s_max - d_min + 1) // 2)
+    for y in range(y0, y1 + 1):
+        x0 = max(0, d_min + y, s_min - y)
+        x1 = min(width - 1, d_max + y, s_max - y)
+        if x0 <= x1:
+            yield y, x0, x1
+
+
+def cells_rect(cells, cam_x: float, cam_y: float, tw: int, th: int) -> pygame.Rect:
+    # Screen bounds of a set of tiles, padded for the markers drawn over their centres
+    rect = pygame.Rect(0, 0, 0, 0)
+    for x, y in cells:
+        sx, sy = iso_coords_scaled(x, y, tw, th)
+        tile = pygame.Rect(int(sx - cam_x) - 8, int(sy - cam_y) - 8, tw + 16, th + 16)
+        rect = tile if not rect.w else rect.union(tile)
+    return rect
+
+
+def format_chat_line(msg) -> tuple[str, tuple[int, int, int]]:
+    color = (200, 200, 210) if msg.type == "chat" else (180, 200, 120)
+    return f"[{msg.timestamp}] {msg.author}: {msg.text}", color
+
+
+def format_event_line(line: str) -> tuple[str, tuple[int, int, int]]:
+    return line, (200, 200, 210)
+
+
+def on_screen(sx: int, sy: int, tw: int, th: int) -> bool:
+    return -tw <= sx <= SCREEN_W and -2 * th <= sy <= SCREEN_H
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Terminaldofus iso preview")
+    parser.add_argument("--watch", action="store_true", help="reload edited content files while playing")
+    args = parser.parse_args(argv)
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
     pygame.display.set_caption("Terminaldofus - Iso Preview")
@@ -49,6 +109,9 @@ def main() -> int:
 
     state = load_content_and_init()
     cam_x, cam_y = 0.0, 0.0
+    sim_cam_x, sim_cam_y = cam_x, cam_y
+    prev_cam = (cam_x, cam_y)
+    sim_clock = FixedTimestep()
     scale = 1.2
     shake_timer = 0.0
     last_log_len = 0
@@ -92,17 +155,39 @@ def main() -> int:
     last_hover: tuple[int, int] | None = None
     step_timer = 0.0
     step_interval = 0.15
+    walk: tuple[tuple[int, int], tuple[int, int]] | None = None
     selected_ability = 1
+    aoe_key = None
+    minimap_grid = None
+    minimap_surf = None
+    aoe_cells: list[tuple[int, int]] = []
     main_menu = True
     menu_sel = 0
     has_started = False
     last_world_click_goal: tuple[int, int] | None = None
+    # Monster turns are planned on a worker thread so search never stalls the frame
+    ai_worker = AiWorker()
+    ai_future = None
+    # Content files edited while playing are revalidated on the watcher's thread and
+    # applied here between frames
+    watcher = ContentWatcher(CONTENT_DIR) if args.watch else None
+    if watcher is not None:
+        watcher.start()
+    ai_combat = None
+    scheduler = RenderScheduler()
+    chat_view = LogView()
+    event_view = LogView()
+    shake_offset = (0, 0)
+    hover_cell: tuple[int, int] | None = None
+    hover_rect = pygame.Rect(0, 0, 0, 0)
 
     running = True
     while running:
         ox = 0
         oy = 0
         for event in pygame.event.get():
+            if event.type != pygame.MOUSEMOTION:
+                scheduler.mark("input")
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
@@ -244,7 +329,7 @@ def main() -> int:
                             item_model = shop.items[shop_sel]
                             item = get_item_by_id(item_model.item_id)
                             if item and state.player.can_afford(item_model.price):
-                                state.player.gold -= item_model.price
+                                state.player.add_gold(-item_model.price)
                                 state.player.inventory.add_item(item)
                                 state.log.entries.append(f"Bought {item.name} for {item_model.price}")
                 elif inventory_mode:
@@ -326,13 +411,22 @@ def main() -> int:
                     elif event.key == pygame.K_RIGHT:
                         try_move(state, 1, 0)
                     elif event.key == pygame.K_1:
+                        selected_ability = 1
                         handle_ability_selection(state, 1)
                     elif event.key == pygame.K_2:
+                        selected_ability = 2
                         handle_ability_selection(state, 2)
                     elif event.key == pygame.K_3:
+                        selected_ability = 3
                         handle_ability_selection(state, 3)
                     elif event.key == pygame.K_e and state.in_combat and state.combat_state:
-                        end_combat_turn(state.combat_state)
+                        if state.combat_state.current_phase != "player_turn" or ai_future is not None:
+                            state.combat_state.log.log("Not your turn!")
+                        else:
+                            state.combat_state.current_phase = "monster_turn"
+                            state.combat_state.log.log("--- Monster's turn ---")
+                            ai_combat = state.combat_state
+                            ai_future = ai_worker.submit(ai_combat)
                     elif event.key == pygame.K_RETURN and not state.in_combat:
                         # Open shop if adjacent
                         adj = None
@@ -445,43 +539,22 @@ def main() -> int:
                     if event.type == pygame.MOUSEBUTTONDOWN and not (inventory_mode or profile_mode or shop_mode or npc_dialog):
                         TW = max(16, int(TILE_W * scale))
                         TH = max(8, int(TILE_H * scale))
-                        gx = int((my + cam_y - oy) / (TH / 2.0) + (mx + cam_x - ox) / (TW / 2.0)) // 2
-                        gy = int((my + cam_y - oy) / (TH / 2.0) - (mx + cam_x - ox) / (TW / 2.0)) // 2
+                        gx, gy = screen_to_cell(mx + cam_x - ox, my + cam_y - oy, TW, TH)
                         active_grid = state.combat_state.combat_grid if (state.in_combat and state.combat_state) else state.grid
-                        if 0 <= gx < active_grid.width and 0 <= gy < active_grid.height:
+                        armed_overlay = None
+                        if state.in_combat and state.combat_state and state.combat_state.current_phase == "player_turn":
+                            bar = get_abilities_for_weapon(state.player.progression.equipped_weapon) if state.player.progression.equipped_weapon else []
+                            if 0 < selected_ability <= len(bar):
+                                armed_overlay = castable_overlays(state).get(bar[selected_ability - 1].id)
+                        if (armed_overlay is not None and armed_overlay.contains((gx, gy)) and
+                            ((gx, gy) == state.player.position or state.combat_state.monster_at((gx, gy)) is not None)):
+                            # Clicking a legal target with the armed ability casts instead of moving
+                            cast_ability_at(state, selected_ability, (gx, gy))
+                            movement_path = []
+                        elif 0 <= gx < active_grid.width and 0 <= gy < active_grid.height:
                             goal = (gx, gy)
-                            def h(a: tuple[int,int], b: tuple[int,int]) -> int:
-                                return abs(a[0]-b[0]) + abs(a[1]-b[1])
-                            start = state.player.position
-                            openq: list[tuple[int, tuple[int,int]]] = []
-                            heapq.heappush(openq, (0, start))
-                            came: dict[tuple[int,int], tuple[int,int] | None] = {start: None}
-                            g: dict[tuple[int,int], int] = {start: 0}
-                            occupied_world = set(m.position for m in (state.monsters if not state.in_combat else []))
-                            occupied_combat = set(m.position for m in (state.combat_state.monsters if (state.in_combat and state.combat_state) else []))
-                            occupied = occupied_combat if state.in_combat else occupied_world
-                            while openq:
-                                _, cur = heapq.heappop(openq)
-                                if cur == goal:
-                                    break
-                                cx, cy = cur
-                                for nx, ny in ((cx+1, cy), (cx-1, cy), (cx, cy+1), (cx, cy-1)):
-                                    if 0 <= nx < active_grid.width and 0 <= ny < active_grid.height and active_grid.walkable(nx, ny):
-                                        if (nx, ny) in occupied and (nx, ny) != goal:
-                                            continue
-                                        ng = g[cur] + 1
-                                        if (nx, ny) not in g or ng < g[(nx, ny)]:
-                                            g[(nx, ny)] = ng
-                                            pr = ng + h((nx, ny), goal)
-                                            heapq.heappush(openq, (pr, (nx, ny)))
-                                            came[(nx, ny)] = cur
-                            if goal in came:
-                                path: list[tuple[int,int]] = []
-                                cur = goal
-                                while cur != start:
-                                    path.append(cur)
-                                    cur = came[cur]  # type: ignore[index]
-                                path.reverse()
+                            path = path_to(state, goal)
+                            if path is not None:
                                 if state.in_combat and state.combat_state:
                                     mp_left = max(0, int(state.combat_state.player_mp))
                                     movement_path = path[:mp_left] if mp_left > 0 else []
@@ -573,45 +646,12 @@ def main() -> int:
                     mx, my = pygame.mouse.get_pos()
                     TW = max(16, int(TILE_W * scale))
                     TH = max(8, int(TILE_H * scale))
-                    gx = int((my + cam_y - oy) / (TH / 2.0) + (mx + cam_x - ox) / (TW / 2.0)) // 2
-                    gy = int((my + cam_y - oy) / (TH / 2.0) - (mx + cam_x - ox) / (TW / 2.0)) // 2
+                    gx, gy = screen_to_cell(mx + cam_x - ox, my + cam_y - oy, TW, TH)
                     active_grid = state.combat_state.combat_grid if (state.in_combat and state.combat_state) else state.grid
                     if 0 <= gx < active_grid.width and 0 <= gy < active_grid.height:
                         goal = (gx, gy)
-                        def h(a: tuple[int,int], b: tuple[int,int]) -> int:
-                            return abs(a[0]-b[0]) + abs(a[1]-b[1])
-                        start = state.player.position
-                        openq: list[tuple[int, tuple[int,int]]] = []
-                        heapq.heappush(openq, (0, start))
-                        came: dict[tuple[int,int], tuple[int,int] | None] = {start: None}
-                        g: dict[tuple[int,int], int] = {start: 0}
-                        occupied_world = set(m.position for m in (state.monsters if not state.in_combat else []))
-                        occupied_combat = set(m.position for m in (state.combat_state.monsters if (state.in_combat and state.combat_state) else []))
-                        occupied = occupied_combat if state.in_combat else occupied_world
-                        # Revert portal avoidance during path calc; allow passing over portals
-                        while openq:
-                            _, cur = heapq.heappop(openq)
-                            if cur == goal:
-                                break
-                            cx, cy = cur
-                            for nx, ny in ((cx+1, cy), (cx-1, cy), (cx, cy+1), (cx, cy-1)):
-                                if 0 <= nx < active_grid.width and 0 <= ny < active_grid.height and active_grid.walkable(nx, ny):
-                                    if (nx, ny) in occupied and (nx, ny) != goal:
-                                        continue
-                                    
-                                    ng = g[cur] + 1
-                                    if (nx, ny) not in g or ng < g[(nx, ny)]:
-                                        g[(nx, ny)] = ng
-                                        pr = ng + h((nx, ny), goal)
-                                        heapq.heappush(openq, (pr, (nx, ny)))
-                                        came[(nx, ny)] = cur
-                        if goal in came:
-                            path: list[tuple[int,int]] = []
-                            cur = goal
-                            while cur != start:
-                                path.append(cur)
-                                cur = came[cur]  # type: ignore[index]
-                            path.reverse()
+                        path = path_to(state, goal)
+                        if path is not None:
                             if state.in_combat and state.combat_state:
                                 mp_left = max(0, int(state.combat_state.player_mp))
                                 movement_path = path[:mp_left] if mp_left > 0 else []
@@ -657,6 +697,8 @@ def main() -> int:
                     dragging_item = None
                     dragging_mouse = (0,0)
             if event.type == pygame.MOUSEMOTION:
+                if main_menu or inv_dragging or prof_dragging or dragging_item is not None:
+                    scheduler.mark("drag" if not main_menu else "menu")
                 if main_menu:
                     mx, my = event.pos
                     col_x = SCREEN_W//2 - 100
@@ -679,6 +721,114 @@ def main() -> int:
                     # Update drag preview position
                     dragging_mouse = pygame.mouse.get_pos()
 
+        # World updates run every iteration; drawing below only happens when one of
+        # them (or an input event) marked the frame dirty
+        if watcher is not None:
+            reloaded = watcher.drain()
+            if reloaded:
+                apply_content_changes(state, reloaded)
+                scheduler.mark("content")
+        if not (main_menu or shop_dialog):
+            if ai_future is not None:
+                scheduler.wake()
+                if ai_future.done():
+                    if ai_combat is state.combat_state and state.in_combat:
+                        execute_monster_plans(ai_combat, ai_future.result())
+                    ai_future = None
+                    ai_combat = None
+                    scheduler.mark("ai")
+
+            # Dynamic tile size with zoom
+            TW = max(16, int(TILE_W * scale))
+            TH = max(8, int(TILE_H * scale))
+
+            # Movement steps, camera easing and shake advance in fixed 1/60 s slices
+            # whatever the frame rate; the frame draws between the last two slices
+            if movement_path or shake_timer > 0:
+                scheduler.wake()
+            for _ in range(sim_clock.advance(clock.get_time() / 1000.0)):
+                prev_cam = (sim_cam_x, sim_cam_y)
+                step_timer += sim_clock.dt
+                if movement_path and step_timer >= step_interval:
+                    step_timer = 0.0
+                    nx, ny = movement_path.pop(0)
+                    walk = (state.player.position, (nx, ny))
+
+                    state.player.position = (nx, ny)
+                    if state.in_combat and state.combat_state:
+                        state.combat_state.player_mp -= 1
+                        if state.combat_state.player_mp <= 0:
+                            movement_path = []
+                    else:
+                        stream_world(state)
+                        stepped_portal = next((p for p in (getattr(state, 'portals', []) or []) if (nx, ny) == p.position), None)
+                        if stepped_portal and (nx, ny) == stepped_portal.position:
+                            movement_path = []
+                            travel_to_map(state, stepped_portal.destination_id)
+                            last_world_click_goal = None
+                        hit = check_combat_trigger(state.player.position, state.monsters)
+                        if hit is not None:
+                            movement_path = []
+                            start_combat(state, hit)
+
+                # Smooth camera follow player, snapping once within half a pixel so an
+                # idle camera stops asking for frames
+                px, py = state.player.position
+                pcx, pcy = iso_coords_scaled(px, py, TW, TH)
+                target_cam_x = pcx - SCREEN_W / 2
+                target_cam_y = pcy - SCREEN_H / 2
+                if (sim_cam_x, sim_cam_y) != (target_cam_x, target_cam_y):
+                    if abs(target_cam_x - sim_cam_x) <= 0.5 and abs(target_cam_y - sim_cam_y) <= 0.5:
+                        sim_cam_x, sim_cam_y = target_cam_x, target_cam_y
+                    else:
+                        sim_cam_x += (target_cam_x - sim_cam_x) * 0.12
+                        sim_cam_y += (target_cam_y - sim_cam_y) * 0.12
+                if shake_timer > 0:
+                    shake_timer -= sim_clock.dt
+            view_cam = lerp2(prev_cam, (sim_cam_x, sim_cam_y), sim_clock.alpha)
+            if view_cam != (cam_x, cam_y):
+                cam_x, cam_y = view_cam
+                scheduler.mark("camera")
+
+            # The player slides between tiles over one step interval
+            if walk is not None and walk[1] == state.player.position:
+                walk_t = min(1.0, (step_timer + sim_clock.alpha * sim_clock.dt) / step_interval)
+                player_fx, player_fy = lerp2(walk[0], walk[1], walk_t)
+                scheduler.mark("movement")
+                if walk_t >= 1.0:
+                    walk = None
+            else:
+                walk = None
+                player_fx, player_fy = state.player.position
+
+            # Light screen shake on hit
+            if len(state.log.entries) != last_log_len:
+                if len(state.log.entries) > last_log_len:
+                    line = state.log.entries[-1]
+                    if "deals" in line or "defeated" in line or "pushed" in line:
+                        shake_timer = 0.15
+                last_log_len = len(state.log.entries)
+                scheduler.mark("log")
+            ox = oy = 0
+            if shake_timer > 0:
+                ox = 3
+                oy = -3
+            if (ox, oy) != shake_offset:
+                shake_offset = (ox, oy)
+                scheduler.mark("shake")
+
+            # Only the old and new hover footprint changes when the cursor crosses a cell
+            active_grid = state.combat_state.combat_grid if (state.in_combat and state.combat_state) else state.grid
+            mx, my = pygame.mouse.get_pos()
+            gx, gy = screen_to_cell(mx + cam_x - ox, my + cam_y - oy, TW, TH)
+            if (gx, gy) != hover_cell:
+                hover_cell = (gx, gy)
+                scheduler.mark("hover", hover_rect)
+
+        if not scheduler.dirty:
+            clock.tick(scheduler.idle())
+            continue
+
         screen.fill(COLOR_BG)
 
         if main_menu:
@@ -693,8 +843,7 @@ def main() -> int:
                 screen.blit(surf, (SCREEN_W//2 - 40, 240 + i*36))
             hint = small.render("↑/↓ to navigate, Enter to select", True, (150, 150, 160))
             screen.blit(hint, (SCREEN_W//2 - hint.get_width()//2, 240 + 3*36 + 16))
-            pygame.display.flip()
-            clock.tick(60)
+            clock.tick(scheduler.present())
             continue
         
         # NPC dialog bubble will be drawn later without pausing the scene
@@ -717,43 +866,17 @@ def main() -> int:
                 screen.blit(surf, (panel_x + 24, panel_y + 48 + i*32))
             hint = pygame.font.SysFont(None, 20).render("↑/↓ Select  Enter Confirm  Esc Close", True, (150, 150, 160))
             screen.blit(hint, (panel_x + 24, panel_y + panel_h - 32))
-            pygame.display.flip()
-            clock.tick(60)
+            clock.tick(scheduler.present())
             continue
 
-        # Dynamic tile size with zoom
-        TW = max(16, int(TILE_W * scale))
-        TH = max(8, int(TILE_H * scale))
-
-        # Smooth camera follow player
-        px, py = state.player.position
-        pcx, pcy = iso_coords_scaled(px, py, TW, TH)
-        target_cam_x = pcx - SCREEN_W / 2
-        target_cam_y = pcy - SCREEN_H / 2
-        cam_x += (target_cam_x - cam_x) * 0.12
-        cam_y += (target_cam_y - cam_y) * 0.12
-
-        # Light screen shake on hit
-        if len(state.log.entries) > last_log_len:
-            line = state.log.entries[-1]
-            if "deals" in line or "defeated" in line or "pushed" in line:
-                shake_timer = 0.15
-        last_log_len = len(state.log.entries)
-        ox = oy = 0
-        if shake_timer > 0:
-            shake_timer -= 1 / 60
-            ox = 3
-            oy = -3
-
         # Draw grid tiles (combat grid in combat, world grid otherwise)
-        active_grid = state.combat_state.combat_grid if (state.in_combat and state.combat_state) else state.grid
-        for y in range(active_grid.height):
-            for x in range(active_grid.width):
+        for y, x_first, x_last in visible_rows(cam_x - ox, cam_y - oy, TW, TH, active_grid.width, active_grid.height):
+            for x in range(x_first, x_last + 1):
                 sx, sy = iso_coords_scaled(x, y, TW, TH)
                 sx = int(sx - cam_x + ox)
                 sy = int(sy - cam_y + oy)
                 color = (60, 70, 90)
-                if (x, y) in active_grid.blocked:
+                if active_grid.is_blocked(x, y):
                     color = (80, 30, 30)
                 points = [
                     (sx, sy + TH // 2),
@@ -765,10 +888,6 @@ def main() -> int:
                 pygame.draw.polygon(screen, (30, 30, 40), points, 1)
 
         # Tile highlight under mouse + preview path (use combat grid in combat)
-        mx, my = pygame.mouse.get_pos()
-        gx = int((my + cam_y - oy) / (TH / 2.0) + (mx + cam_x - ox) / (TW / 2.0)) // 2
-        gy = int((my + cam_y - oy) / (TH / 2.0) - (mx + cam_x - ox) / (TW / 2.0)) // 2
-        
         if 0 <= gx < active_grid.width and 0 <= gy < active_grid.height:
             sx, sy = iso_coords_scaled(gx, gy, TW, TH)
             sx = int(sx - cam_x + ox)
@@ -791,37 +910,8 @@ def main() -> int:
                 if hover != last_hover:
                     last_hover = hover
                     # Calculate preview path
-                    def h(a: tuple[int,int], b: tuple[int,int]) -> int:
-                        return abs(a[0]-b[0]) + abs(a[1]-b[1])
-                    
-                    start = state.player.position
-                    goal = hover
-                    openq: list[tuple[int, tuple[int,int]]] = []
-                    heapq.heappush(openq, (0, start))
-                    came: dict[tuple[int,int], tuple[int,int] | None] = {start: None}
-                    g: dict[tuple[int,int], int] = {start: 0}
-                    
-                    while openq:
-                        _, cur = heapq.heappop(openq)
-                        if cur == goal:
-                            break
-                        cx, cy = cur
-                        for nx, ny in ((cx+1, cy), (cx-1, cy), (cx, cy+1), (cx, cy-1)):
-                            if 0 <= nx < active_grid.width and 0 <= ny < active_grid.height and active_grid.walkable(nx, ny):
-                                ng = g[cur] + 1
-                                if (nx, ny) not in g or ng < g[(nx, ny)]:
-                                    g[(nx, ny)] = ng
-                                    pr = ng + h((nx, ny), goal)
-                                    heapq.heappush(openq, (pr, (nx, ny)))
-                                    came[(nx, ny)] = cur
-                    
-                    if goal in came:
-                        path: list[tuple[int,int]] = []
-                        cur = goal
-                        while cur != start:
-                            path.append(cur)
-                            cur = came[cur]  # type: ignore[index]
-                        path.reverse()
+                    path = astar(active_grid, state.player.position, hover)
+                    if path is not None:
                         preview_path = path[:max(0, int(state.combat_state.player_mp))]
                     else:
                         preview_path = []
@@ -841,6 +931,45 @@ def main() -> int:
                 sy = int(sy - cam_y + oy)
                 pygame.draw.circle(screen, (80, 140, 230), (sx + TW // 2, sy + TH // 2), 8)
 
+        # Legal target cells of the armed ability; the overlay is cached per caster cell and AP
+        if (state.in_combat and state.combat_state and
+            state.combat_state.current_phase == "player_turn" and
+            state.player.progression.equipped_weapon):
+            bar = get_abilities_for_weapon(state.player.progression.equipped_weapon)
+            if 0 < selected_ability <= len(bar):
+                castable = castable_overlays(state).get(bar[selected_ability - 1].id)
+                for cx, cy in (castable.cells if castable else ()):
+                    sx, sy = iso_coords_scaled(cx, cy, TW, TH)
+                    sx = int(sx - cam_x + ox)
+                    sy = int(sy - cam_y + oy)
+                    pygame.draw.circle(screen, (230, 200, 90), (sx + TW // 2, sy + TH // 2), 4)
+
+        # AoE footprint of the last used ability under the cursor; geometry is only
+        # recomputed when the ability, caster cell or hovered cell changes
+        if (state.in_combat and state.combat_state and
+            state.combat_state.current_phase == "player_turn" and
+            state.player.progression.equipped_weapon and
+            0 <= gx < active_grid.width and 0 <= gy < active_grid.height):
+            bar = get_abilities_for_weapon(state.player.progression.equipped_weapon)
+            armed = bar[selected_ability - 1] if 0 < selected_ability <= len(bar) else None
+            key = (id(active_grid), armed.id if armed else None, state.player.position, state.combat_state.player_ap, (gx, gy))
+            if key != aoe_key:
+                aoe_key = key
+                armed_overlay = castable_overlays(state).get(armed.id) if armed else None
+                aoe_cells = area_cells(active_grid, armed, state.player.position, (gx, gy)) if armed_overlay and armed_overlay.contains((gx, gy)) else []
+            for ax, ay in aoe_cells:
+                sx, sy = iso_coords_scaled(ax, ay, TW, TH)
+                sx = int(sx - cam_x + ox)
+                sy = int(sy - cam_y + oy)
+                poly = [
+                    (sx, sy + TH // 2),
+                    (sx + TW // 2, sy),
+                    (sx + TW, sy + TH // 2),
+                    (sx + TW // 2, sy + TH),
+                ]
+                hit = state.combat_state.monster_at((ax, ay)) is not None
+                pygame.draw.polygon(screen, (240, 110, 60) if hit else (200, 150, 70), poly, 3 if hit else 2)
+
         # Draw movement path (darker blue dots for execution)
         if movement_path:
             for px, py in movement_path:
@@ -849,47 +978,36 @@ def main() -> int:
                 sy = int(sy - cam_y + oy)
                 pygame.draw.circle(screen, (80, 120, 200), (sx + TW // 2, sy + TH // 2), 8)
 
-        # Draw merchants, NPCs, portals (world only)
+        # Entities come from the sprite atlas for this zoom and go out in one batched
+        # blit, back to front
+        atlas = atlas_for(TW, TH, scale)
+        draws = []
+        entities = []
         if not state.in_combat:
-            for m in getattr(state, 'merchants', []):
-                sx, sy = iso_coords_scaled(*m.position, TW, TH)
-                sx = int(sx - cam_x + ox)
-                sy = int(sy - cam_y + oy)
-                pygame.draw.ellipse(screen, (0, 0, 0), pygame.Rect(sx + TW // 2 - 10, sy + TH // 2 + 4, 20, 6))
-                pygame.draw.circle(screen, (255, 215, 0), (sx + TW // 2, sy + TH // 2), max(6, int(10 * scale)))
-            for n in getattr(state, 'npcs', []) or []:
-                sx, sy = iso_coords_scaled(*n.position, TW, TH)
-                sx = int(sx - cam_x + ox)
-                sy = int(sy - cam_y + oy)
-                pygame.draw.ellipse(screen, (0, 0, 0), pygame.Rect(sx + TW // 2 - 10, sy + TH // 2 + 4, 20, 6))
-                pygame.draw.circle(screen, (80, 200, 80), (sx + TW // 2, sy + TH // 2), max(6, int(10 * scale)))
-            for p in getattr(state, 'portals', []) or []:
-                sx, sy = iso_coords_scaled(*p.position, TW, TH)
-                sx = int(sx - cam_x + ox)
-                sy = int(sy - cam_y + oy)
-                pygame.draw.ellipse(screen, (0, 0, 0), pygame.Rect(sx + TW // 2 - 10, sy + TH // 2 + 4, 20, 6))
-                col = (100, 140, 255) if getattr(p, 'state', 'available') == 'available' else (120, 120, 120)
-                pygame.draw.circle(screen, col, (sx + TW // 2, sy + TH // 2), max(6, int(10 * scale)))
-                label = p.name
-                fontp = pygame.font.SysFont(None, 18)
-                surf = fontp.render(label, True, (220,220,230))
-                screen.blit(surf, (sx + TW // 2 - surf.get_width()//2, sy - 14))
-        
-        # Draw monsters
+            entities += [(m.position, "merchant", None) for m in getattr(state, 'merchants', [])]
+            entities += [(n.position, "npc", None) for n in getattr(state, 'npcs', []) or []]
+            entities += [(p.position, "portal" if getattr(p, 'state', 'available') == 'available' else "portal_closed", p.name) for p in getattr(state, 'portals', []) or []]
         mons_to_draw = state.combat_state.monsters if (state.in_combat and state.combat_state) else state.monsters
-        for mon in mons_to_draw:
-            sx, sy = iso_coords_scaled(*mon.position, TW, TH)
+        if isinstance(mons_to_draw, MonsterStore):
+            # A large zone is only asked for the rows around the visible tiles
+            spans = list(visible_rows(cam_x - ox, cam_y - oy, TW, TH, active_grid.width, active_grid.height))
+            if spans:
+                rows = mons_to_draw.in_rect(min(s[1] for s in spans), spans[0][0], max(s[2] for s in spans), spans[-1][0])
+                mons_to_draw = [mons_to_draw.view(row) for row in rows]
+            else:
+                mons_to_draw = []
+        entities += [(mon.position, "monster", None) for mon in mons_to_draw]
+        entities.append(((player_fx, player_fy), "player", None))
+        for (ex, ey), kind, label in entities:
+            sx, sy = iso_coords_scaled(ex, ey, TW, TH)
             sx = int(sx - cam_x + ox)
             sy = int(sy - cam_y + oy)
-            pygame.draw.ellipse(screen, (0, 0, 0), pygame.Rect(sx + TW // 2 - 9, sy + TH // 2 + 4, 18, 6))
-            pygame.draw.circle(screen, (200, 60, 60), (sx + TW // 2, sy + TH // 2), max(6, int(10 * scale)))
-
-        # Draw player
-        sx, sy = iso_coords_scaled(*state.player.position, TW, TH)
-        sx = int(sx - cam_x + ox)
-        sy = int(sy - cam_y + oy)
-        pygame.draw.ellipse(screen, (0, 0, 0), pygame.Rect(sx + TW // 2 - 10, sy + TH // 2 + 6, 22, 8))
-        pygame.draw.circle(screen, (80, 200, 120), (sx + TW // 2, sy + TH // 2), max(8, int(12 * scale)))
+            if not on_screen(sx, sy, TW, TH):
+                continue
+            draws.append(((ex + ey, ex, 0), atlas.draw(kind, sx, sy)))
+            if label:
+                draws.append(((ex + ey, ex, 1), atlas.label(label, sx, sy)))
+        blit_sorted(screen, draws)
 
         chat_w = 300
         chat_h = 220
@@ -908,16 +1026,7 @@ def main() -> int:
         if state.in_combat:
             chat_tab = 1
         if chat_tab == 0 and not state.in_combat:
-            hist = state.chat.entries
-            vis_lines = (chat_h - tab_h - 6 - 26 - 8) // 18
-            start = max(0, len(hist) - vis_lines - chat_scroll_chat)
-            end = max(0, len(hist) - chat_scroll_chat)
-            yline = content_y
-            for msg in hist[start:end]:
-                color = (200, 200, 210) if msg.type == "chat" else (180, 200, 120)
-                line = f"[{msg.timestamp}] {msg.author}: {msg.text}"
-                screen.blit(f20.render(line, True, color), (chat_x + 8, yline))
-                yline += 18
+            chat_scroll_chat = chat_view.draw(screen, state.chat.entries, format_chat_line, chat_x + 8, content_y, chat_w - 16, chat_h - tab_h - 6 - 26 - 8, chat_scroll_chat)
             ibar_h = 26
             ibar_y = chat_y + chat_h - ibar_h
             pygame.draw.rect(screen, (18, 18, 26), pygame.Rect(chat_x, ibar_y, chat_w, ibar_h))
@@ -925,13 +1034,7 @@ def main() -> int:
             screen.blit(f20.render("> " + label, True, (210, 210, 220)), (chat_x + 8, ibar_y + 4))
         else:
             ev = (state.log.entries if hasattr(state, 'log') else [])
-            vis_lines = (chat_h - tab_h - 6 - 8) // 18
-            start = max(0, len(ev) - vis_lines - chat_scroll_events)
-            end = max(0, len(ev) - chat_scroll_events)
-            yline = content_y
-            for line in ev[start:end]:
-                screen.blit(f20.render(line, True, (200, 200, 210)), (chat_x + 8, yline))
-                yline += 18
+            chat_scroll_events = event_view.draw(screen, ev, format_event_line, chat_x + 8, content_y, chat_w - 16, chat_h - tab_h - 6 - 8, chat_scroll_events)
 
         # Draw NPC dialog bubble overlay (non-blocking)
         if npc_dialog:
@@ -953,10 +1056,16 @@ def main() -> int:
                 adj_merch = True
                 break
         if state.in_combat and state.combat_state and state.combat_state.monsters:
-            mon = state.combat_state.monsters[0]
-            hud_lines.append(f"COMBAT - Turn {state.combat_state.current_turn} | Phase: {state.combat_state.current_phase.upper()}")
+            enemies = state.combat_state.monsters
+            hud_lines.append(f"COMBAT - Turn {state.combat_state.current_turn} | Phase: {state.combat_state.current_phase.upper()} | Enemies {len(enemies)}")
             hud_lines.append(f"YOU HP {total.current_hp}/{total.hp} AP {state.combat_state.player_ap} MP {state.combat_state.player_mp}")
-            hud_lines.append(f"ENEMY HP {mon.stats.current_hp}/{mon.stats.hp} AP {state.combat_state.monster_ap} MP {state.combat_state.monster_mp}")
+            for mon in enemies[:4]:
+                hud_lines.append(f"{mon.name.upper()} HP {mon.stats.current_hp}/{mon.stats.hp} AP {mon.combat_ap} MP {mon.combat_mp}")
+            if len(enemies) > 4:
+                hud_lines.append(f"+{len(enemies) - 4} more | total HP {sum(m.stats.current_hp for m in enemies)}")
+            report = getattr(state.combat_state.ai_policy, "last_report", None)
+            if report is not None and report.nodes:
+                hud_lines.append(f"AI depth {report.depth} | {report.nodes} nodes in {report.elapsed_ms:.1f}/{report.budget_ms:.0f} ms ({report.nodes_per_sec / 1000:.0f}k n/s)")
         else:
             world_line = f"WORLD | HP {total.current_hp}/{total.hp} AP {total.ap} MP {total.current_mp}/{total.mp} | Gold {state.player.gold}"
             if adj_merch:
@@ -1031,14 +1140,15 @@ def main() -> int:
         grid_w, grid_h = active_grid.width, active_grid.height
         sx = max(1, mm_w // max(1, grid_w))
         sy = max(1, mm_h // max(1, grid_h))
-        for y0 in range(grid_h):
-            for x0 in range(grid_w):
-                col = (40, 50, 70)
-                if (x0, y0) in active_grid.blocked:
-                    col = (70, 40, 40)
-                rx = mm_x + x0 * sx
-                ry = mm_y + y0 * sy
-                pygame.draw.rect(screen, col, pygame.Rect(rx, ry, sx, sy))
+        # Terrain only changes with the grid, so it is drawn once per grid
+        if minimap_grid is not active_grid:
+            minimap_grid = active_grid
+            minimap_surf = pygame.Surface((mm_w, mm_h))
+            minimap_surf.fill((14, 14, 22))
+            minimap_surf.fill((40, 50, 70), pygame.Rect(0, 0, grid_w * sx, grid_h * sy))
+            for x0, y0 in active_grid.blocked_in(0, 0, mm_w // sx, mm_h // sy):
+                minimap_surf.fill((70, 40, 40), pygame.Rect(x0 * sx, y0 * sy, sx, sy))
+        screen.blit(minimap_surf, (mm_x, mm_y))
         # player dot
         px0, py0 = state.player.position
         pygame.draw.rect(screen, (80, 220, 120), pygame.Rect(mm_x + px0 * sx, mm_y + py0 * sy, max(2, sx), max(2, sy)))
@@ -1059,33 +1169,6 @@ def main() -> int:
 
 
 
-        # Step along movement path over time (combat only)
-        dt = clock.get_time() / 1000.0
-        step_timer += dt
-        if movement_path and step_timer >= step_interval:
-            step_timer = 0.0
-            nx, ny = movement_path.pop(0)
-            
-            state.player.position = (nx, ny)
-            if state.in_combat and state.combat_state:
-                state.combat_state.player_mp -= 1
-                if state.combat_state.player_mp <= 0:
-                    movement_path = []
-            else:
-                stepped_portal = next((p for p in (getattr(state, 'portals', []) or []) if (nx, ny) == p.position), None)
-                if stepped_portal and (nx, ny) == stepped_portal.position:
-                    movement_path = []
-                    travel_to_map(state, stepped_portal.destination_id)
-                    last_world_click_goal = None
-                hit = None
-                for m in list(getattr(state, 'monsters', [])):
-                    if m.position == state.player.position:
-                        hit = m
-                        break
-                if hit is not None:
-                    movement_path = []
-                    start_combat(state, hit)
-
         # No pixel world movement; keyboard moves are tile-based via try_move above
         # Bottom event log removed (Events now in right/left chat panel)
 
@@ -1099,9 +1182,16 @@ def main() -> int:
 
         
 
-        pygame.display.flip()
-        clock.tick(60)
+        hover_cells = preview_path + aoe_cells
+        if 0 <= gx < active_grid.width and 0 <= gy < active_grid.height:
+            hover_cells = hover_cells + [(gx, gy)]
+        hover_rect = cells_rect(hover_cells, cam_x - ox, cam_y - oy, TW, TH)
+        scheduler.mark("hover", hover_rect)
+        clock.tick(scheduler.present())
 
+    ai_worker.shutdown()
+    if watcher is not None:
+        watcher.stop()
     pygame.quit()
     return 0
 
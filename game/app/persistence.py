@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import json
+import queue
+import sqlite3
+import threading
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..engine.entities import Player
+from ..engine.inventory import get_item_by_id
+from ..engine.quests import QuestStatus, get_quest_by_id
+
+
+SECTION_PLAYER = "player"
+SECTION_INVENTORY = "inventory"
+SECTION_EQUIPMENT = "equipment"
+SECTION_QUESTS = "quests"
+
+EQUIPMENT_SLOTS = ("weapon", "armor", "helmet", "boots")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+	id TEXT PRIMARY KEY,
+	name TEXT NOT NULL,
+	gold INTEGER NOT NULL,
+	equipped_weapon TEXT,
+	melee_damage INTEGER NOT NULL,
+	ranged_damage INTEGER NOT NULL,
+	magic_damage INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS inventory (
+	player_id TEXT NOT NULL,
+	stack INTEGER NOT NULL,
+	item_id TEXT NOT NULL,
+	quantity INTEGER NOT NULL,
+	PRIMARY KEY (player_id, stack)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS equipment (
+	player_id TEXT NOT NULL,
+	slot TEXT NOT NULL,
+	item_id TEXT NOT NULL,
+	PRIMARY KEY (player_id, slot)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS quests (
+	player_id TEXT NOT NULL,
+	quest_id TEXT NOT NULL,
+	status TEXT NOT NULL,
+	progress TEXT NOT NULL,
+	PRIMARY KEY (player_id, quest_id)
+) WITHOUT ROWID;
+"""
+
+# A captured section: (section, player_id, rows). Rows are plain tuples taken on the
+# game thread so the writer never touches live engine objects.
+Mutation = Tuple[str, str, list]
+
+
+@dataclass
+class PersistenceStats:
+	batches: int = 0
+	mutations: int = 0
+	coalesced: int = 0
+	rows: int = 0
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+	conn = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+	conn.execute("PRAGMA journal_mode=WAL")
+	conn.execute("PRAGMA synchronous=NORMAL")
+	conn.execute("PRAGMA temp_store=MEMORY")
+	return conn
+
+
+def capture_section(player: Player, section: str) -> list:
+	if section == SECTION_PLAYER:
+		ws = player.progression.weapon_skills
+		return [(player.id, player.name, player.gold, player.progression.equipped_weapon, ws.melee_damage, ws.ranged_damage, ws.magic_damage)]
+	if section == SECTION_INVENTORY:
+		return [(player.id, i, it.id, it.quantity) for i, it in enumerate(player.inventory.items)]
+	if section == SECTION_EQUIPMENT:
+		eq = player.equipment
+		return [(player.id, slot, item.id) for slot, item in zip(EQUIPMENT_SLOTS, (eq.weapon, eq.armor, eq.helmet, eq.boots)) if item is not None]
+	if section == SECTION_QUESTS:
+		ql = player.quest_log
+		rows = []
+		for quest_id, quest in ql.active_quests.items():
+			progress = {obj.id: obj.current_amount for obj in quest.objectives}
+			rows.append((player.id, quest_id, QuestStatus.IN_PROGRESS.value, json.dumps(progress, separators=(",", ":"))))
+		rows.extend((player.id, q, QuestStatus.COMPLETED.value, "{}") for q in ql.completed_quests)
+		rows.extend((player.id, q, QuestStatus.FAILED.value, "{}") for q in ql.failed_quests)
+		return rows
+	raise ValueError(f"Unknown persistence section: {section}")
+
+
+def _write_batch(conn: sqlite3.Connection, batch: Dict[Tuple[str, str], list]) -> int:
+	rows = 0
+	by_section: Dict[str, List[Tuple[str, list]]] = {}
+	for (section, player_id), section_rows in batch.items():
+		by_section.setdefault(section, []).append((player_id, section_rows))
+	conn.execute("BEGIN")
+	try:
+		for player_id, section_rows in by_section.get(SECTION_PLAYER, []):
+			conn.executemany(
+				"INSERT INTO players (id, name, gold, equipped_weapon, melee_damage, ranged_damage, magic_damage) VALUES (?, ?, ?, ?, ?, ?, ?) "
+				"ON CONFLICT(id) DO UPDATE SET name=excluded.name, gold=excluded.gold, equipped_weapon=excluded.equipped_weapon, "
+				"melee_damage=excluded.melee_damage, ranged_damage=excluded.ranged_damage, magic_damage=excluded.magic_damage",
+				section_rows,
+			)
+			rows += len(section_rows)
+		for section, table, columns in (
+			(SECTION_INVENTORY, "inventory", "player_id, stack, item_id, quantity"),
+			(SECTION_EQUIPMENT, "equipment", "player_id, slot, item_id"),
+			(SECTION_QUESTS, "quests", "player_id, quest_id, status, progress"),
+		):
+			entries = by_section.get(section)
+			if not entries:
+				continue
+			conn.executemany(f"DELETE FROM {table} WHERE player_id = ?", [(pid,) for pid, _ in entries])
+			placeholders = ", ".join("?" for _ in columns.split(","))
+			all_rows = [r for _, section_rows in entries for r in section_rows]
+			conn.executemany(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", all_rows)
+			rows += len(all_rows)
+		conn.execute("COMMIT")
+	except Exception:
+		conn.execute("ROLLBACK")
+		raise
+	return rows
+
+
+class ProfileStore:
+	def __init__(self, path: Path, max_batch: int = 5000) -> None:
+		self.path = path
+		self.max_batch = max_batch
+		self.stats = PersistenceStats()
+		self.error: Optional[BaseException] = None
+		self._players: Dict[str, Player] = {}
+		self._dirty: Set[Tuple[str, str]] = set()
+		self._queue: "queue.Queue[Optional[List[Mutation]]]" = queue.Queue()
+		conn = _connect(path)
+		conn.executescript(SCHEMA)
+		conn.close()
+		self._writer = threading.Thread(target=self._run, name="profile-writer", daemon=True)
+		self._writer.start()
+
+	def attach(self, player: Player) -> None:
+		self._players[player.id] = player
+		pid = player.id
+		player.on_change = lambda: self._dirty.add((SECTION_PLAYER, pid))
+		player.progression.weapon_skills.on_change = lambda: self._dirty.add((SECTION_PLAYER, pid))
+		player.inventory.on_change = lambda: self._dirty.add((SECTION_INVENTORY, pid))
+		player.equipment.on_change = lambda: self._dirty.update(((SECTION_EQUIPMENT, pid), (SECTION_PLAYER, pid)))
+		player.quest_log.on_change = lambda: self._dirty.add((SECTION_QUESTS, pid))
+		for section in (SECTION_PLAYER, SECTION_INVENTORY, SECTION_EQUIPMENT, SECTION_QUESTS):
+			self._dirty.add((section, pid))
+
+	def detach(self, player: Player) -> None:
+		self.commit()
+		player.on_change = None
+		player.progression.weapon_skills.on_change = None
+		player.inventory.on_change = None
+		player.equipment.on_change = None
+		player.quest_log.on_change = None
+		self._players.pop(player.id, None)
+
+	def mark_dirty(self, player: Player, section: str) -> None:
+		self._dirty.add((section, player.id))
+
+	# Called from the game loop once per frame/tick: turns dirty flags into captured
+	# rows and hands them to the writer without waiting on disk.
+	def commit(self) -> int:
+		if not self._dirty:
+			return 0
+		dirty, self._dirty = self._dirty, set()
+		mutations: List[Mutation] = []
+		for section, pid in dirty:
+			player = self._players.get(pid)
+			if player is not None:
+				mutations.append((section, pid, capture_section(player, section)))
+		if mutations:
+			self._queue.put(mutations)
+		return len(mutations)
+
+	def flush(self) -> None:
+		self.commit()
+		self._queue.join()
+		if self.error is not None:
+			raise self.error
+
+	def close(self) -> None:
+		self.flush()
+		self._queue.put(None)
+		self._writer.join()
+
+	def _run(self) -> None:
+		conn = _connect(self.path)
+		try:
+			while True:
+				item = self._queue.get()
+				if item is None:
+					self._queue.task_done()
+					return
+				taken = 1
+				batch: Dict[Tuple[str, str], list] = {}
+				mutations = 0
+				stop = False
+				while True:
+					for section, pid, rows in item:
+						batch[(section, pid)] = rows
+					mutations += len(item)
+					if mutations >= self.max_batch:
+						break
+					try:
+						item = self._queue.get_nowait()
+					except queue.Empty:
+						break
+					taken += 1
+					if item is None:
+						stop = True
+						break
+				try:
+					self.stats.rows += _write_batch(conn, batch)
+					self.stats.batches += 1
+					self.stats.mutations += mutations
+					self.stats.coalesced += mutations - len(batch)
+				except BaseException as e:
+					self.error = e
+				for _ in range(taken):
+					self._queue.task_done()
+				if stop:
+					return
+		finally:
+			conn.close()
+
+	def load_into(self, player: Player) -> bool:
+		conn = _connect(self.path)
+		try:
+			row = conn.execute(
+				"SELECT gold, equipped_weapon, melee_damage, ranged_damage, magic_damage FROM players WHERE id = ?",
+				(player.id,),
+			).fetchone()
+			if row is None:
+				return False
+			inventory = conn.execute("SELECT item_id, quantity FROM inventory WHERE player_id = ? ORDER BY stack", (player.id,)).fetchall()
+			equipment = conn.execute("SELECT slot, item_id FROM equipment WHERE player_id = ?", (player.id,)).fetchall()
+			quests = conn.execute("SELECT quest_id, status, progress FROM quests WHERE player_id = ?", (player.id,)).fetchall()
+		finally:
+			conn.close()
+
+		player.gold, player.progression.equipped_weapon = row[0], row[1]
+		ws = player.progression.weapon_skills
+		ws.melee_damage, ws.ranged_damage, ws.magic_damage = row[2], row[3], row[4]
+
+		inv = player.inventory
+		inv.items = []
+		inv.total_weight = 0.0
+		for item_id, quantity in inventory:
+			item = _catalog_item(item_id)
+			inv.items.append(replace(item, quantity=quantity))
+			inv.total_weight += item.weight * quantity
+
+		eq = player.equipment
+		for slot in EQUIPMENT_SLOTS:
+			setattr(eq, slot, None)
+		for slot, item_id in equipment:
+			if slot in EQUIPMENT_SLOTS:
+				setattr(eq, slot, _catalog_item(item_id))
+
+		ql = player.quest_log
+		ql.active_quests, ql.completed_quests, ql.failed_quests = {}, [], []
+		for quest_id, status, progress in quests:
+			if status == QuestStatus.COMPLETED.value:
+				ql.completed_quests.append(quest_id)
+			elif status == QuestStatus.FAILED.value:
+				ql.failed_quests.append(quest_id)
+			else:
+				template = get_quest_by_id(quest_id)
+				if template is None:
+					raise ValueError(f"Unknown quest in profile {player.id}: {quest_id}")
+				quest = replace(template, objectives=[replace(o) for o in template.objectives])
+				amounts = json.loads(progress)
+				for obj in quest.objectives:
+					obj.current_amount = amounts.get(obj.id, 0)
+					obj.completed = obj.current_amount >= obj.required_amount
+				ql.active_quests[quest_id] = quest
+		# Loaded in place, so anything cached against the old contents is stale
+		for model in (player, ws, inv, eq, ql):
+			model.version += 1
+		return True
+
+
+def _catalog_item(item_id: str):
+	item = get_item_by_id(item_id)
+	if item is None:
+		raise ValueError(f"Unknown item in profile: {item_id}")
+	return item
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import os
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..engine.combat import IntentLog
+from ..engine.entities import Monster, Merchant, Npc, Portal
+from ..engine.monster_store import MonsterStore
+from ..engine.snapshot import (
+	SECTION_COMBAT,
+	SnapshotReader,
+	SnapshotWriter,
+	decode_combat,
+	decode_player_sections,
+	encode_combat,
+	encode_player_sections,
+	pack_sections,
+	read_entities,
+	read_grid,
+	unpack_sections,
+	write_entities,
+	write_grid,
+)
+from .game_loop import GameState, ChatLog, ChatMessage
+
+
+SECTION_WORLD = "WRLD"
+SECTION_LOG = "LOG_"
+SECTION_CHAT = "CHAT"
+SECTION_ZONE = "ZONE"
+
+
+def _encode_world(state: GameState) -> bytes:
+	w = SnapshotWriter()
+	w.string(state.map_name)
+	write_grid(w, state.grid)
+	monsters = state.monsters
+	if isinstance(monsters, MonsterStore):
+		monsters = [monsters.to_monster(row) for row in monsters.rows()]
+	write_entities(w, monsters)
+	write_entities(w, state.merchants)
+	write_entities(w, state.npcs or [])
+	write_entities(w, state.portals or [])
+	w.u8(state.in_combat)
+	pos = state.player_world_pos
+	w.u8(pos is not None)
+	if pos is not None:
+		w.i32(pos[0])
+		w.i32(pos[1])
+	return w.getvalue()
+
+
+def _encode_zone(state: GameState) -> bytes:
+	w = SnapshotWriter()
+	w.string(state.map_id)
+	w.u32(state.world_seed)
+	return w.getvalue()
+
+
+def _encode_log(log: IntentLog) -> bytes:
+	w = SnapshotWriter()
+	w.strings(log.entries)
+	return w.getvalue()
+
+
+def _encode_chat(chat: ChatLog) -> bytes:
+	w = SnapshotWriter()
+	w.u32(len(chat.entries))
+	for msg in chat.entries:
+		w.string(msg.timestamp)
+		w.string(msg.author)
+		w.string(msg.text)
+		w.string(msg.type)
+	return w.getvalue()
+
+
+def encode_game_state(state: GameState) -> Dict[str, bytes]:
+	sections = encode_player_sections(state.player)
+	sections[SECTION_WORLD] = _encode_world(state)
+	sections[SECTION_COMBAT] = encode_combat(state.combat_state)
+	sections[SECTION_LOG] = _encode_log(state.log)
+	sections[SECTION_CHAT] = _encode_chat(state.chat)
+	sections[SECTION_ZONE] = _encode_zone(state)
+	return sections
+
+
+def decode_game_state(sections: Dict[str, bytes]) -> GameState:
+	player = decode_player_sections(sections)
+	try:
+		log = IntentLog(entries=SnapshotReader(sections[SECTION_LOG]).strings())
+		r = SnapshotReader(sections[SECTION_CHAT])
+		chat = ChatLog(entries=[
+			ChatMessage(timestamp=r.string(), author=r.string(), text=r.string(), type=r.string())
+			for _ in range(r.u32())
+		])
+		r = SnapshotReader(sections[SECTION_WORLD])
+		map_name = r.string()
+		grid = read_grid(r)
+		monsters = [e for e in read_entities(r) if isinstance(e, Monster)]
+		merchants = [e for e in read_entities(r) if isinstance(e, Merchant)]
+		npcs = [e for e in read_entities(r) if isinstance(e, Npc)]
+		portals = [e for e in read_entities(r) if isinstance(e, Portal)]
+		in_combat = bool(r.u8())
+		player_world_pos = (r.i32(), r.i32()) if r.u8() else None
+		combat_state = decode_combat(sections[SECTION_COMBAT], player, log)
+		# Older saves carry no zone section; they load as the hub
+		map_id, world_seed = "zone_001", 0
+		if SECTION_ZONE in sections:
+			r = SnapshotReader(sections[SECTION_ZONE])
+			map_id, world_seed = r.string(), r.u32()
+	except KeyError as e:
+		raise ValueError(f"Invalid save: missing section {e.args[0]}")
+	except (struct.error, IndexError) as e:
+		raise ValueError(f"Invalid save: {e}")
+	return GameState(
+		grid=grid,
+		player=player,
+		monsters=monsters,
+		merchants=merchants,
+		map_name=map_name,
+		log=log,
+		chat=chat,
+		npcs=npcs,
+		portals=portals,
+		combat_state=combat_state,
+		in_combat=in_combat and combat_state is not None,
+		player_world_pos=player_world_pos,
+		world_seed=world_seed,
+		map_id=map_id,
+	)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+	tmp = path.with_name(path.name + ".tmp")
+	with tmp.open("wb") as f:
+		f.write(data)
+		f.flush()
+		os.fsync(f.fileno())
+	os.replace(tmp, path)
+
+
+def save_game(state: GameState, path: Path) -> int:
+	data = pack_sections(encode_game_state(state))
+	path.parent.mkdir(parents=True, exist_ok=True)
+	_atomic_write(path, data)
+	return len(data)
+
+
+def load_game(path: Path) -> GameState:
+	try:
+		data = path.read_bytes()
+	except OSError as e:
+		raise ValueError(f"Cannot read save at {path}: {e}")
+	return decode_game_state(unpack_sections(data))
+
+
+# One file per section; only sections whose encoded bytes changed are rewritten.
+class Autosave:
+	def __init__(self, directory: Path) -> None:
+		self.directory = directory
+		self._written: Dict[str, bytes] = {}
+
+	def _section_path(self, tag: str) -> Path:
+		return self.directory / f"{tag}.sec"
+
+	def save(self, state: GameState) -> List[str]:
+		self.directory.mkdir(parents=True, exist_ok=True)
+		changed: List[str] = []
+		for tag, payload in encode_game_state(state).items():
+			if self._written.get(tag) == payload:
+				continue
+			_atomic_write(self._section_path(tag), pack_sections({tag: payload}))
+			self._written[tag] = payload
+			changed.append(tag)
+		return changed
+
+	def load(self) -> Optional[GameState]:
+		sections: Dict[str, bytes] = {}
+		for path in sorted(self.directory.glob("*.sec")):
+			sections.update(unpack_sections(path.read_bytes()))
+		if not sections:
+			return None
+		state = decode_game_state(sections)
+		self._written = sections
+		return state
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+
+SIM_HZ = 60
+MAX_CATCH_UP = 8
+
+
+def lerp(a: float, b: float, t: float) -> float:
+	return a + (b - a) * t
+
+
+def lerp2(a: Tuple[float, float], b: Tuple[float, float], t: float) -> Tuple[float, float]:
+	return (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+
+
+# Frame time is banked and drained in fixed slices so the simulation advances the
+# same amount per second at any frame rate. A stall longer than max_steps slices is
+# clamped and the excess dropped, so a hitch slows the game down for a moment instead
+# of making every following frame run an ever longer catch-up. alpha is the part of
+# a slice still banked, for drawing between the previous and current states.
+class FixedTimestep:
+	def __init__(self, hz: int = SIM_HZ, max_steps: int = MAX_CATCH_UP) -> None:
+		self.dt = 1.0 / hz
+		self.max_steps = max_steps
+		self.accumulator = 0.0
+		self.ticks = 0
+		self.dropped = 0.0
+
+	def advance(self, frame_seconds: float) -> int:
+		self.accumulator += max(0.0, frame_seconds)
+		steps = int(self.accumulator / self.dt)
+		if steps > self.max_steps:
+			self.dropped += (steps - self.max_steps) * self.dt
+			steps = self.max_steps
+			self.accumulator = self.max_steps * self.dt
+		self.accumulator = max(0.0, self.accumulator - steps * self.dt)
+		self.ticks += steps
+		return steps
+
+	@property
+	def alpha(self) -> float:
+		return min(1.0, self.accumulator / self.dt)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+import pygame
+
+
+# kind: (body colour, shadow (dx, dy, w, h) from the tile centre, body radius at scale 1, minimum radius)
+SPRITES: Dict[str, Tuple[Tuple[int, int, int], Tuple[int, int, int, int], int, int]] = {
+    "player": ((80, 200, 120), (-10, 6, 22, 8), 12, 8),
+    "monster": ((200, 60, 60), (-9, 4, 18, 6), 10, 6),
+    "merchant": ((255, 215, 0), (-10, 4, 20, 6), 10, 6),
+    "npc": ((80, 200, 80), (-10, 4, 20, 6), 10, 6),
+    "portal": ((100, 140, 255), (-10, 4, 20, 6), 10, 6),
+    "portal_closed": ((120, 120, 120), (-10, 4, 20, 6), 10, 6),
+}
+
+LABEL_COLOR = (220, 220, 230)
+
+Blit = Tuple[pygame.Surface, Tuple[int, int], pygame.Rect]
+
+
+# Every entity sprite (shadow plus body) for one zoom level, rendered once into a
+# single surface. draw() returns a blit tuple so a frame's entities can be issued
+# through one Surface.blits call; (tw, th) fixes where the tile centre falls.
+class EntityAtlas:
+    def __init__(self, tw: int, th: int, scale: float) -> None:
+        self.tw = tw
+        self.th = th
+        self.areas: Dict[str, pygame.Rect] = {}
+        self.anchors: Dict[str, Tuple[int, int]] = {}
+        self._labels: Dict[str, pygame.Surface] = {}
+        self._font = None
+        boxes = []
+        x = 0
+        for kind, (color, shadow, radius, min_radius) in SPRITES.items():
+            r = max(min_radius, int(radius * scale))
+            sdx, sdy, sw, sh = shadow
+            left = min(-r, sdx)
+            top = -r
+            right = max(r, sdx + sw)
+            bottom = max(r, sdy + sh)
+            w = right - left + 1
+            h = bottom - top + 1
+            boxes.append((kind, color, shadow, r, left, top))
+            self.areas[kind] = pygame.Rect(x, 0, w, h)
+            self.anchors[kind] = (left, top)
+            x += w + 1
+        self.surface = pygame.Surface((max(1, x), max(a.h for a in self.areas.values())), pygame.SRCALPHA)
+        for kind, color, (sdx, sdy, sw, sh), r, left, top in boxes:
+            area = self.areas[kind]
+            cx = area.x - left
+            cy = area.y - top
+            pygame.draw.ellipse(self.surface, (0, 0, 0), pygame.Rect(cx + sdx, cy + sdy, sw, sh))
+            pygame.draw.circle(self.surface, color, (cx, cy), r)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+
+    def draw(self, kind: str, sx: int, sy: int) -> Blit:
+        ax, ay = self.anchors[kind]
+        return (self.surface, (sx + self.tw // 2 + ax, sy + self.th // 2 + ay), self.areas[kind])
+
+    def label(self, text: str, sx: int, sy: int) -> Blit:
+        surf = self._labels.get(text)
+        if surf is None:
+            if self._font is None:
+                self._font = pygame.font.SysFont(None, 18)
+            surf = self._labels[text] = self._font.render(text, True, LABEL_COLOR)
+        return (surf, (sx + self.tw // 2 - surf.get_width() // 2, sy - 14), surf.get_rect())
+
+
+@lru_cache(maxsize=8)
+def atlas_for(tw: int, th: int, scale: float) -> EntityAtlas:
+    return EntityAtlas(tw, th, scale)
+
+
+# Sorts (depth, blit) pairs back to front and draws them in one batched call.
+# Depth is x + y in tile space, ties broken by x, as in iso_coords_scaled.
+def blit_sorted(screen: pygame.Surface, draws: Sequence[Tuple[Tuple[float, float, int], Blit]]) -> None:
+    ordered: List[Blit] = [blit for _, blit in sorted(draws, key=lambda d: d[0])]
+    screen.blits(ordered, doreturn=False)
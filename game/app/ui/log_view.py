@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import pygame
+
+
+Formatter = Callable[[object], Tuple[str, Tuple[int, int, int]]]
+
+
+def wrap_text(font: pygame.font.Font, text: str, width: int) -> List[str]:
+    lines: List[str] = []
+    current = ""
+    for word in text.split(" "):
+        candidate = f"{current} {word}" if current else word
+        if current and font.size(candidate)[0] > width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    lines.append(current)
+    return lines
+
+
+# Scrollable view over an append-only list of log entries. Entries are identified
+# by their index, so each one is formatted, wrapped and rendered once and the
+# surfaces are kept in a bounded LRU; a frame only touches the entries that fit in
+# the panel, however long the log is. scroll counts entries up from the newest.
+class LogView:
+    def __init__(self, font_size: int = 20, line_h: int = 18, capacity: int = 512) -> None:
+        self.font_size = font_size
+        self.line_h = line_h
+        self.capacity = capacity
+        self.cache: "OrderedDict[int, List[pygame.Surface]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._font: Optional[pygame.font.Font] = None
+        self._source: Optional[Sequence] = None
+        self._length = 0
+        self._width = 0
+
+    def _lines(self, index: int, entry, fmt: Formatter, width: int) -> List[pygame.Surface]:
+        lines = self.cache.get(index)
+        if lines is not None:
+            self.cache.move_to_end(index)
+            self.hits += 1
+            return lines
+        self.misses += 1
+        if self._font is None:
+            self._font = pygame.font.SysFont(None, self.font_size)
+        text, color = fmt(entry)
+        lines = [self._font.render(part, True, color) for part in wrap_text(self._font, text, width)]
+        self.cache[index] = lines
+        if len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+        return lines
+
+    def draw(self, screen: pygame.Surface, entries: Sequence, fmt: Formatter, x: int, y: int, width: int, height: int, scroll: int) -> int:
+        # A replaced or truncated list reuses indices for different entries
+        if entries is not self._source or len(entries) < self._length or width != self._width:
+            self.cache.clear()
+            self._source = entries
+            self._width = width
+        self._length = len(entries)
+        scroll = max(0, min(scroll, len(entries) - 1))
+        rows = max(1, height // self.line_h)
+        visible: List[pygame.Surface] = []
+        i = len(entries) - 1 - scroll
+        while i >= 0 and len(visible) < rows:
+            visible[:0] = self._lines(i, entries[i], fmt, width)
+            i -= 1
+        visible = visible[-rows:]
+        screen.blits([(surf, (x, y + k * self.line_h)) for k, surf in enumerate(visible)], doreturn=False)
+        return scroll
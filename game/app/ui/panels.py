@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Optional
+
 import pygame
 
+from ...engine.ability import registry_version
+
 from .theme import (
     COLOR_BG,
     COLOR_PANEL,
@@ -13,11 +19,85 @@ from .theme import (
 )
 
 
+@lru_cache(maxsize=None)
+def _font(size: int) -> pygame.font.Font:
+    return pygame.font.SysFont(None, size)
+
+
+# A panel's last rendering, rebuilt only when the key built from its inputs'
+# version counters and the current selection changes; otherwise a frame costs
+# one blit.
+class PanelCache:
+    def __init__(self) -> None:
+        self.key: Optional[Hashable] = None
+        self.surface: Optional[pygame.Surface] = None
+        self.builds = 0
+
+    def blit(self, screen: pygame.Surface, key: Hashable, x: int, y: int, w: int, h: int, render: Callable[[pygame.Surface], None]) -> None:
+        if self.surface is None or key != self.key or self.surface.get_size() != (w, h):
+            if self.surface is None or self.surface.get_size() != (w, h):
+                self.surface = pygame.Surface((w, h))
+            render(self.surface)
+            self.key = key
+            self.builds += 1
+        screen.blit(self.surface, (x, y))
+
+
+PANEL_CACHES: Dict[str, PanelCache] = {
+    "inventory": PanelCache(),
+    "profile": PanelCache(),
+    "shop": PanelCache(),
+}
+
+
 def draw_inventory_panel(screen: pygame.Surface, state, x: int, y: int, w: int, h: int, inv_tab: int, inv_sel: int, sell_mode: bool) -> None:
+    inv = state.player.inventory
+    key = (id(inv), inv.version, inv_tab, inv_sel, sell_mode)
+    PANEL_CACHES["inventory"].blit(screen, key, x, y, w, h, lambda surf: _render_inventory_panel(surf, state, 0, 0, w, h, inv_tab, inv_sel, sell_mode))
+
+
+def draw_profile_panel(screen: pygame.Surface, state, x: int, y: int, w: int, h: int) -> None:
+    player = state.player
+    total = player.get_total_stats()
+    key = (
+        id(player),
+        player.version,
+        player.inventory.version,
+        player.equipment.version,
+        player.progression.weapon_skills.version,
+        player.name,
+        (total.current_hp, total.hp, total.ap, total.mp, total.atk, total.res, total.armor),
+        registry_version(),
+    )
+    PANEL_CACHES["profile"].blit(screen, key, x, y, w, h, lambda surf: _render_profile_panel(surf, state, 0, 0, w, h))
+
+
+def draw_shop_panel(screen: pygame.Surface, state, x: int, y: int, w: int, h: int, shop_sel: int) -> None:
+    adj = None
+    for m in getattr(state, 'merchants', []):
+        if abs(state.player.position[0]-m.position[0]) + abs(state.player.position[1]-m.position[1]) == 1:
+            adj = m
+            break
+    # The shop file's stamp is part of the key, so an edited shop shows on reopen
+    stamp = None
+    if adj:
+        try:
+            stamp = _shop_path(adj.shop_id).stat().st_mtime_ns
+        except OSError:
+            pass
+    key = (adj.shop_id if adj else None, stamp, shop_sel)
+    PANEL_CACHES["shop"].blit(screen, key, x, y, w, h, lambda surf: _render_shop_panel(surf, adj, 0, 0, w, h, shop_sel))
+
+
+def _shop_path(shop_id: str) -> Path:
+    return Path(__file__).resolve().parents[2] / 'content' / 'shops' / f"{shop_id}.json"
+
+
+def _render_inventory_panel(screen: pygame.Surface, state, x: int, y: int, w: int, h: int, inv_tab: int, inv_sel: int, sell_mode: bool) -> None:
     pygame.draw.rect(screen, COLOR_PANEL, pygame.Rect(x, y, w, h))
     pygame.draw.rect(screen, COLOR_HEADER, pygame.Rect(x, y, w, 28))
-    font = pygame.font.SysFont(None, 22)
-    header = pygame.font.SysFont(None, 22)
+    font = _font(22)
+    header = _font(22)
     tabs = ["Items", "Weapons", "Armor"]
     tab_text = "  ".join([("["+t+"]") if i == inv_tab else t for i, t in enumerate(tabs)])
     if sell_mode:
@@ -63,18 +143,18 @@ def draw_inventory_panel(screen: pygame.Surface, state, x: int, y: int, w: int,
             screen.blit(font.render("Enter: Use/Equip  Esc: Close", True, COLOR_SUBTEXT), (info_x, info_y))
 
 
-def draw_profile_panel(screen: pygame.Surface, state, x: int, y: int, w: int, h: int) -> None:
+def _render_profile_panel(screen: pygame.Surface, state, x: int, y: int, w: int, h: int) -> None:
     pygame.draw.rect(screen, COLOR_PANEL, pygame.Rect(x, y, w, h))
     pygame.draw.rect(screen, COLOR_HEADER, pygame.Rect(x, y, w, 32))
-    title = pygame.font.SysFont(None, 26).render("Profile", True, COLOR_TEXT)
+    title = _font(26).render("Profile", True, COLOR_TEXT)
     screen.blit(title, (x + 12, y + 6))
 
     total = state.player.get_total_stats()
     # Identity & Stats
     sleft_x = x + 16
     sleft_y = y + 44
-    f24 = pygame.font.SysFont(None, 24)
-    f22 = pygame.font.SysFont(None, 22)
+    f24 = _font(24)
+    f22 = _font(22)
     screen.blit(f24.render(f"Name: {state.player.name}", True, COLOR_TEXT), (sleft_x, sleft_y)); sleft_y += 26
     screen.blit(f24.render(f"Gold: {state.player.gold}", True, COLOR_TEXT), (sleft_x, sleft_y)); sleft_y += 26
     for lab, val in [("HP", f"{total.current_hp}/{total.hp}"), ("AP", total.ap), ("MP", total.mp), ("ATK", total.atk), ("RES", total.res), ("ARMOR", total.armor)]:
@@ -90,7 +170,7 @@ def draw_profile_panel(screen: pygame.Surface, state, x: int, y: int, w: int, h:
     if eq.weapon:
         from ..game_loop import get_abilities_for_weapon
         abs_list = [a.name for a in get_abilities_for_weapon(eq.weapon.weapon_type)][:3]
-        screen.blit(pygame.font.SysFont(None, 20).render("Abilities: " + ", ".join(abs_list), True, COLOR_SUBTEXT), (mid_x+10, mid_y)); mid_y += 22
+        screen.blit(_font(20).render("Abilities: " + ", ".join(abs_list), True, COLOR_SUBTEXT), (mid_x+10, mid_y)); mid_y += 22
     for slot, item in [("Armor", eq.armor), ("Helmet", eq.helmet), ("Boots", eq.boots)]:
         name = item.name if item else "None"
         screen.blit(f22.render(f"{slot}: {name}", True, COLOR_SUBTEXT), (mid_x, mid_y)); mid_y += 22
@@ -101,7 +181,7 @@ def draw_profile_panel(screen: pygame.Surface, state, x: int, y: int, w: int, h:
 
     # Weight
     wt = state.player.inventory.total_weight
-    wtxt = pygame.font.SysFont(None, 20).render(f"Weight: {wt:.1f}/{state.player.inventory.max_weight}", True, COLOR_SUBTEXT)
+    wtxt = _font(20).render(f"Weight: {wt:.1f}/{state.player.inventory.max_weight}", True, COLOR_SUBTEXT)
     screen.blit(wtxt, (x + 16, y + h - 30))
 
     # Weapon skills
@@ -115,25 +195,18 @@ def draw_profile_panel(screen: pygame.Surface, state, x: int, y: int, w: int, h:
         pygame.draw.rect(screen, (40,45,60), pygame.Rect(right_x, right_y, bar_w, 16))
         fill = int(min(1.0, val/100.0) * bar_w)
         pygame.draw.rect(screen, COLOR_HILITE, pygame.Rect(right_x, right_y, fill, 16))
-        lab = pygame.font.SysFont(None, 20).render(f"{label}: {val}", True, COLOR_SUBTEXT)
+        lab = _font(20).render(f"{label}: {val}", True, COLOR_SUBTEXT)
         screen.blit(lab, (right_x + bar_w + 10, right_y - 2))
         right_y += 24
 
 
-def draw_shop_panel(screen: pygame.Surface, state, x: int, y: int, w: int, h: int, shop_sel: int) -> None:
+def _render_shop_panel(screen: pygame.Surface, adj, x: int, y: int, w: int, h: int, shop_sel: int) -> None:
     pygame.draw.rect(screen, COLOR_PANEL, pygame.Rect(x, y, w, h))
-    font = pygame.font.SysFont(None, 22)
-    # Find adjacent merchant
-    adj = None
-    for m in getattr(state, 'merchants', []):
-        if abs(state.player.position[0]-m.position[0]) + abs(state.player.position[1]-m.position[1]) == 1:
-            adj = m
-            break
+    font = _font(22)
     if not adj:
         return
     from ...engine.content import load_shop
-    from pathlib import Path
-    shop = load_shop(Path(__file__).resolve().parents[2] / 'content' / 'shops' / f"{adj.shop_id}.json")
+    shop = load_shop(_shop_path(adj.shop_id))
     screen.blit(font.render(shop.name, True, COLOR_TEXT), (x + 10, y + 8))
     ylist = y + 36
     for i, it in enumerate(shop.items[:10]):
@@ -148,12 +221,12 @@ def draw_npc_dialog(screen: pygame.Surface, text: str, screen_w: int, screen_h:
     panel_w, panel_h = 520, 160
     panel_x, panel_y = screen_w//2 - panel_w//2, screen_h - panel_h - 60
     pygame.draw.rect(screen, COLOR_PANEL, pygame.Rect(panel_x, panel_y, panel_w, panel_h))
-    speaker = pygame.font.SysFont(None, 24).render("NPC:", True, COLOR_TEXT)
+    speaker = _font(24).render("NPC:", True, COLOR_TEXT)
     # Simple word wrap
     words = text.split(" ")
     lines: list[str] = []
     cur = ""
-    font24 = pygame.font.SysFont(None, 24)
+    font24 = _font(24)
     for w in words:
         test = (cur + " " + w).strip()
         if font24.size(test)[0] > panel_w - 24:
@@ -169,7 +242,7 @@ def draw_npc_dialog(screen: pygame.Surface, text: str, screen_w: int, screen_h:
         surf = font24.render(ln, True, COLOR_TEXT)
         screen.blit(surf, (panel_x + 12, y_text))
         y_text += 26
-    hint = pygame.font.SysFont(None, 20).render("Enter/Esc to close", True, COLOR_SUBTEXT)
+    hint = _font(20).render("Enter/Esc to close", True, COLOR_SUBTEXT)
     screen.blit(hint, (panel_x + panel_w - 180, panel_y + panel_h - 28))
 
 
@@ -177,18 +250,18 @@ def draw_merchant_dialog(screen: pygame.Surface, text: str, stage: str, sel: int
     panel_w, panel_h = 520, 180
     panel_x, panel_y = screen_w//2 - panel_w//2, screen_h - panel_h - 60
     pygame.draw.rect(screen, COLOR_PANEL, pygame.Rect(panel_x, panel_y, panel_w, panel_h))
-    speaker = pygame.font.SysFont(None, 24).render("Merchant:", True, COLOR_TEXT)
-    msg = pygame.font.SysFont(None, 24).render(text, True, COLOR_TEXT)
+    speaker = _font(24).render("Merchant:", True, COLOR_TEXT)
+    msg = _font(24).render(text, True, COLOR_TEXT)
     screen.blit(speaker, (panel_x + 12, panel_y + 12))
     screen.blit(msg, (panel_x + 12, panel_y + 44))
     if stage == "greet":
-        hint = pygame.font.SysFont(None, 20).render("Enter: Continue  Esc: Close", True, COLOR_SUBTEXT)
+        hint = _font(20).render("Enter: Continue  Esc: Close", True, COLOR_SUBTEXT)
         screen.blit(hint, (panel_x + panel_w - 200, panel_y + panel_h - 28))
     else:
         opts = ["Buy", "Sell", "Leave"]
         for i, label in enumerate(opts):
             col = COLOR_TEXT if i == sel else COLOR_SUBTEXT
-            surf = pygame.font.SysFont(None, 24).render(label, True, col)
+            surf = _font(24).render(label, True, col)
             screen.blit(surf, (panel_x + 24, panel_y + 80 + i*26))
 
 
@@ -196,9 +269,9 @@ def draw_portal_dialog(screen: pygame.Surface, screen_w: int, screen_h: int) ->
     panel_w, panel_h = 520, 140
     panel_x, panel_y = screen_w//2 - panel_w//2, screen_h - panel_h - 60
     pygame.draw.rect(screen, COLOR_PANEL, pygame.Rect(panel_x, panel_y, panel_w, panel_h))
-    title = pygame.font.SysFont(None, 24).render("Portal", True, COLOR_TEXT)
-    msg = pygame.font.SysFont(None, 24).render("Enter to open portal menu (WIP)", True, COLOR_TEXT)
+    title = _font(24).render("Portal", True, COLOR_TEXT)
+    msg = _font(24).render("Enter to open portal menu (WIP)", True, COLOR_TEXT)
     screen.blit(title, (panel_x + 12, panel_y + 12))
     screen.blit(msg, (panel_x + 12, panel_y + 48))
-    hint = pygame.font.SysFont(None, 20).render("Enter/Esc to close", True, COLOR_SUBTEXT)
+    hint = _font(20).render("Enter/Esc to close", True, COLOR_SUBTEXT)
     screen.blit(hint, (panel_x + panel_w - 180, panel_y + panel_h - 28))
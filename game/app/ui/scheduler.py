@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import List, Optional, Set
+
+import pygame
+
+
+ACTIVE_FPS = 60
+IDLE_FPS = 10
+
+
+# Decides whether the next frame has to be drawn at all. Callers mark a reason for
+# every change that affects the screen; a reason with a rect only touches that part
+# of the screen, so the frame is presented with display.update instead of a flip.
+# With nothing marked the loop skips drawing and ticks at IDLE_FPS.
+class RenderScheduler:
+    def __init__(self, active_fps: int = ACTIVE_FPS, idle_fps: int = IDLE_FPS) -> None:
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.reasons: Set[str] = set()
+        self.rects: List[pygame.Rect] = []
+        self.full = True
+        self.awake = False
+        self.frames = 0
+        self.skipped = 0
+
+    def mark(self, reason: str, rect: Optional[pygame.Rect] = None) -> None:
+        self.reasons.add(reason)
+        if rect is None:
+            self.full = True
+        elif rect.w > 0 and rect.h > 0:
+            self.rects.append(rect)
+
+    # Keeps the loop ticking at full rate without forcing a redraw, for timers that
+    # are running but have not changed anything on screen yet.
+    def wake(self) -> None:
+        self.awake = True
+
+    @property
+    def dirty(self) -> bool:
+        return self.full or bool(self.reasons)
+
+    def idle(self) -> int:
+        self.skipped += 1
+        fps = self.active_fps if self.awake else self.idle_fps
+        self.awake = False
+        return fps
+
+    def present(self) -> int:
+        if self.full:
+            pygame.display.flip()
+        elif self.rects:
+            pygame.display.update(self.rects)
+        self.frames += 1
+        self.reasons.clear()
+        self.rects = []
+        self.full = False
+        self.awake = False
+        return self.active_fps
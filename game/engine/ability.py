@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
 from .effects import Damage, Push, BuffAp, Charge, Effect
+from .tags import tag_mask
 
 
 @dataclass
@@ -16,13 +18,70 @@ class Ability:
 	range_max: int
 	effects: List[Effect]
 	weapon_type: str = ""
+	area_shape: str = "cell"
+	area_size: int = 0
+	compiled: Dict[str, Tuple[Callable[..., Any], ...]] = field(default_factory=dict, repr=False, compare=False)
+	tag_mask: int = field(init=False, default=0, repr=False, compare=False)
+
+	def __post_init__(self) -> None:
+		self.tag_mask = tag_mask(self.tags)
 
 
 REGISTRY: Dict[str, Ability] = {}
+# Bumped on every registry change, so caches of what abilities look like (names on
+# panels) can tell a reload happened
+_registry_version = 0
+
+
+def registry_version() -> int:
+	return _registry_version
+
+# Effect resolution backends ("live" combat, "sim" snapshots) register one handler per
+# effect type; each ability is compiled against every backend into a tuple of handlers
+# with the effect already bound, so a cast is a straight loop over callables.
+EFFECT_HANDLERS: Dict[str, Dict[type, Callable[..., Any]]] = {}
+
+
+def compile_ability(ability: Ability, pipeline: str) -> Tuple[Callable[..., Any], ...]:
+	handlers = EFFECT_HANDLERS[pipeline]
+	compiled = tuple(partial(handlers[type(effect)], effect) for effect in ability.effects)
+	ability.compiled[pipeline] = compiled
+	return compiled
+
+
+def effect_pipeline(ability: Ability, pipeline: str) -> Tuple[Callable[..., Any], ...]:
+	compiled = ability.compiled.get(pipeline)
+	if compiled is None:
+		compiled = compile_ability(ability, pipeline)
+	return compiled
+
+
+def register_effect_handlers(pipeline: str, handlers: Dict[type, Callable[..., Any]]) -> None:
+	EFFECT_HANDLERS[pipeline] = handlers
+	for ability in REGISTRY.values():
+		compile_ability(ability, pipeline)
 
 
 def register(ability: Ability) -> None:
+	global _registry_version
 	REGISTRY[ability.id] = ability
+	_registry_version += 1
+	for pipeline in EFFECT_HANDLERS:
+		compile_ability(ability, pipeline)
+
+
+# Compiles the new abilities before any of them is visible, then publishes them
+# id by id; a reader (the AI worker included) sees either the old or the new entry
+def swap_abilities(abilities: Iterable[Ability], removed: Iterable[str] = ()) -> None:
+	global _registry_version
+	fresh = list(abilities)
+	for ability in fresh:
+		for pipeline in EFFECT_HANDLERS:
+			compile_ability(ability, pipeline)
+	REGISTRY.update((ability.id, ability) for ability in fresh)
+	for ability_id in removed:
+		REGISTRY.pop(ability_id, None)
+	_registry_version += 1
 
 
 def get_abilities_for_weapon(weapon_type: str) -> List[Ability]:
@@ -115,7 +174,9 @@ def create_weapon_abilities() -> None:
 			range_min=2,
 			range_max=5,
 			effects=[Damage(amount=40)],
-			weapon_type="staff"
+			weapon_type="staff",
+			area_shape="circle",
+			area_size=1
 		),
 		Ability(
 			id="ice_shield",
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from .ability import REGISTRY
+from .combat import CombatState, TurnQueue, conclude_monster_turn, initiative
+from .combat_sim import (
+	Action,
+	Attack,
+	Cast,
+	CombatSnapshot,
+	EndTurn,
+	Move,
+	TEAM_PLAYER,
+	apply,
+	is_over,
+	legal_actions,
+	snapshot_combat,
+)
+from .distance_field import DistanceField, UNREACHABLE
+from .effects import Damage, Charge
+
+
+Coord = Tuple[int, int]
+Plan = Tuple[int, List[Action]]
+
+
+@dataclass
+class SearchReport:
+	actor: int = 0
+	nodes: int = 0
+	depth: int = 0
+	elapsed_ms: float = 0.0
+	budget_ms: float = 0.0
+
+	@property
+	def nodes_per_sec(self) -> float:
+		if self.elapsed_ms <= 0:
+			return 0.0
+		return self.nodes / (self.elapsed_ms / 1000.0)
+
+
+class AiPolicy(ABC):
+	@abstractmethod
+	def plan_turn(self, snap: CombatSnapshot, actor: int) -> List[Action]:
+		...
+
+	def take_turn(self, combat_state: CombatState) -> None:
+		execute_monster_plans(combat_state, plan_monster_phase(self, snapshot_combat(combat_state)))
+
+
+def _start_turn(snap: CombatSnapshot, actor: int) -> CombatSnapshot:
+	unit = snap.roster[actor]
+	ap = snap.ap[:actor] + (unit.base_ap,) + snap.ap[actor + 1:]
+	mp = snap.mp[:actor] + (unit.base_mp,) + snap.mp[actor + 1:]
+	return snap._replace(active=actor, ap=ap, mp=mp)
+
+
+# The same initiative order as live combat, over roster indices
+def turn_queue(snap: CombatSnapshot) -> TurnQueue[int]:
+	queue: TurnQueue[int] = TurnQueue()
+	for i, u in enumerate(snap.roster):
+		if u.team != TEAM_PLAYER and snap.hp[i] > 0:
+			queue.push(i, initiative(u.base_ap, u.base_mp))
+	return queue
+
+
+def plan_monster_phase(policy: AiPolicy, snap: CombatSnapshot) -> List[Plan]:
+	plans: List[Plan] = []
+	queue = turn_queue(snap)
+	actor = queue.pop()
+	while actor is not None:
+		if snap.hp[actor] <= 0:
+			actor = queue.pop()
+			continue
+		snap = _start_turn(snap, actor)
+		actions = policy.plan_turn(snap, actor)
+		for action in actions:
+			if isinstance(action, EndTurn):
+				break
+			snap = apply(snap, action)
+		plans.append((actor, actions))
+		if is_over(snap):
+			break
+		actor = queue.pop()
+	return plans
+
+
+def execute_monster_plans(combat_state: CombatState, plans: List[Plan]) -> None:
+	snap = snapshot_combat(combat_state)
+	for actor, actions in plans:
+		if actor >= len(snap.roster) or snap.hp[actor] <= 0:
+			continue
+		snap = _start_turn(snap, actor)
+		unit = snap.roster[actor]
+		for action in actions:
+			if isinstance(action, EndTurn) or action not in legal_actions(snap, actor):
+				break
+			before = snap.hp
+			snap = apply(snap, action)
+			dealt = sum(b - a for b, a in zip(before, snap.hp))
+			if isinstance(action, Attack):
+				combat_state.log.log(f"👹 {unit.name} attacks for {dealt} damage!")
+			elif isinstance(action, Cast):
+				combat_state.log.log(f"👹 {unit.name} casts {REGISTRY[action.ability_id].name} for {dealt} damage!")
+		if is_over(snap):
+			break
+	combat_state.player.position = snap.positions[0]
+	combat_state.player.stats.current_hp = snap.hp[0]
+	for i, monster in enumerate(combat_state.monsters, start=1):
+		monster.position = snap.positions[i]
+		monster.stats.current_hp = snap.hp[i]
+		monster.combat_ap = snap.ap[i]
+		monster.combat_mp = snap.mp[i]
+	combat_state.index_monsters()
+	conclude_monster_turn(combat_state)
+
+
+class _Timeout(Exception):
+	pass
+
+
+# Iterative-deepening search over the actor's own action sequence for this turn.
+# Leaves are scored by damage traded, kills, distance to the best attack range and
+# the damage the opposing side could answer with next turn.
+class SearchPolicy(AiPolicy):
+	def __init__(self, budget_ms: float = 20.0, max_depth: int = 10) -> None:
+		self.budget_ms = budget_ms
+		self.max_depth = max_depth
+		self.last_report = SearchReport(budget_ms=budget_ms)
+		self._nodes = 0
+		self._deadline = 0.0
+		self._cutoff = False
+		self._field: Optional[DistanceField] = None
+		self._field_key: Optional[tuple] = None
+		self._occupied: Set[Coord] = set()
+
+	def _field_for(self, snap: CombatSnapshot, actor: int) -> DistanceField:
+		team = snap.roster[actor].team
+		goals = tuple(p for j, p in enumerate(snap.positions) if snap.hp[j] > 0 and snap.roster[j].team != team)
+		key = (snap.grid, goals)
+		if self._field is None or self._field_key is None or self._field_key[0] is not snap.grid or self._field_key[1] != goals:
+			self._field = DistanceField(snap.grid, goals)
+			self._field_key = key
+			self._occupied = set()
+		return self._field
+
+	# Brings the field's occupancy in line with the living units other than actor,
+	# touching only the cells that changed since the last turn planned on it
+	def _sync_occupancy(self, snap: CombatSnapshot, actor: int) -> DistanceField:
+		field = self._field
+		now = {p for j, p in enumerate(snap.positions) if snap.hp[j] > 0 and j != actor}
+		for p in self._occupied - now:
+			field.vacate(p)
+		for p in now - self._occupied:
+			field.occupy(p)
+		self._occupied = now
+		return field
+
+	# A monster that cannot reach any opponent this turn even after spending all
+	# its MP has nothing to search for: it walks down the shared field, one O(1)
+	# descend per step. Returns None when the actor is close enough to search.
+	def _approach(self, snap: CombatSnapshot, actor: int) -> Optional[List[Action]]:
+		team = snap.roster[actor].team
+		x, y = snap.positions[actor]
+		nearest = min(
+			(abs(px - x) + abs(py - y) for j, (px, py) in enumerate(snap.positions) if snap.hp[j] > 0 and snap.roster[j].team != team),
+			default=None,
+		)
+		if nearest is None or nearest - snap.mp[actor] <= _reach(snap, actor):
+			return None
+		field = self._sync_occupancy(snap, actor)
+		actions: List[Action] = []
+		pos = snap.positions[actor]
+		for _ in range(snap.mp[actor]):
+			nxt = field.descend(pos)
+			if nxt is None:
+				break
+			actions.append(Move(actor, nxt))
+			pos = nxt
+		actions.append(EndTurn(actor))
+		return actions
+
+	def plan_turn(self, snap: CombatSnapshot, actor: int) -> List[Action]:
+		start = time.perf_counter()
+		self._deadline = start + self.budget_ms / 1000.0
+		self._nodes = 0
+		self._field_for(snap, actor)
+		walk = self._approach(snap, actor)
+		if walk is not None:
+			self.last_report = SearchReport(actor=actor, elapsed_ms=(time.perf_counter() - start) * 1000.0, budget_ms=self.budget_ms)
+			return walk
+		best: List[Action] = [EndTurn(actor)]
+		completed = 0
+		for depth in range(1, self.max_depth + 1):
+			self._cutoff = False
+			try:
+				_, plan = self._search(snap, snap, actor, depth, {})
+			except _Timeout:
+				break
+			best = plan
+			completed = depth
+			if not self._cutoff:
+				break
+		self.last_report = SearchReport(
+			actor=actor,
+			nodes=self._nodes,
+			depth=completed,
+			elapsed_ms=(time.perf_counter() - start) * 1000.0,
+			budget_ms=self.budget_ms,
+		)
+		return best
+
+	def _search(self, root: CombatSnapshot, snap: CombatSnapshot, actor: int, depth: int, table: Dict[tuple, Tuple[int, float, List[Action]]]) -> Tuple[float, List[Action]]:
+		self._nodes += 1
+		if not self._nodes & 63 and time.perf_counter() > self._deadline:
+			raise _Timeout()
+		key = (snap.positions, snap.hp, snap.ap, snap.mp)
+		hit = table.get(key)
+		if hit is not None and hit[0] >= depth:
+			return hit[1], hit[2]
+		best_value = evaluate(root, snap, actor, self._field)
+		best_plan: List[Action] = [EndTurn(actor)]
+		if depth == 0:
+			self._cutoff = True
+			return best_value, best_plan
+		actions = legal_actions(snap, actor)
+		actions.sort(key=lambda a: isinstance(a, Move))
+		for action in actions:
+			if isinstance(action, EndTurn):
+				continue
+			child = apply(snap, action)
+			if (child.positions, child.hp, child.ap, child.mp) == key:
+				continue
+			if is_over(child):
+				value, plan = evaluate(root, child, actor, self._field), [EndTurn(actor)]
+			else:
+				value, plan = self._search(root, child, actor, depth - 1, table)
+			if value > best_value:
+				best_value = value
+				best_plan = [action] + plan
+		table[key] = (depth, best_value, best_plan)
+		return best_value, best_plan
+
+
+def _ability_damage(ability_id: str) -> int:
+	ability = REGISTRY.get(ability_id)
+	if ability is None:
+		return 0
+	return sum(e.amount for e in ability.effects if isinstance(e, (Damage, Charge)))
+
+
+def _reach(snap: CombatSnapshot, actor: int) -> int:
+	reach = 1
+	for ability_id in snap.roster[actor].abilities:
+		ability = REGISTRY.get(ability_id)
+		if ability is not None and _ability_damage(ability_id) > 0:
+			reach = max(reach, ability.range_max)
+	return reach
+
+
+def evaluate(root: CombatSnapshot, snap: CombatSnapshot, actor: int, field: Optional[DistanceField] = None) -> float:
+	team = snap.roster[actor].team
+	score = 0.0
+	ax, ay = snap.positions[actor]
+	nearest = None
+	threat = 0
+	for j, unit in enumerate(snap.roster):
+		lost = root.hp[j] - snap.hp[j]
+		killed = snap.hp[j] <= 0 < root.hp[j]
+		if unit.team == team:
+			score -= lost + (100 if killed else 0)
+			continue
+		score += lost + (100 if killed else 0)
+		if snap.hp[j] <= 0:
+			continue
+		x, y = snap.positions[j]
+		dist = abs(x - ax) + abs(y - ay)
+		nearest = dist if nearest is None else min(nearest, dist)
+		for ability_id in unit.abilities:
+			ability = REGISTRY.get(ability_id)
+			if ability is not None and ability.range_min <= dist <= ability.range_max + unit.base_mp:
+				threat = max(threat, _ability_damage(ability_id))
+		if dist <= 1 + unit.base_mp:
+			threat = max(threat, unit.atk)
+	if nearest is not None:
+		if field is not None:
+			walk = field.distance(snap.positions[actor])
+			nearest = walk if walk != UNREACHABLE else nearest + snap.grid.width + snap.grid.height
+		score -= max(0, nearest - _reach(snap, actor))
+	return score - 0.1 * threat
+
+
+# Runs monster planning off the caller's thread; the caller polls the future and
+# applies the result with execute_monster_plans on its own thread.
+class AiWorker:
+	def __init__(self, policy: Optional[AiPolicy] = None, executor: Optional[Executor] = None) -> None:
+		self.policy = policy or SearchPolicy()
+		self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="monster-ai")
+
+	def submit(self, combat_state: CombatState) -> Future:
+		policy = combat_state.ai_policy or self.policy
+		return self._executor.submit(plan_monster_phase, policy, snapshot_combat(combat_state))
+
+	def shutdown(self) -> None:
+		self._executor.shutdown(wait=False, cancel_futures=True)
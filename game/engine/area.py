@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Tuple
+
+
+Coord = Tuple[int, int]
+
+SHAPES = ("cell", "cross", "circle", "line", "cone")
+DIRECTIONAL = ("line", "cone")
+
+_NONE = (0, 0)
+
+
+def cast_direction(src: Coord, target: Coord) -> Coord:
+	dx = target[0] - src[0]
+	dy = target[1] - src[1]
+	if dx == 0 and dy == 0:
+		return _NONE
+	if abs(dx) >= abs(dy):
+		return ((dx > 0) - (dx < 0), 0)
+	return (0, (dy > 0) - (dy < 0))
+
+
+# Offsets are relative to the targeted cell. Line and cone extend away from the
+# caster, so they are cached per direction as well; a self-cast falls back to +x.
+@lru_cache(maxsize=None)
+def shape_offsets(shape: str, size: int, direction: Coord = _NONE) -> Tuple[Coord, ...]:
+	if shape not in SHAPES:
+		raise ValueError(f"Unknown area shape: {shape}")
+	if shape == "cell" or size <= 0:
+		return ((0, 0),)
+	offsets = [(0, 0)]
+	if shape == "cross":
+		for k in range(1, size + 1):
+			offsets += [(k, 0), (-k, 0), (0, k), (0, -k)]
+		return tuple(offsets)
+	if shape == "circle":
+		for dy in range(-size, size + 1):
+			for dx in range(-size, size + 1):
+				if (dx or dy) and abs(dx) + abs(dy) <= size:
+					offsets.append((dx, dy))
+		return tuple(offsets)
+	fx, fy = direction if direction != _NONE else (1, 0)
+	px, py = -fy, fx
+	for k in range(1, size + 1):
+		spread = k if shape == "cone" else 0
+		for j in range(-spread, spread + 1):
+			offsets.append((fx * k + px * j, fy * k + py * j))
+	return tuple(offsets)
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .grid import Coord, Grid
+
+
+CHUNK = 32
+CHUNK_CELLS = CHUNK * CHUNK
+RESIDENT_CHUNKS = 64
+STREAM_RADIUS = 2
+# Maps with more cells than this are built as a ChunkedGrid by make_grid
+CHUNKED_MIN_CELLS = 128 * 128
+
+ChunkKey = Tuple[int, int]
+# Returns the zlib-compressed cells of a chunk (one byte per cell, 1 = blocked), or
+# None for a chunk with no walls
+ChunkSource = Callable[[int, int], Optional[bytes]]
+
+_EMPTY = bytes(CHUNK_CELLS)
+
+
+def pack_chunk(cells: Union[bytes, bytearray]) -> Optional[bytes]:
+	if not any(cells):
+		return None
+	return zlib.compress(bytes(cells), 6)
+
+
+def chunks_from_blocked(blocked: Iterable[Coord]) -> Dict[ChunkKey, bytes]:
+	raw: Dict[ChunkKey, bytearray] = {}
+	for x, y in blocked:
+		if x < 0 or y < 0:
+			continue
+		key = (x // CHUNK, y // CHUNK)
+		cells = raw.get(key)
+		if cells is None:
+			cells = raw[key] = bytearray(CHUNK_CELLS)
+		cells[(y % CHUNK) * CHUNK + x % CHUNK] = 1
+	packed: Dict[ChunkKey, bytes] = {}
+	for key, cells in raw.items():
+		data = pack_chunk(cells)
+		if data is not None:
+			packed[key] = data
+	return packed
+
+
+# Same, from a whole map of cells (one byte per cell, index y * width + x)
+def chunks_from_cells(width: int, height: int, cells: Union[bytes, bytearray]) -> Dict[ChunkKey, bytes]:
+	packed: Dict[ChunkKey, bytes] = {}
+	for cy in range((height + CHUNK - 1) // CHUNK):
+		for cx in range((width + CHUNK - 1) // CHUNK):
+			chunk = bytearray(CHUNK_CELLS)
+			x0 = cx * CHUNK
+			n = min(CHUNK, width - x0)
+			for ry in range(min(CHUNK, height - cy * CHUNK)):
+				start = (cy * CHUNK + ry) * width + x0
+				chunk[ry * CHUNK:ry * CHUNK + n] = cells[start:start + n]
+			data = pack_chunk(chunk)
+			if data is not None:
+				packed[(cx, cy)] = data
+	return packed
+
+
+# Walls as one chunk_<cx>_<cy>.z file per chunk that has any, so a world can live on
+# disk and only the chunks near the player are ever read.
+class ChunkDirectory:
+	def __init__(self, path: Path) -> None:
+		self.path = Path(path)
+
+	def __call__(self, cx: int, cy: int) -> Optional[bytes]:
+		p = self.path / f"chunk_{cx}_{cy}.z"
+		return p.read_bytes() if p.exists() else None
+
+	def store(self, cx: int, cy: int, data: Optional[bytes]) -> None:
+		p = self.path / f"chunk_{cx}_{cy}.z"
+		if data is None:
+			if p.exists():
+				p.unlink()
+			return
+		self.path.mkdir(parents=True, exist_ok=True)
+		p.write_bytes(data)
+
+
+class _InMemory:
+	def __init__(self, packed: Dict[ChunkKey, bytes]) -> None:
+		self.packed = packed
+
+	def __call__(self, cx: int, cy: int) -> Optional[bytes]:
+		return self.packed.get((cx, cy))
+
+	def store(self, cx: int, cy: int, data: Optional[bytes]) -> None:
+		if data is None:
+			self.packed.pop((cx, cy), None)
+		else:
+			self.packed[(cx, cy)] = data
+
+
+# Read-only set view of every wall, for code written against Grid.blocked.
+# Membership is a cell lookup; iteration walks the chunks one at a time.
+class _BlockedView:
+	def __init__(self, grid: ChunkedGrid) -> None:
+		self.grid = grid
+
+	def __contains__(self, cell: object) -> bool:
+		x, y = cell  # type: ignore[misc]
+		return self.grid.is_blocked(x, y)
+
+	def __iter__(self) -> Iterator[Coord]:
+		return self.grid.blocked_in(0, 0, self.grid.width - 1, self.grid.height - 1)
+
+	def __len__(self) -> int:
+		return sum(1 for _ in self)
+
+
+# A Grid split into CHUNK x CHUNK tiles. Chunks are kept compressed by their source
+# and decompressed into a bounded LRU on first touch, so memory depends on how much
+# of the world is near the player, not on the world's size. Edits mark a chunk dirty
+# and are written back to the source when it is evicted. Walkability, line of sight
+# and rendering go through is_blocked/walkable and never see a chunk boundary.
+class ChunkedGrid:
+	def __init__(self, width: int, height: int, source: ChunkSource, capacity: int = RESIDENT_CHUNKS) -> None:
+		self.width = width
+		self.height = height
+		self.source = source
+		self.capacity = capacity
+		self.resident: "OrderedDict[ChunkKey, bytearray]" = OrderedDict()
+		self.dirty: Set[ChunkKey] = set()
+		self.loads = 0
+		self.evictions = 0
+		self._last_key: Optional[ChunkKey] = None
+		self._last_cells: Optional[bytearray] = None
+		self._streamed: Optional[Tuple[int, int, int]] = None
+		self.on_change: Optional[Callable[[List[Coord]], None]] = None
+
+	# Backed by an in-memory table of packed chunks (see pack_chunk); edits are
+	# written back into that table
+	@classmethod
+	def from_chunks(cls, width: int, height: int, packed: Dict[ChunkKey, bytes], capacity: int = RESIDENT_CHUNKS) -> ChunkedGrid:
+		return cls(width, height, _InMemory(packed), capacity)
+
+	@classmethod
+	def from_blocked(cls, width: int, height: int, blocked: Iterable[Coord], capacity: int = RESIDENT_CHUNKS) -> ChunkedGrid:
+		return cls.from_chunks(width, height, chunks_from_blocked(blocked), capacity)
+
+	@property
+	def blocked(self) -> _BlockedView:
+		return _BlockedView(self)
+
+	@property
+	def chunks_wide(self) -> int:
+		return (self.width + CHUNK - 1) // CHUNK
+
+	@property
+	def chunks_high(self) -> int:
+		return (self.height + CHUNK - 1) // CHUNK
+
+	def chunk(self, cx: int, cy: int) -> bytearray:
+		key = (cx, cy)
+		if key == self._last_key:
+			return self._last_cells  # type: ignore[return-value]
+		cells = self.resident.get(key)
+		if cells is None:
+			data = self.source(cx, cy)
+			cells = bytearray(zlib.decompress(data)) if data is not None else bytearray(_EMPTY)
+			self.resident[key] = cells
+			self.loads += 1
+			while len(self.resident) > self.capacity:
+				self._evict()
+		else:
+			self.resident.move_to_end(key)
+		self._last_key = key
+		self._last_cells = cells
+		return cells
+
+	def _evict(self) -> None:
+		key, cells = self.resident.popitem(last=False)
+		self.evictions += 1
+		if key in self.dirty:
+			self.dirty.discard(key)
+			self._write_back(key, cells)
+		if key == self._last_key:
+			self._last_key = None
+			self._last_cells = None
+
+	def _write_back(self, key: ChunkKey, cells: bytearray) -> None:
+		store = getattr(self.source, "store", None)
+		if store is None:
+			raise ValueError(f"chunk source cannot store edited chunk {key}")
+		store(key[0], key[1], pack_chunk(cells))
+
+	def flush(self) -> None:
+		for key in list(self.dirty):
+			self._write_back(key, self.resident[key])
+		self.dirty.clear()
+
+	def in_bounds(self, x: int, y: int) -> bool:
+		return 0 <= x < self.width and 0 <= y < self.height
+
+	def is_blocked(self, x: int, y: int) -> bool:
+		if not (0 <= x < self.width and 0 <= y < self.height):
+			return False
+		return self.chunk(x // CHUNK, y // CHUNK)[(y % CHUNK) * CHUNK + x % CHUNK] == 1
+
+	def walkable(self, x: int, y: int) -> bool:
+		if not (0 <= x < self.width and 0 <= y < self.height):
+			return False
+		return self.chunk(x // CHUNK, y // CHUNK)[(y % CHUNK) * CHUNK + x % CHUNK] == 0
+
+	def add_blocked(self, coords: Iterable[Coord]) -> None:
+		cells = [c for c in coords if self.in_bounds(*c)]
+		for x, y in cells:
+			key = (x // CHUNK, y // CHUNK)
+			self.chunk(*key)[(y % CHUNK) * CHUNK + x % CHUNK] = 1
+			self.dirty.add(key)
+		if self.on_change is not None:
+			self.on_change(cells)
+
+	# Walls inside the inclusive rectangle. Chunks that are not resident are
+	# decompressed on the side and not cached, so a full scan does not flush the LRU.
+	def blocked_in(self, x0: int, y0: int, x1: int, y1: int) -> Iterator[Coord]:
+		x0 = max(0, x0)
+		y0 = max(0, y0)
+		x1 = min(self.width - 1, x1)
+		y1 = min(self.height - 1, y1)
+		for cy in range(y0 // CHUNK, y1 // CHUNK + 1):
+			for cx in range(x0 // CHUNK, x1 // CHUNK + 1):
+				cells = self.resident.get((cx, cy))
+				if cells is None:
+					data = self.source(cx, cy)
+					if data is None:
+						continue
+					cells = zlib.decompress(data)
+				bx = cx * CHUNK
+				by = cy * CHUNK
+				for i in range(CHUNK_CELLS):
+					if cells[i]:
+						x = bx + i % CHUNK
+						y = by + i // CHUNK
+						if x0 <= x <= x1 and y0 <= y <= y1:
+							yield (x, y)
+
+	# Touches the chunks within radius of the chunk holding pos, nearest last so
+	# they are the last to be evicted. Steps inside the same chunk are free.
+	def stream_around(self, pos: Coord, radius: int = STREAM_RADIUS) -> None:
+		pcx = pos[0] // CHUNK
+		pcy = pos[1] // CHUNK
+		if self._streamed == (pcx, pcy, radius):
+			return
+		self._streamed = (pcx, pcy, radius)
+		keys = [
+			(cx, cy)
+			for cy in range(max(0, pcy - radius), min(self.chunks_high, pcy + radius + 1))
+			for cx in range(max(0, pcx - radius), min(self.chunks_wide, pcx + radius + 1))
+		]
+		keys.sort(key=lambda k: -max(abs(k[0] - pcx), abs(k[1] - pcy)))
+		for key in keys:
+			self.chunk(*key)
+
+	def resident_bytes(self) -> int:
+		return len(self.resident) * CHUNK_CELLS
+
+
+def make_grid(width: int, height: int, blocked: Iterable[Coord]) -> Union[Grid, ChunkedGrid]:
+	if width * height > CHUNKED_MIN_CELLS:
+		return ChunkedGrid.from_blocked(width, height, blocked)
+	return Grid(width=width, height=height, blocked=set(blocked))
+
+
+# Same, from a whole map of cells (one byte per cell, 1 = wall, index y * width + x)
+def make_grid_from_cells(width: int, height: int, cells: Union[bytes, bytearray]) -> Union[Grid, ChunkedGrid]:
+	if width * height > CHUNKED_MIN_CELLS:
+		return ChunkedGrid.from_chunks(width, height, chunks_from_cells(width, height, cells))
+	blocked: Set[Coord] = set()
+	i = cells.find(1)
+	while i >= 0:
+		blocked.add((i % width, i // width))
+		i = cells.find(1, i + 1)
+	return Grid(width=width, height=height, blocked=blocked)
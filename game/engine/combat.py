@@ -1,12 +1,23 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Tuple, Optional
+import heapq
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Generic, List, Tuple, Optional, TypeVar
 
-from .ability import Ability
+from .ability import Ability, effect_pipeline, register_effect_handlers
+from .area import DIRECTIONAL, cast_direction, shape_offsets
+from .distance_field import DistanceField
 from .effects import Damage, Push, BuffAp, Charge
 from .grid import Grid
 from .entities import Entity, Player, Monster
+from .monster_store import MonsterStore
+from .tags import RANGED
+
+if TYPE_CHECKING:
+	from .ai import AiPolicy
+	from .targeting import CastOverlay
+
+T = TypeVar("T")
 
 
 @dataclass
@@ -36,6 +47,60 @@ class CombatArena:
 		
 		return Grid(width=self.width, height=self.height, blocked=blocked)
 
+	def spawn_cells(self, count: int) -> List[Tuple[int, int]]:
+		grid = self.create_combat_grid()
+		cells: List[Tuple[int, int]] = []
+		seen = {self.monster_start, self.player_start}
+		frontier = [self.monster_start]
+		while frontier and len(cells) < count:
+			nxt = []
+			for x, y in frontier:
+				if grid.walkable(x, y) and (x, y) != self.player_start:
+					cells.append((x, y))
+					if len(cells) == count:
+						break
+				for c in ((x - 1, y), (x, y - 1), (x, y + 1), (x + 1, y)):
+					if c not in seen and grid.in_bounds(c[0], c[1]):
+						seen.add(c)
+						nxt.append(c)
+			frontier = nxt
+		return cells
+
+
+def arena_for(count: int) -> CombatArena:
+	grow = max(0, count - 4)
+	width = 10 + 2 * (grow // 3)
+	height = 6 + 2 * (grow // 6)
+	return CombatArena(width=width, height=height, player_start=(1, height // 2), monster_start=(width - 2, height // 2))
+
+
+def initiative(ap: int, mp: int) -> int:
+	return ap + mp
+
+
+# Highest initiative acts first; ties keep insertion (roster) order via the sequence
+# number. Live combat queues monsters, the AI planner queues roster indices.
+@dataclass
+class TurnQueue(Generic[T]):
+	heap: List[Tuple[int, int, T]] = field(default_factory=list)
+	seq: int = 0
+
+	def push(self, item: T, rank: int) -> None:
+		heapq.heappush(self.heap, (-rank, self.seq, item))
+		self.seq += 1
+
+	def pop(self) -> Optional[T]:
+		if not self.heap:
+			return None
+		return heapq.heappop(self.heap)[2]
+
+	def clear(self) -> None:
+		self.heap.clear()
+		self.seq = 0
+
+	def __len__(self) -> int:
+		return len(self.heap)
+
 
 @dataclass
 class CombatState:
@@ -49,17 +114,58 @@ class CombatState:
 	combat_grid: Grid
 	is_active: bool = True
 	current_phase: str = "player_turn"
-	monster_ap: int = 0
-	monster_mp: int = 0
 	can_move: bool = True
 	can_cast: bool = True
+	ai_policy: Optional[AiPolicy] = None
+	turn_queue: TurnQueue[Monster] = field(default_factory=TurnQueue, repr=False)
+	cells: Dict[Tuple[int, int], Monster] = field(default_factory=dict, repr=False)
+	defeated: List[Monster] = field(default_factory=list, repr=False)
+
+	def __post_init__(self) -> None:
+		self.index_monsters()
+
+	def index_monsters(self) -> None:
+		self.cells = {m.position: m for m in self.monsters}
+
+	def monster_at(self, pos: Tuple[int, int]) -> Optional[Monster]:
+		return self.cells.get(pos)
+
+	def is_occupied(self, pos: Tuple[int, int]) -> bool:
+		return pos in self.cells or pos == self.player.position
+
+	def place_monster(self, monster: Monster, pos: Tuple[int, int]) -> None:
+		if self.cells.get(monster.position) is monster:
+			del self.cells[monster.position]
+		monster.position = pos
+		self.cells[pos] = monster
+
+	def remove_monster(self, monster: Monster) -> None:
+		if self.cells.get(monster.position) is monster:
+			del self.cells[monster.position]
+		self.monsters.remove(monster)
+		self.defeated.append(monster)
+
+	def drain_defeated(self) -> List[Monster]:
+		defeated = self.defeated
+		self.defeated = []
+		return defeated
+
+	def begin_monster_phase(self) -> None:
+		self.turn_queue.clear()
+		for monster in self.monsters:
+			monster.combat_ap = monster.stats.ap
+			monster.combat_mp = monster.stats.mp
+			self.turn_queue.push(monster, initiative(monster.stats.ap, monster.stats.mp))
+
+	def next_monster(self) -> Optional[Monster]:
+		monster = self.turn_queue.pop()
+		while monster is not None and not monster.stats.is_alive():
+			monster = self.turn_queue.pop()
+		return monster
 
 	def reset_turn(self) -> None:
 		self.player_ap = self.player.get_total_stats().ap
 		self.player_mp = self.player.get_total_stats().mp
-		if self.monsters:
-			self.monster_ap = self.monsters[0].stats.ap
-			self.monster_mp = self.monsters[0].stats.mp
 		self.current_turn += 1
 		self.current_phase = "player_turn"
 		self.can_move = True
@@ -69,12 +175,16 @@ class CombatState:
 
 	def start_combat(self) -> None:
 		self.player.position = self.arena.player_start
-		if self.monsters:
-			self.monsters[0].position = self.arena.monster_start
-			self.monster_ap = self.monsters[0].stats.ap
-			self.monster_mp = self.monsters[0].stats.mp
+		for monster, pos in zip(self.monsters, self.arena.spawn_cells(len(self.monsters))):
+			monster.position = pos
+			monster.combat_ap = monster.stats.ap
+			monster.combat_mp = monster.stats.mp
+		self.index_monsters()
 		self.log.log("=== COMBAT ARENA ===")
-		self.log.log(f"Fighting: {self.monsters[0].name if self.monsters else 'Unknown'}")
+		if len(self.monsters) > 1:
+			self.log.log(f"Fighting: {self.monsters[0].name} x{len(self.monsters)}")
+		else:
+			self.log.log(f"Fighting: {self.monsters[0].name if self.monsters else 'Unknown'}")
 
 
 def validate_and_log_intent(
@@ -144,7 +254,7 @@ def has_line_of_sight(grid: Grid, src: Tuple[int, int], dst: Tuple[int, int]) ->
 	if not line:
 		return True
 	for cell in line[1:-1]:
-		if cell in grid.blocked:
+		if grid.is_blocked(cell[0], cell[1]):
 			return False
 	return True
 
@@ -156,7 +266,7 @@ def try_move_in_combat(combat_state: CombatState, dx: int, dy: int) -> bool:
 	new_x = combat_state.player.position[0] + dx
 	new_y = combat_state.player.position[1] + dy
 	
-	if combat_state.combat_grid.walkable(new_x, new_y):
+	if combat_state.combat_grid.walkable(new_x, new_y) and combat_state.monster_at((new_x, new_y)) is None:
 		combat_state.player.position = (new_x, new_y)
 		combat_state.player_mp -= 1
 		combat_state.log.log(f"👤 Moved to ({new_x}, {new_y}) - MP: {combat_state.player_mp}")
@@ -166,90 +276,141 @@ def try_move_in_combat(combat_state: CombatState, dx: int, dy: int) -> bool:
 		return False
 
 
+def area_cells(grid: Grid, ability: Ability, src: Tuple[int, int], target: Tuple[int, int]) -> List[Tuple[int, int]]:
+	if ability.area_shape == "cell" or ability.area_size <= 0:
+		return [target]
+	direction = cast_direction(src, target) if ability.area_shape in DIRECTIONAL else (0, 0)
+	tx, ty = target
+	cells: List[Tuple[int, int]] = []
+	for dx, dy in shape_offsets(ability.area_shape, ability.area_size, direction):
+		cell = (tx + dx, ty + dy)
+		if grid.walkable(cell[0], cell[1]) and (cell == target or has_line_of_sight(grid, target, cell)):
+			cells.append(cell)
+	return cells
+
+
+# Per-cast state handed to each compiled effect handler; targets are looked up once
+# by intersecting the ability's area with the cell index.
+class EffectContext:
+	__slots__ = ("ability", "source", "target_pos", "combat_state", "target", "targets")
+
+	def __init__(self, ability: Ability, source: Entity, target_pos: Tuple[int, int], combat_state: CombatState) -> None:
+		self.ability = ability
+		self.source = source
+		self.target_pos = target_pos
+		self.combat_state = combat_state
+		cells = combat_state.cells
+		self.target = cells.get(target_pos)
+		if ability.area_shape == "cell":
+			self.targets = [self.target] if self.target is not None else []
+		else:
+			area = area_cells(combat_state.combat_grid, ability, source.position, target_pos)
+			self.targets = [cells[c] for c in area if c in cells]
+
+
+def _step_towards(src: Tuple[int, int], dst: Tuple[int, int]) -> Tuple[int, int]:
+	dx = dst[0] - src[0]
+	dy = dst[1] - src[1]
+	return ((dx > 0) - (dx < 0), (dy > 0) - (dy < 0))
+
+
+def _defeat(ctx: EffectContext, monster: Monster) -> None:
+	if monster.stats.is_alive():
+		return
+	ctx.combat_state.log.log(f"💀 {monster.name} is defeated!")
+	ctx.combat_state.remove_monster(monster)
+	ctx.targets.remove(monster)
+
+
+def _live_damage(effect: Damage, ctx: EffectContext) -> bool:
+	if not ctx.targets:
+		return True
+	cs = ctx.combat_state
+	if ctx.ability.tag_mask & RANGED and not has_line_of_sight(cs.combat_grid, ctx.source.position, ctx.target_pos):
+		cs.log.log("🚫 No line of sight")
+		return False
+	for monster in list(ctx.targets):
+		damage = resolve_damage(ctx.source, monster, effect.amount)
+		cs.log.log(f"⚔️ {ctx.ability.id} deals {damage} damage to {monster.name}")
+		_defeat(ctx, monster)
+	return bool(ctx.targets)
+
+
+def _live_charge(effect: Charge, ctx: EffectContext) -> bool:
+	monster = ctx.target
+	if monster is None or monster not in ctx.targets:
+		return True
+	cs = ctx.combat_state
+	dx, dy = _step_towards(ctx.source.position, ctx.target_pos)
+	charge_pos = (ctx.target_pos[0] - dx, ctx.target_pos[1] - dy)
+	if not (cs.combat_grid.walkable(charge_pos[0], charge_pos[1]) and cs.monster_at(charge_pos) is None):
+		cs.log.log(f"💨 Can't charge there - blocked!")
+		return True
+	cs.player.position = charge_pos
+	cs.log.log(f"💨 Charged to {charge_pos}")
+	damage = resolve_damage(ctx.source, monster, effect.amount)
+	cs.log.log(f"⚔️ Charge deals {damage} damage to {monster.name}")
+	_defeat(ctx, monster)
+	return bool(ctx.targets)
+
+
+def _live_push(effect: Push, ctx: EffectContext) -> bool:
+	if not ctx.targets:
+		return True
+	cs = ctx.combat_state
+	for monster in list(ctx.targets):
+		origin = ctx.source.position if monster.position == ctx.target_pos else ctx.target_pos
+		dx, dy = _step_towards(origin, monster.position)
+		curr = monster.position
+		collided = False
+		for _ in range(max(1, int(effect.distance))):
+			next_pos = (curr[0] + dx, curr[1] + dy)
+			if cs.combat_grid.walkable(next_pos[0], next_pos[1]) and not cs.is_occupied(next_pos):
+				curr = next_pos
+			else:
+				collided = True
+				break
+		if curr != monster.position:
+			cs.place_monster(monster, curr)
+			cs.log.log(f"💨 {monster.name} pushed to {curr}")
+		if collided:
+			dmg = resolve_damage(ctx.source, monster, 10)
+			cs.log.log(f"💥 Collision! {monster.name} takes {dmg} bonus damage")
+			_defeat(ctx, monster)
+	return bool(ctx.targets)
+
+
+def _live_buff_ap(effect: BuffAp, ctx: EffectContext) -> bool:
+	ctx.combat_state.player_ap += effect.amount
+	ctx.combat_state.log.log(f"✨ AP buffed by {effect.amount}")
+	return True
+
+
+register_effect_handlers("live", {
+	Damage: _live_damage,
+	Charge: _live_charge,
+	Push: _live_push,
+	BuffAp: _live_buff_ap,
+})
+
+
 def resolve_ability_effects(
 	ability: Ability,
 	source: Entity,
 	target_pos: Tuple[int, int],
-	combat_state: CombatState,
-	monsters: List[Monster]
+	combat_state: CombatState
 ) -> None:
 	combat_state.player_ap -= ability.cost_ap
-	
-	for effect in ability.effects:
-		if isinstance(effect, Damage):
-			for monster in monsters:
-				if monster.position == target_pos:
-					if "ranged" in ability.tags and not has_line_of_sight(combat_state.combat_grid, source.position, target_pos):
-						combat_state.log.log("🚫 No line of sight")
-						return
-					damage = resolve_damage(source, monster, effect.amount)
-					combat_state.log.log(f"⚔️ {ability.id} deals {damage} damage to {monster.name}")
-					if not monster.stats.is_alive():
-						combat_state.log.log(f"💀 {monster.name} is defeated!")
-						monsters.remove(monster)
-						return
-					break
-		elif isinstance(effect, Charge):
-			for monster in monsters:
-				if monster.position == target_pos:
-					dx = target_pos[0] - source.position[0]
-					dy = target_pos[1] - source.position[1]
-					if dx != 0:
-						dx = dx // abs(dx)
-					if dy != 0:
-						dy = dy // abs(dy)
-					
-					charge_pos = (target_pos[0] - dx, target_pos[1] - dy)
-					if combat_state.combat_grid.walkable(charge_pos[0], charge_pos[1]):
-						combat_state.player.position = charge_pos
-						combat_state.log.log(f"💨 Charged to {charge_pos}")
-						
-						damage = resolve_damage(source, monster, effect.amount)
-						combat_state.log.log(f"⚔️ Charge deals {damage} damage to {monster.name}")
-						if not monster.stats.is_alive():
-							combat_state.log.log(f"💀 {monster.name} is defeated!")
-							monsters.remove(monster)
-							return
-					else:
-						combat_state.log.log(f"💨 Can't charge there - blocked!")
-					break
-		elif isinstance(effect, Push):
-			for monster in monsters:
-				if monster.position == target_pos:
-					dx = target_pos[0] - source.position[0]
-					dy = target_pos[1] - source.position[1]
-					if dx != 0:
-						dx = dx // abs(dx)
-					if dy != 0:
-						dy = dy // abs(dy)
-					distance = max(1, int(effect.distance))
-					curr = target_pos
-					collided = False
-					for _ in range(distance):
-						next_pos = (curr[0] + dx, curr[1] + dy)
-						if combat_state.combat_grid.walkable(next_pos[0], next_pos[1]):
-							curr = next_pos
-						else:
-							collided = True
-							break
-					if curr != monster.position:
-						monster.position = curr
-						combat_state.log.log(f"💨 {monster.name} pushed to {curr}")
-					if collided:
-						bonus = 10
-						dmg = resolve_damage(source, monster, bonus)
-						combat_state.log.log(f"💥 Collision! {monster.name} takes {dmg} bonus damage")
-						if not monster.stats.is_alive():
-							combat_state.log.log(f"💀 {monster.name} is defeated!")
-							monsters.remove(monster)
-							return
-					break
-		elif isinstance(effect, BuffAp):
-			combat_state.player_ap += effect.amount
-			combat_state.log.log(f"✨ AP buffed by {effect.amount}")
+	ctx = EffectContext(ability, source, target_pos, combat_state)
+	for handler in effect_pipeline(ability, "live"):
+		if not handler(ctx):
+			return
 
 
 def check_combat_trigger(player_pos: Tuple[int, int], monsters: List[Monster]) -> Optional[Monster]:
+	if isinstance(monsters, MonsterStore):
+		row = monsters.at(player_pos)
+		return monsters.view(row) if row is not None else None
 	for monster in monsters:
 		if monster.position == player_pos:
 			return monster
@@ -260,31 +421,33 @@ def monster_ai_turn(combat_state: CombatState) -> None:
 	if not combat_state.monsters:
 		return
 	combat_state.log.log("--- Monster's turn ---")
-	occupied = {m.position for m in combat_state.monsters}
-	occupied.add(combat_state.player.position)
-	for monster in list(combat_state.monsters):
-		if not combat_state.player.stats.is_alive():
-			break
-		px, py = combat_state.player.position
-		mx, my = monster.position
-		dist = abs(px - mx) + abs(py - my)
-		if dist == 1:
+	if combat_state.ai_policy is not None:
+		combat_state.ai_policy.take_turn(combat_state)
+		return
+	field = DistanceField(combat_state.combat_grid, [combat_state.player.position])
+	field.occupy(combat_state.player.position)
+	for m in combat_state.monsters:
+		field.occupy(m.position)
+	combat_state.begin_monster_phase()
+	monster = combat_state.next_monster()
+	while monster is not None and combat_state.player.stats.is_alive():
+		if field.distance(monster.position) == 1:
 			damage = resolve_damage(monster, combat_state.player, monster.stats.atk)
 			combat_state.log.log(f"👹 {monster.name} attacks for {damage} damage!")
+			monster.combat_ap = 0
 		else:
-			candidates = [(mx + 1, my), (mx - 1, my), (mx, my + 1), (mx, my - 1)]
-			candidates.sort(key=lambda p: abs(px - p[0]) + abs(py - p[1]))
-			moved = False
-			for nx, ny in candidates:
-				if (0 <= nx < combat_state.combat_grid.width and 0 <= ny < combat_state.combat_grid.height and
-					combat_state.combat_grid.walkable(nx, ny) and (nx, ny) not in occupied):
-					occupied.discard(monster.position)
-					monster.position = (nx, ny)
-					occupied.add(monster.position)
-					moved = True
+			while monster.combat_mp > 0 and field.distance(monster.position) > 1:
+				nxt = field.descend(monster.position)
+				if nxt is None:
 					break
-			if not moved:
-				pass
+				field.move(monster.position, nxt)
+				combat_state.place_monster(monster, nxt)
+				monster.combat_mp -= 1
+		monster = combat_state.next_monster()
+	conclude_monster_turn(combat_state)
+
+
+def conclude_monster_turn(combat_state: CombatState) -> None:
 	if not combat_state.player.stats.is_alive():
 		combat_state.log.log("💀 You have been defeated!")
 		combat_state.is_active = False
@@ -312,7 +475,7 @@ def render_combat_arena(combat_state: CombatState) -> List[str]:
 		for x in range(combat_state.combat_grid.width):
 			if (x, y) == combat_state.player.position:
 				row += "👤"
-			elif any(m.position == (x, y) for m in combat_state.monsters):
+			elif combat_state.monster_at((x, y)) is not None:
 				row += "👹"
 			elif (x, y) in combat_state.combat_grid.blocked:
 				row += "█"
@@ -325,7 +488,7 @@ def render_combat_arena(combat_state: CombatState) -> List[str]:
 	return lines
 
 
-def render_combat_arena_with_cursor(combat_state: CombatState, cursor_pos: Tuple[int, int]) -> List[str]:
+def render_combat_arena_with_cursor(combat_state: CombatState, cursor_pos: Tuple[int, int], castable: Optional[CastOverlay] = None) -> List[str]:
 	lines: List[str] = []
 	lines.append("╔══════════════════════════════════════════════════════════════╗")
 	lines.append("║                        COMBAT ARENA                          ║")
@@ -336,12 +499,14 @@ def render_combat_arena_with_cursor(combat_state: CombatState, cursor_pos: Tuple
 			cell = (x, y)
 			if cell == combat_state.player.position:
 				row += "👤"
-			elif any(m.position == cell for m in combat_state.monsters):
+			elif combat_state.monster_at(cell) is not None:
 				row += "👹"
 			elif cell in combat_state.combat_grid.blocked:
 				row += "█"
 			elif cell == cursor_pos:
 				row += "+"
+			elif castable is not None and castable.contains(cell):
+				row += "○"
 			else:
 				row += "·"
 		row += " ║"
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+from .ability import Ability, REGISTRY, effect_pipeline, in_range, get_abilities_for_weapon, register_effect_handlers
+from .combat import CombatState, area_cells, has_line_of_sight
+from .effects import Damage, Push, BuffAp, Charge
+from .grid import Grid
+from .tags import RANGED
+
+
+Coord = Tuple[int, int]
+
+TEAM_PLAYER = 0
+TEAM_MONSTERS = 1
+
+_DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class Combatant(NamedTuple):
+	id: str
+	name: str
+	team: int
+	atk: int
+	res: int
+	armor: int
+	max_hp: int
+	base_ap: int
+	base_mp: int
+	abilities: Tuple[str, ...] = ()
+
+
+# Only the per-combatant values that change during a fight are stored per snapshot;
+# the roster and grid are shared by reference, so cloning is a handful of tuple copies.
+class CombatSnapshot(NamedTuple):
+	grid: Grid
+	roster: Tuple[Combatant, ...]
+	positions: Tuple[Coord, ...]
+	hp: Tuple[int, ...]
+	ap: Tuple[int, ...]
+	mp: Tuple[int, ...]
+	active: int = 0
+	turn: int = 1
+
+
+class Move(NamedTuple):
+	actor: int
+	dest: Coord
+
+
+class Cast(NamedTuple):
+	actor: int
+	ability_id: str
+	target: Coord
+
+
+class Attack(NamedTuple):
+	actor: int
+	target: int
+
+
+class EndTurn(NamedTuple):
+	actor: int
+
+
+Action = Union[Move, Cast, Attack, EndTurn]
+
+
+def _set(values: tuple, index: int, value) -> tuple:
+	return values[:index] + (value,) + values[index + 1:]
+
+
+def snapshot_combat(combat_state: CombatState) -> CombatSnapshot:
+	player = combat_state.player
+	total = player.get_total_stats()
+	weapon = player.progression.equipped_weapon
+	player_abilities = tuple(ab.id for ab in get_abilities_for_weapon(weapon)) if weapon else ()
+	roster: List[Combatant] = [Combatant(
+		id=player.id,
+		name=player.name,
+		team=TEAM_PLAYER,
+		atk=total.atk,
+		res=total.res,
+		armor=total.armor,
+		max_hp=total.hp,
+		base_ap=total.ap,
+		base_mp=total.mp,
+		abilities=player_abilities,
+	)]
+	positions: List[Coord] = [player.position]
+	hp: List[int] = [player.stats.current_hp]
+	ap: List[int] = [combat_state.player_ap]
+	mp: List[int] = [combat_state.player_mp]
+	for m in combat_state.monsters:
+		roster.append(Combatant(
+			id=m.id,
+			name=m.name,
+			team=TEAM_MONSTERS,
+			atk=m.stats.atk,
+			res=m.stats.res,
+			armor=m.stats.armor,
+			max_hp=m.stats.hp,
+			base_ap=m.stats.ap,
+			base_mp=m.stats.mp,
+			abilities=tuple(m.abilities),
+		))
+		positions.append(m.position)
+		hp.append(m.stats.current_hp)
+		ap.append(m.combat_ap)
+		mp.append(m.combat_mp)
+	active = 0 if combat_state.current_phase == "player_turn" else 1
+	return CombatSnapshot(
+		grid=combat_state.combat_grid,
+		roster=tuple(roster),
+		positions=tuple(positions),
+		hp=tuple(hp),
+		ap=tuple(ap),
+		mp=tuple(mp),
+		active=active,
+		turn=combat_state.current_turn,
+	)
+
+
+def occupant(snap: CombatSnapshot, pos: Coord) -> int:
+	positions = snap.positions
+	hp = snap.hp
+	i = -1
+	while True:
+		try:
+			i = positions.index(pos, i + 1)
+		except ValueError:
+			return -1
+		if hp[i] > 0:
+			return i
+
+
+def is_over(snap: CombatSnapshot) -> bool:
+	alive_teams = {snap.roster[i].team for i, h in enumerate(snap.hp) if h > 0}
+	return len(alive_teams) < 2
+
+
+def _free(snap: CombatSnapshot, x: int, y: int) -> bool:
+	return snap.grid.walkable(x, y) and occupant(snap, (x, y)) < 0
+
+
+def _hit(snap: CombatSnapshot, target: int, base_damage: int) -> CombatSnapshot:
+	unit = snap.roster[target]
+	damage = max(1, base_damage - unit.res)
+	damage = max(1, damage - unit.armor)
+	return snap._replace(hp=_set(snap.hp, target, max(0, snap.hp[target] - damage)))
+
+
+def _direction(src: Coord, dst: Coord) -> Coord:
+	dx = dst[0] - src[0]
+	dy = dst[1] - src[1]
+	return ((dx > 0) - (dx < 0), (dy > 0) - (dy < 0))
+
+
+def can_cast(snap: CombatSnapshot, actor: int, ability: Ability, target: Coord) -> bool:
+	src = snap.positions[actor]
+	if snap.ap[actor] < ability.cost_ap or not snap.grid.in_bounds(target[0], target[1]):
+		return False
+	if not in_range(ability, src, target):
+		return False
+	if ability.tag_mask & RANGED and not has_line_of_sight(snap.grid, src, target):
+		return False
+	return True
+
+
+def apply_move(snap: CombatSnapshot, action: Move) -> CombatSnapshot:
+	i = action.actor
+	return snap._replace(
+		positions=_set(snap.positions, i, action.dest),
+		mp=_set(snap.mp, i, snap.mp[i] - 1),
+	)
+
+
+def apply_attack(snap: CombatSnapshot, action: Attack) -> CombatSnapshot:
+	i = action.actor
+	snap = _hit(snap, action.target, snap.roster[i].atk)
+	return snap._replace(ap=_set(snap.ap, i, 0))
+
+
+def _alive(snap: CombatSnapshot, targets: List[int]) -> List[int]:
+	return [t for t in targets if snap.hp[t] > 0]
+
+
+def _sim_damage(effect: Damage, snap: CombatSnapshot, actor: int, targets: List[int], target_pos: Coord) -> CombatSnapshot:
+	for target in _alive(snap, targets):
+		snap = _hit(snap, target, effect.amount)
+	return snap
+
+
+def _sim_charge(effect: Charge, snap: CombatSnapshot, actor: int, targets: List[int], target_pos: Coord) -> CombatSnapshot:
+	target = occupant(snap, target_pos)
+	if target < 0 or target not in targets:
+		return snap
+	dx, dy = _direction(snap.positions[actor], target_pos)
+	landing = (target_pos[0] - dx, target_pos[1] - dy)
+	if not snap.grid.walkable(landing[0], landing[1]) or occupant(snap, landing) not in (-1, actor):
+		return snap
+	snap = snap._replace(positions=_set(snap.positions, actor, landing))
+	return _hit(snap, target, effect.amount)
+
+
+def _sim_push(effect: Push, snap: CombatSnapshot, actor: int, targets: List[int], target_pos: Coord) -> CombatSnapshot:
+	for target in _alive(snap, targets):
+		start = snap.positions[target]
+		origin = snap.positions[actor] if start == target_pos else target_pos
+		dx, dy = _direction(origin, start)
+		curr = start
+		collided = False
+		for _ in range(max(1, int(effect.distance))):
+			nxt = (curr[0] + dx, curr[1] + dy)
+			if snap.grid.walkable(nxt[0], nxt[1]) and occupant(snap, nxt) < 0:
+				curr = nxt
+			else:
+				collided = True
+				break
+		if curr != start:
+			snap = snap._replace(positions=_set(snap.positions, target, curr))
+		if collided:
+			snap = _hit(snap, target, 10)
+	return snap
+
+
+def _sim_buff_ap(effect: BuffAp, snap: CombatSnapshot, actor: int, targets: List[int], target_pos: Coord) -> CombatSnapshot:
+	return snap._replace(ap=_set(snap.ap, actor, snap.ap[actor] + effect.amount))
+
+
+register_effect_handlers("sim", {
+	Damage: _sim_damage,
+	Charge: _sim_charge,
+	Push: _sim_push,
+	BuffAp: _sim_buff_ap,
+})
+
+
+def apply_cast(snap: CombatSnapshot, action: Cast) -> CombatSnapshot:
+	ability = REGISTRY[action.ability_id]
+	i = action.actor
+	target_pos = action.target
+	snap = snap._replace(ap=_set(snap.ap, i, snap.ap[i] - ability.cost_ap))
+	team = snap.roster[i].team
+	targets = [t for t in (occupant(snap, c) for c in area_cells(snap.grid, ability, snap.positions[i], target_pos)) if t >= 0 and snap.roster[t].team != team]
+	for handler in effect_pipeline(ability, "sim"):
+		snap = handler(snap, i, targets, target_pos)
+		if targets and not any(snap.hp[t] > 0 for t in targets):
+			break
+	return snap
+
+
+def end_turn(snap: CombatSnapshot) -> CombatSnapshot:
+	n = len(snap.roster)
+	nxt = snap.active
+	for _ in range(n):
+		nxt = (nxt + 1) % n
+		if snap.hp[nxt] > 0:
+			break
+	unit = snap.roster[nxt]
+	return snap._replace(
+		active=nxt,
+		turn=snap.turn + (1 if nxt <= snap.active else 0),
+		ap=_set(snap.ap, nxt, unit.base_ap),
+		mp=_set(snap.mp, nxt, unit.base_mp),
+	)
+
+
+def apply(snap: CombatSnapshot, action: Action) -> CombatSnapshot:
+	if isinstance(action, Move):
+		return apply_move(snap, action)
+	if isinstance(action, Attack):
+		return apply_attack(snap, action)
+	if isinstance(action, Cast):
+		return apply_cast(snap, action)
+	return end_turn(snap)
+
+
+def legal_actions(snap: CombatSnapshot, actor: Optional[int] = None) -> List[Action]:
+	i = snap.active if actor is None else actor
+	actions: List[Action] = [EndTurn(i)]
+	if snap.hp[i] <= 0:
+		return actions
+	x, y = snap.positions[i]
+	team = snap.roster[i].team
+	if snap.mp[i] > 0:
+		for dx, dy in _DIRS:
+			if _free(snap, x + dx, y + dy):
+				actions.append(Move(i, (x + dx, y + dy)))
+	if snap.ap[i] > 0:
+		for ability_id in snap.roster[i].abilities:
+			ability = REGISTRY.get(ability_id)
+			if ability is not None and ability.range_min == 0 and can_cast(snap, i, ability, (x, y)):
+				actions.append(Cast(i, ability_id, (x, y)))
+		for j, pos in enumerate(snap.positions):
+			if snap.hp[j] <= 0 or snap.roster[j].team == team:
+				continue
+			if abs(pos[0] - x) + abs(pos[1] - y) == 1:
+				actions.append(Attack(i, j))
+			for ability_id in snap.roster[i].abilities:
+				ability = REGISTRY.get(ability_id)
+				if ability is not None and ability.range_max > 0 and can_cast(snap, i, ability, pos):
+					actions.append(Cast(i, ability_id, pos))
+	return actions
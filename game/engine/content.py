@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
-from pydantic import BaseModel, Field, ValidationError, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator, model_validator
+
+from .area import SHAPES
 
 
 class BlockedCellModel(BaseModel):
@@ -13,11 +18,39 @@ class BlockedCellModel(BaseModel):
 	y: int
 
 
+# Bit i of a byte, for each byte value
+_BITS = [tuple(i for i in range(8) if b >> i & 1) for b in range(256)]
+# One byte per bit, for turning a mask back into cells
+_UNPACK = [bytes((b >> i) & 1 for i in range(8)) for b in range(256)]
+
+
+# Packs blocked cells ({"x", "y"} objects as in map files, or (x, y) pairs) into a
+# row-major bitmask, bit y * width + x. No model is built per cell.
+def pack_walls(width: int, height: int, cells: Any) -> bytes:
+	mask = bytearray((width * height + 7) // 8)
+	for c in cells:
+		if isinstance(c, dict):
+			x = c.get("x")
+			y = c.get("y")
+		elif isinstance(c, BlockedCellModel):
+			x, y = c.x, c.y
+		else:
+			x, y = c
+		if type(x) is not int or type(y) is not int:
+			raise ValueError(f"blocked cell {c!r} needs integer x and y")
+		if not (0 <= x < width and 0 <= y < height):
+			raise ValueError(f"blocked cell ({x}, {y}) is outside the {width}x{height} map")
+		i = y * width + x
+		mask[i >> 3] |= 1 << (i & 7)
+	return bytes(mask)
+
+
 class MapModel(BaseModel):
 	name: str
 	width: int
 	height: int
-	blocked: List[BlockedCellModel] = Field(default_factory=list)
+	# Walls as a bitmask (see pack_walls), decoded from the "blocked" list of map files
+	walls: bytes = b""
 
 	@field_validator("width", "height")
 	def positive(cls, v: int) -> int:
@@ -25,6 +58,36 @@ class MapModel(BaseModel):
 			raise ValueError("must be positive")
 		return v
 
+	@model_validator(mode="before")
+	@classmethod
+	def pack_blocked(cls, data: Any) -> Any:
+		if isinstance(data, dict) and "blocked" in data:
+			data = dict(data)
+			width = data.get("width")
+			height = data.get("height")
+			if type(width) is int and type(height) is int and width > 0 and height > 0:
+				data["walls"] = pack_walls(width, height, data.pop("blocked"))
+		return data
+
+	def is_blocked(self, x: int, y: int) -> bool:
+		i = y * self.width + x
+		return 0 <= x < self.width and 0 <= y < self.height and i >> 3 < len(self.walls) and bool(self.walls[i >> 3] >> (i & 7) & 1)
+
+	def blocked_cells(self) -> Iterator[Tuple[int, int]]:
+		w = self.width
+		for j, b in enumerate(self.walls):
+			if b:
+				for bit in _BITS[b]:
+					i = j * 8 + bit
+					yield (i % w, i // w)
+
+	# One byte per cell (1 = wall), index y * width + x
+	def cells(self) -> bytearray:
+		n = self.width * self.height
+		out = bytearray(b"".join([_UNPACK[b] for b in self.walls])[:n])
+		out.extend(bytes(n - len(out)))
+		return out
+
 
 class StatsModel(BaseModel):
 	hp: int
@@ -49,6 +112,23 @@ class EffectModel(BaseModel):
 	duration: int | None = None
 
 
+class AreaModel(BaseModel):
+	shape: str = "cell"
+	size: int = 0
+
+	@field_validator("shape")
+	def known_shape(cls, v: str) -> str:
+		if v not in SHAPES:
+			raise ValueError(f"must be one of {', '.join(SHAPES)}")
+		return v
+
+	@field_validator("size")
+	def non_negative(cls, v: int) -> int:
+		if v < 0:
+			raise ValueError("must not be negative")
+		return v
+
+
 class SpellModel(BaseModel):
 	id: str
 	name: str
@@ -57,6 +137,7 @@ class SpellModel(BaseModel):
 	range_min: int = 0
 	range_max: int
 	effects: List[EffectModel]
+	area: AreaModel = Field(default_factory=AreaModel)
 
 
 class AbilityModel(BaseModel):
@@ -68,6 +149,7 @@ class AbilityModel(BaseModel):
 	range_max: int
 	effects: List[EffectModel]
 	weapon_type: str
+	area: AreaModel = Field(default_factory=AreaModel)
 
 
 class ShopItemModel(BaseModel):
@@ -82,48 +164,213 @@ class ShopModel(BaseModel):
 	items: List[ShopItemModel]
 
 
-def load_json(path: Path) -> dict:
-	with path.open("r", encoding="utf-8") as f:
-		return json.load(f)
+# Loaders hand the raw file bytes to pydantic-core, which parses and validates the
+# whole file in one pass instead of building a dict with json and then one model
+# per entry from Python
+_MONSTER_LIST = TypeAdapter(List[MonsterModel])
+_SPELL_LIST = TypeAdapter(List[SpellModel])
+_ABILITY_LIST = TypeAdapter(List[AbilityModel])
 
 
 def load_map(path: Path) -> MapModel:
 	try:
-		data = load_json(path)
-		return MapModel(**data)
+		return MapModel.model_validate_json(path.read_bytes())
 	except ValidationError as e:
 		raise ValueError(f"Invalid map at {path}: {e}")
 
 
 def load_monster(path: Path) -> MonsterModel:
 	try:
-		data = load_json(path)
-		return MonsterModel(**data)
+		return MonsterModel.model_validate_json(path.read_bytes())
 	except ValidationError as e:
 		raise ValueError(f"Invalid monster at {path}: {e}")
 
 
+# A monster file holds one monster or, for large catalogs, a list of them
+def load_monsters(path: Path) -> List[MonsterModel]:
+	data = path.read_bytes()
+	if data.lstrip()[:1] != b"[":
+		return [load_monster(path)]
+	try:
+		return _MONSTER_LIST.validate_json(data)
+	except ValidationError as e:
+		raise ValueError(f"Invalid monsters at {path}: {e}")
+
+
 def load_spells(path: Path) -> List[SpellModel]:
 	try:
-		data = load_json(path)
-		return [SpellModel(**s) for s in data]
+		return _SPELL_LIST.validate_json(path.read_bytes())
 	except ValidationError as e:
 		raise ValueError(f"Invalid spells at {path}: {e}")
 
 
 def load_abilities(path: Path) -> List[AbilityModel]:
 	try:
-		data = load_json(path)
-		return [AbilityModel(**s) for s in data]
+		return _ABILITY_LIST.validate_json(path.read_bytes())
 	except ValidationError as e:
 		raise ValueError(f"Invalid abilities at {path}: {e}")
 
 
 def load_shop(path: Path) -> ShopModel:
 	try:
-		data = load_json(path)
-		return ShopModel(**data)
+		return ShopModel.model_validate_json(path.read_bytes())
 	except ValidationError as e:
 		raise ValueError(f"Invalid shop at {path}: {e}")
 
 
+# Loader for the files of each content directory
+LOADERS: Dict[str, Callable[[Path], Any]] = {
+	"maps": load_map,
+	"monsters": load_monsters,
+	"spells": load_spells,
+	"abilities": load_abilities,
+	"shops": load_shop,
+}
+
+
+# Everything under a content root, keyed by id (maps by file name)
+@dataclass
+class Catalog:
+	maps: Dict[str, MapModel] = field(default_factory=dict)
+	monsters: Dict[str, MonsterModel] = field(default_factory=dict)
+	spells: Dict[str, SpellModel] = field(default_factory=dict)
+	abilities: Dict[str, AbilityModel] = field(default_factory=dict)
+	shops: Dict[str, ShopModel] = field(default_factory=dict)
+	# The file each entry came from, by (directory, key)
+	sources: Dict[Tuple[str, str], Path] = field(default_factory=dict)
+
+	def add(self, kind: str, path: Path, loaded: Any) -> None:
+		table: Dict[str, Any] = getattr(self, kind)
+		if kind == "maps":
+			entries = [(path.stem, loaded)]
+		else:
+			entries = [(m.id, m) for m in (loaded if isinstance(loaded, list) else [loaded])]
+		for key, model in entries:
+			if key in table:
+				raise ValueError(f"Duplicate {kind} entry {key!r} in {path} (already in {self.sources[(kind, key)]})")
+			table[key] = model
+			self.sources[(kind, key)] = path
+
+
+def content_files(root: Path) -> List[Tuple[str, Path]]:
+	return [(kind, p) for kind in LOADERS for p in sorted((Path(root) / kind).rglob("*.json"))]
+
+
+# Loads every content directory under root. Files are read and validated on a
+# thread pool; results are merged in file order, so ids resolve the same way
+# whatever the number of workers.
+def load_catalog(root: Path, workers: Optional[int] = None) -> Catalog:
+	files = content_files(root)
+	if workers == 1 or len(files) < 2:
+		loaded = [LOADERS[kind](p) for kind, p in files]
+	else:
+		with ThreadPoolExecutor(max_workers=workers) as pool:
+			loaded = list(pool.map(lambda job: LOADERS[job[0]](job[1]), files))
+	catalog = Catalog()
+	for (kind, p), result in zip(files, loaded):
+		catalog.add(kind, p, result)
+	return catalog
+
+
+# One reloaded (or deleted) content file. models holds what the file now contains;
+# removed the ids it used to provide and no longer does. On error nothing was loaded.
+@dataclass
+class ContentChange:
+	kind: str
+	path: Path
+	models: List[Any] = field(default_factory=list)
+	removed: Set[str] = field(default_factory=set)
+	error: Optional[str] = None
+
+
+def _entry_ids(kind: str, path: Path, models: List[Any]) -> Set[str]:
+	return {path.stem} if kind == "maps" else {m.id for m in models}
+
+
+# Ids a content file provides, from the raw JSON; unreadable files provide none
+def _file_ids(kind: str, path: Path) -> Set[str]:
+	if kind == "maps":
+		return {path.stem}
+	try:
+		data = json.loads(path.read_bytes())
+	except (OSError, ValueError):
+		return set()
+	entries = data if isinstance(data, list) else [data]
+	return {e["id"] for e in entries if isinstance(e, dict) and isinstance(e.get("id"), str)}
+
+
+# Polls the content tree for files whose mtime or size changed and revalidates only
+# those. Loading happens on the watcher's thread; results queue up until the game
+# loop drains them, so applying a change never races a frame. The ids each file
+# provides are read once up front (ids only, no validation) so an entry deleted by
+# the very first edit is still reported as removed.
+class ContentWatcher:
+	def __init__(self, root: Path, interval: float = 0.5) -> None:
+		self.root = Path(root)
+		self.interval = interval
+		self._stamps = self._scan()
+		self._ids: Dict[Path, Set[str]] = {p: _file_ids(kind, p) for p, (kind, _) in self._stamps.items()}
+		self._changes: "queue.Queue[ContentChange]" = queue.Queue()
+		self._stop = threading.Event()
+		self._thread: Optional[threading.Thread] = None
+
+	def _scan(self) -> Dict[Path, Tuple[str, Tuple[int, int]]]:
+		stamps: Dict[Path, Tuple[str, Tuple[int, int]]] = {}
+		for kind, p in content_files(self.root):
+			try:
+				st = p.stat()
+			except FileNotFoundError:
+				continue
+			stamps[p] = (kind, (st.st_mtime_ns, st.st_size))
+		return stamps
+
+	def _load(self, kind: str, path: Path) -> ContentChange:
+		try:
+			loaded = LOADERS[kind](path)
+		except (ValueError, OSError) as e:
+			return ContentChange(kind, path, error=str(e))
+		models = loaded if isinstance(loaded, list) else [loaded]
+		ids = _entry_ids(kind, path, models)
+		removed = self._ids.get(path, set()) - ids
+		self._ids[path] = ids
+		return ContentChange(kind, path, models=models, removed=removed)
+
+	# One poll; queues and returns the changes found
+	def check(self) -> List[ContentChange]:
+		stamps = self._scan()
+		changes = [
+			self._load(kind, p)
+			for p, (kind, stamp) in stamps.items()
+			if p not in self._stamps or self._stamps[p][1] != stamp
+		]
+		for p in self._stamps.keys() - stamps.keys():
+			changes.append(ContentChange(self._stamps[p][0], p, removed=self._ids.pop(p, set())))
+		self._stamps = stamps
+		for change in changes:
+			self._changes.put(change)
+		return changes
+
+	def drain(self) -> List[ContentChange]:
+		out: List[ContentChange] = []
+		while True:
+			try:
+				out.append(self._changes.get_nowait())
+			except queue.Empty:
+				return out
+
+	def start(self) -> None:
+		if self._thread is not None:
+			return
+		self._stop.clear()
+		self._thread = threading.Thread(target=self._run, name="content-watcher", daemon=True)
+		self._thread.start()
+
+	def _run(self) -> None:
+		while not self._stop.wait(self.interval):
+			self.check()
+
+	def stop(self) -> None:
+		self._stop.set()
+		if self._thread is not None:
+			self._thread.join()
+			self._thread = None
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, Optional, Tuple
+
+from .grid import Grid
+
+
+Coord = Tuple[int, int]
+
+UNREACHABLE = 1 << 30
+
+
+# Breadth-first distances from every goal cell over the walkable cells of a grid,
+# stored flat (index = y * width + x) so a whole pack of monsters can share one
+# field per phase. Occupancy is tracked separately and updated as units move, so
+# the field never has to be rebuilt mid-phase.
+class DistanceField:
+	def __init__(self, grid: Grid, goals: Iterable[Coord]) -> None:
+		w = grid.width
+		h = grid.height
+		self.width = w
+		self.height = h
+		passable = bytearray(b"\x01") * (w * h)
+		for x, y in grid.blocked:
+			if 0 <= x < w and 0 <= y < h:
+				passable[y * w + x] = 0
+		self.passable = passable
+		self.occupied = bytearray(w * h)
+		self.dist = array("i", [UNREACHABLE]) * (w * h)
+		self._flood(goals)
+
+	def _flood(self, goals: Iterable[Coord]) -> None:
+		w = self.width
+		h = self.height
+		dist = self.dist
+		passable = self.passable
+		frontier = []
+		for x, y in goals:
+			if 0 <= x < w and 0 <= y < h:
+				i = y * w + x
+				if dist[i]:
+					dist[i] = 0
+					frontier.append(i)
+		d = 0
+		while frontier:
+			d += 1
+			nxt = []
+			for i in frontier:
+				x = i % w
+				for j, ok in ((i - 1, x > 0), (i + 1, x < w - 1), (i - w, i >= w), (i + w, i < w * (h - 1))):
+					if ok and passable[j] and dist[j] == UNREACHABLE:
+						dist[j] = d
+						nxt.append(j)
+			frontier = nxt
+
+	def distance(self, pos: Coord) -> int:
+		x, y = pos
+		if not (0 <= x < self.width and 0 <= y < self.height):
+			return UNREACHABLE
+		return self.dist[y * self.width + x]
+
+	def occupy(self, pos: Coord) -> None:
+		self.occupied[pos[1] * self.width + pos[0]] = 1
+
+	def vacate(self, pos: Coord) -> None:
+		self.occupied[pos[1] * self.width + pos[0]] = 0
+
+	def move(self, src: Coord, dst: Coord) -> None:
+		self.vacate(src)
+		self.occupy(dst)
+
+	def descend(self, pos: Coord) -> Optional[Coord]:
+		w = self.width
+		x, y = pos
+		i = y * w + x
+		dist = self.dist
+		occupied = self.occupied
+		best = dist[i]
+		best_j = -1
+		for j, ok in ((i + 1, x < w - 1), (i - 1, x > 0), (i + w, i < w * (self.height - 1)), (i - w, i >= w)):
+			if ok and not occupied[j] and dist[j] < best:
+				best = dist[j]
+				best_j = j
+		if best_j < 0:
+			return None
+		return (best_j % w, best_j // w)
@@ -40,13 +40,13 @@ class StateKind(str, Enum):
     DAZED = "dazed"
 
 
-@dataclass
+@dataclass(slots=True)
 class State:
     kind: StateKind
     duration_beats: int
 
 
-@dataclass
+@dataclass(slots=True)
 class UnitStats:
     hp: int
     atk: int
@@ -56,7 +56,7 @@ class UnitStats:
     pow: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Unit:
     id: str
     name: str
@@ -69,7 +69,7 @@ class Unit:
     ap: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamPool:
     rp: int = 0
     ct: int = 0
@@ -4,23 +4,23 @@ from dataclasses import dataclass
 from typing import Union
 
 
-@dataclass
+@dataclass(slots=True)
 class Damage:
 	amount: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Push:
 	distance: int
 
 
-@dataclass
+@dataclass(slots=True)
 class BuffAp:
 	amount: int
 	duration: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Charge:
 	amount: int
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Tuple, List
+from dataclasses import dataclass, field
+from typing import Callable, Tuple, List, Optional
 
 from .stats import Stats
 from .tags import TaggableMixin
@@ -13,7 +13,7 @@ from .quests import QuestLog
 Position = Tuple[int, int]
 
 
-@dataclass
+@dataclass(slots=True)
 class Entity(TaggableMixin):
 	id: str
 	name: str
@@ -21,13 +21,15 @@ class Entity(TaggableMixin):
 	position: Position
 
 
-@dataclass
+@dataclass(slots=True)
 class Player(Entity):
 	progression: Progression
 	inventory: Inventory
 	equipment: EquipmentSlots
 	quest_log: QuestLog
 	gold: int = 0
+	version: int = field(default=0, repr=False, compare=False)
+	on_change: Optional[Callable[[], None]] = field(default=None, repr=False, compare=False)
 	
 	def get_total_stats(self) -> Stats:
 		base_stats = self.stats
@@ -77,27 +79,32 @@ class Player(Entity):
 	
 	def add_gold(self, amount: int) -> None:
 		self.gold += amount
+		self.version += 1
+		if self.on_change is not None:
+			self.on_change()
 	
 	def can_afford(self, amount: int) -> bool:
 		return self.gold >= amount
 
 
-@dataclass
+@dataclass(slots=True)
 class Monster(Entity):
-	pass
+	abilities: List[str] = field(default_factory=list)
+	combat_ap: int = 0
+	combat_mp: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Merchant(Entity):
 	shop_id: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Npc(Entity):
 	dialogue_id: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Portal(Entity):
 	destination_id: str
 	kind: str
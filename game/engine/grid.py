@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List, Set, Tuple
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
 
 
 Coord = Tuple[int, int]
@@ -12,6 +12,8 @@ class Grid:
 	width: int
 	height: int
 	blocked: Set[Coord]
+	# Called with the cells whose walls changed (the path graph listens here)
+	on_change: Optional[Callable[[List[Coord]], None]] = field(default=None, repr=False, compare=False)
 
 	def in_bounds(self, x: int, y: int) -> bool:
 		return 0 <= x < self.width and 0 <= y < self.height
@@ -25,7 +27,14 @@ class Grid:
 		return not self.is_blocked(x, y)
 
 	def add_blocked(self, coords: Iterable[Coord]) -> None:
-		for c in coords:
-			self.blocked.add(c)
+		cells = list(coords)
+		self.blocked.update(cells)
+		if self.on_change is not None:
+			self.on_change(cells)
+
+	def blocked_in(self, x0: int, y0: int, x1: int, y1: int) -> Iterator[Coord]:
+		for x, y in self.blocked:
+			if x0 <= x <= x1 and y0 <= y <= y1:
+				yield (x, y)
 
 
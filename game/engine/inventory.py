@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field, replace
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 from .stats import Stats
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
 	id: str
 	name: str
@@ -18,7 +18,7 @@ class Item:
 	quantity: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class Equipment:
 	id: str
 	name: str
@@ -32,7 +32,7 @@ class Equipment:
 	quantity: int = field(default=1)
 
 
-@dataclass
+@dataclass(slots=True)
 class Consumable:
 	id: str
 	name: str
@@ -46,7 +46,7 @@ class Consumable:
 	quantity: int = field(default=1)
 
 
-@dataclass
+@dataclass(slots=True)
 class Weapon:
 	id: str
 	name: str
@@ -66,6 +66,13 @@ class Inventory:
 	items: List[Item] = field(default_factory=list)
 	total_weight: float = 0.0
 	max_weight: float = 50.0
+	version: int = field(default=0, repr=False, compare=False)
+	on_change: Optional[Callable[[], None]] = field(default=None, repr=False, compare=False)
+	
+	def _changed(self) -> None:
+		self.version += 1
+		if self.on_change is not None:
+			self.on_change()
 	
 	def add_item(self, item: Item) -> bool:
 		incoming_weight = item.weight * item.quantity
@@ -91,11 +98,13 @@ class Inventory:
 				self.items.append(new_stack)
 				self.total_weight += create_qty * item.weight
 				remaining -= create_qty
+			self._changed()
 			return True
 		
 		# Non-stackable: append as-is
 		self.items.append(item)
 		self.total_weight += item.weight * item.quantity
+		self._changed()
 		return True
 	
 	def remove_item(self, item_id: str, quantity: int = 1) -> bool:
@@ -116,6 +125,8 @@ class Inventory:
 			self.total_weight -= item.weight * remaining
 			remaining = 0
 			break
+		if remaining != quantity:
+			self._changed()
 		return remaining == 0
 	
 	def has_item(self, item_id: str, quantity: int = 1) -> bool:
@@ -132,26 +143,28 @@ class EquipmentSlots:
 	armor: Optional[Equipment] = None
 	helmet: Optional[Equipment] = None
 	boots: Optional[Equipment] = None
+	version: int = field(default=0, repr=False, compare=False)
+	on_change: Optional[Callable[[], None]] = field(default=None, repr=False, compare=False)
 	
 	def equip_item(self, item: Item) -> Optional[Item]:
 		if isinstance(item, Weapon):
 			unequipped = self.weapon
 			self.weapon = item
-			return unequipped
-		elif isinstance(item, Equipment):
-			if item.slot == "armor":
-				unequipped = self.armor
-				self.armor = item
-				return unequipped
-			elif item.slot == "helmet":
-				unequipped = self.helmet
-				self.helmet = item
-				return unequipped
-			elif item.slot == "boots":
-				unequipped = self.boots
-				self.boots = item
-				return unequipped
-		return None
+		elif isinstance(item, Equipment) and item.slot == "armor":
+			unequipped = self.armor
+			self.armor = item
+		elif isinstance(item, Equipment) and item.slot == "helmet":
+			unequipped = self.helmet
+			self.helmet = item
+		elif isinstance(item, Equipment) and item.slot == "boots":
+			unequipped = self.boots
+			self.boots = item
+		else:
+			return None
+		self.version += 1
+		if self.on_change is not None:
+			self.on_change()
+		return unequipped
 	
 	def get_equipped_stats(self) -> Stats:
 		total_bonus = Stats(hp=0, ap=0, mp=0, atk=0, res=0, armor=0)
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .entities import Monster
+from .stats import Stats
+from .tags import TAG_BITS, tag_names
+
+
+Coord = Tuple[int, int]
+
+BUCKET = 16
+
+
+class MonsterKind(NamedTuple):
+	id: str
+	name: str
+	abilities: Tuple[str, ...]
+	stats: Stats
+
+
+# World-map monsters kept as parallel columns (one array per field, indexed by row)
+# instead of one object graph each. Per-kind data (name, abilities, base AP/MP) is
+# shared; rows of despawned monsters are recycled. A coarse bucket index keeps cell
+# and rectangle queries proportional to the area asked about, not the population.
+# Iterating the store yields MonsterView objects so code written against
+# List[Monster] keeps working.
+class MonsterStore:
+	def __init__(self) -> None:
+		self.kinds: List[MonsterKind] = []
+		self._kind_ids: Dict[str, int] = {}
+		self.kind = array("H")
+		self.x = array("i")
+		self.y = array("i")
+		self.hp = array("i")
+		self.max_hp = array("i")
+		self.atk = array("i")
+		self.res = array("i")
+		self.armor = array("i")
+		self.tag_mask = array("Q")
+		self.alive = bytearray()
+		self._free: List[int] = []
+		self._buckets: Dict[Coord, Set[int]] = {}
+		self._count = 0
+		# Live rows in row order, rebuilt lazily after a spawn or despawn
+		self._rows: Optional[List[int]] = None
+
+	def __len__(self) -> int:
+		return self._count
+
+	def __iter__(self) -> Iterator[MonsterView]:
+		alive = self.alive
+		for row in range(len(alive)):
+			if alive[row]:
+				yield MonsterView(self, row)
+
+	def __getitem__(self, index: int) -> MonsterView:
+		return MonsterView(self, self._live_rows()[index])
+
+	def _live_rows(self) -> List[int]:
+		if self._rows is None:
+			alive = self.alive
+			self._rows = [row for row in range(len(alive)) if alive[row]]
+		return self._rows
+
+	def rows(self) -> List[int]:
+		return list(self._live_rows())
+
+	def kind_of(self, template: Monster) -> int:
+		k = self._kind_ids.get(template.id)
+		if k is None:
+			k = self._kind_ids[template.id] = len(self.kinds)
+			self.kinds.append(MonsterKind(template.id, template.name, tuple(template.abilities), Stats(
+				hp=template.stats.hp,
+				ap=template.stats.ap,
+				mp=template.stats.mp,
+				atk=template.stats.atk,
+				res=template.stats.res,
+				armor=template.stats.armor,
+			)))
+		return k
+
+	# Swaps in new kind data (reloaded content) and rebases the rows of that kind,
+	# keeping the damage each has taken. Returns the rows updated.
+	def update_kind(self, template: Monster) -> List[int]:
+		k = self._kind_ids.get(template.id)
+		if k is None:
+			return []
+		s = template.stats
+		self.kinds[k] = MonsterKind(template.id, template.name, tuple(template.abilities), Stats(hp=s.hp, ap=s.ap, mp=s.mp, atk=s.atk, res=s.res, armor=s.armor))
+		mask = template.tag_mask
+		rows = [row for row in range(len(self.alive)) if self.alive[row] and self.kind[row] == k]
+		for row in rows:
+			self.hp[row] = max(1, s.hp - (self.max_hp[row] - self.hp[row]))
+			self.max_hp[row] = s.hp
+			self.atk[row] = s.atk
+			self.res[row] = s.res
+			self.tag_mask[row] = mask
+		return rows
+
+	def spawn(self, template: Monster, positions: Iterable[Coord]) -> List[int]:
+		k = self.kind_of(template)
+		s = template.stats
+		mask = template.tag_mask
+		rows: List[int] = []
+		for pos in positions:
+			if self._free:
+				row = self._free.pop()
+				self.kind[row] = k
+				self.x[row], self.y[row] = pos
+				self.hp[row] = s.current_hp
+				self.max_hp[row] = s.hp
+				self.atk[row] = s.atk
+				self.res[row] = s.res
+				self.armor[row] = s.armor
+				self.tag_mask[row] = mask
+				self.alive[row] = 1
+			else:
+				row = len(self.alive)
+				self.kind.append(k)
+				self.x.append(pos[0])
+				self.y.append(pos[1])
+				self.hp.append(s.current_hp)
+				self.max_hp.append(s.hp)
+				self.atk.append(s.atk)
+				self.res.append(s.res)
+				self.armor.append(s.armor)
+				self.tag_mask.append(mask)
+				self.alive.append(1)
+			self._buckets.setdefault((pos[0] // BUCKET, pos[1] // BUCKET), set()).add(row)
+			rows.append(row)
+		self._count += len(rows)
+		self._rows = None
+		return rows
+
+	def despawn(self, row: int) -> None:
+		if not self.alive[row]:
+			return
+		self.alive[row] = 0
+		self._buckets[(self.x[row] // BUCKET, self.y[row] // BUCKET)].discard(row)
+		self._free.append(row)
+		self._count -= 1
+		self._rows = None
+
+	def move(self, row: int, pos: Coord) -> None:
+		old = (self.x[row] // BUCKET, self.y[row] // BUCKET)
+		new = (pos[0] // BUCKET, pos[1] // BUCKET)
+		self.x[row], self.y[row] = pos
+		if old != new:
+			self._buckets[old].discard(row)
+			self._buckets.setdefault(new, set()).add(row)
+
+	def move_many(self, rows: Iterable[int], positions: Iterable[Coord]) -> None:
+		for row, pos in zip(rows, positions):
+			self.move(row, pos)
+
+	# Same mitigation as a combat hit; returns the rows that died (and were despawned)
+	def damage(self, rows: Iterable[int], amount: int) -> List[int]:
+		hp = self.hp
+		killed: List[int] = []
+		for row in rows:
+			if not self.alive[row]:
+				continue
+			dealt = max(1, max(1, amount - self.res[row]) - self.armor[row])
+			hp[row] = max(0, hp[row] - dealt)
+			if hp[row] == 0:
+				killed.append(row)
+		for row in killed:
+			self.despawn(row)
+		return killed
+
+	def at(self, pos: Coord) -> Optional[int]:
+		x, y = pos
+		for row in self._buckets.get((x // BUCKET, y // BUCKET), ()):
+			if self.x[row] == x and self.y[row] == y:
+				return row
+		return None
+
+	def in_rect(self, x0: int, y0: int, x1: int, y1: int) -> List[int]:
+		xs = self.x
+		ys = self.y
+		found: List[int] = []
+		for by in range(y0 // BUCKET, y1 // BUCKET + 1):
+			for bx in range(x0 // BUCKET, x1 // BUCKET + 1):
+				for row in self._buckets.get((bx, by), ()):
+					if x0 <= xs[row] <= x1 and y0 <= ys[row] <= y1:
+						found.append(row)
+		return found
+
+	def with_tags(self, mask: int) -> List[int]:
+		alive = self.alive
+		tags = self.tag_mask
+		return [row for row in range(len(alive)) if alive[row] and tags[row] & mask]
+
+	def positions(self) -> Set[Coord]:
+		xs = self.x
+		ys = self.y
+		return {(xs[row], ys[row]) for rows in self._buckets.values() for row in rows}
+
+	def view(self, row: int) -> MonsterView:
+		return MonsterView(self, row)
+
+	def to_monster(self, row: int) -> Monster:
+		kind = self.kinds[self.kind[row]]
+		return Monster(
+			id=kind.id,
+			name=kind.name,
+			stats=Stats(
+				hp=self.max_hp[row],
+				ap=kind.stats.ap,
+				mp=kind.stats.mp,
+				atk=self.atk[row],
+				res=self.res[row],
+				current_hp=self.hp[row],
+				armor=self.armor[row],
+			),
+			position=(self.x[row], self.y[row]),
+			tag_mask=self.tag_mask[row],
+			abilities=list(kind.abilities),
+		)
+
+
+# Read-mostly stand-in for a Monster backed by one store row. stats is a copy;
+# position writes go through the store so its index stays correct.
+class MonsterView:
+	__slots__ = ("store", "row")
+
+	def __init__(self, store: MonsterStore, row: int) -> None:
+		self.store = store
+		self.row = row
+
+	def __eq__(self, other: object) -> bool:
+		return isinstance(other, MonsterView) and other.store is self.store and other.row == self.row
+
+	def __hash__(self) -> int:
+		return hash((id(self.store), self.row))
+
+	@property
+	def id(self) -> str:
+		return self.store.kinds[self.store.kind[self.row]].id
+
+	@property
+	def name(self) -> str:
+		return self.store.kinds[self.store.kind[self.row]].name
+
+	@property
+	def abilities(self) -> List[str]:
+		return list(self.store.kinds[self.store.kind[self.row]].abilities)
+
+	@property
+	def position(self) -> Coord:
+		return (self.store.x[self.row], self.store.y[self.row])
+
+	@position.setter
+	def position(self, pos: Coord) -> None:
+		self.store.move(self.row, pos)
+
+	@property
+	def stats(self) -> Stats:
+		return self.store.to_monster(self.row).stats
+
+	@property
+	def tag_mask(self) -> int:
+		return self.store.tag_mask[self.row]
+
+	@property
+	def tags(self):
+		return tag_names(self.tag_mask)
+
+	def has_tag(self, tag: str) -> bool:
+		return bool(self.store.tag_mask[self.row] & TAG_BITS.get(tag, 0))
+
+	def to_monster(self) -> Monster:
+		return self.store.to_monster(self.row)
@@ -0,0 +1,478 @@
+from __future__ import annotations
+
+import heapq
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import AbstractSet, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+from .chunks import ChunkedGrid
+from .grid import Coord, Grid
+
+
+GridLike = Union[Grid, ChunkedGrid]
+Bounds = Tuple[int, int, int, int]
+ClusterKey = Tuple[int, int]
+
+CLUSTER = 16
+# Smaller maps are searched with plain A*; the abstract graph only pays off when a
+# route spans many clusters
+HIERARCHICAL_MIN_CELLS = 64 * 64
+
+_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+# Search methods find_path can be asked for; None picks by map size
+ASTAR = "astar"
+JPS = "jps"
+HIERARCHICAL = "hpa"
+
+
+@dataclass
+class SearchStats:
+	expanded: int = 0
+
+
+def manhattan(a: Coord, b: Coord) -> int:
+	return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+# 4-connected A* with unit costs. Returns the cells after start up to and including
+# goal ([] when start is goal) or None. Occupied cells are impassable except the
+# goal itself; bounds (x0, y0, x1, y1, inclusive) keeps the search inside a region.
+def astar(grid: GridLike, start: Coord, goal: Coord, occupied: AbstractSet[Coord] = frozenset(), bounds: Optional[Bounds] = None, stats: Optional[SearchStats] = None) -> Optional[List[Coord]]:
+	x0, y0, x1, y1 = bounds if bounds is not None else (0, 0, grid.width - 1, grid.height - 1)
+	gx, gy = goal
+	openq: List[Tuple[int, int, Coord]] = [(manhattan(start, goal), 0, start)]
+	came: Dict[Coord, Optional[Coord]] = {start: None}
+	g: Dict[Coord, int] = {start: 0}
+	while openq:
+		_, cost, cur = heapq.heappop(openq)
+		if cur == goal:
+			break
+		if cost > g[cur]:
+			continue
+		if stats is not None:
+			stats.expanded += 1
+		cx, cy = cur
+		for dx, dy in _STEPS:
+			nx = cx + dx
+			ny = cy + dy
+			if not (x0 <= nx <= x1 and y0 <= ny <= y1) or not grid.walkable(nx, ny):
+				continue
+			nxt = (nx, ny)
+			if nxt in occupied and nxt != goal:
+				continue
+			ng = cost + 1
+			if ng < g.get(nxt, ng + 1):
+				g[nxt] = ng
+				came[nxt] = cur
+				heapq.heappush(openq, (ng + abs(nx - gx) + abs(ny - gy), ng, nxt))
+	if goal not in came:
+		return None
+	path: List[Coord] = []
+	cur = goal
+	while cur != start:
+		path.append(cur)
+		cur = came[cur]  # type: ignore[assignment]
+	path.reverse()
+	return path
+
+
+# Jump Point Search for 4-connected unit-cost grids. Among the many equally short
+# paths on open ground only the vertical-first one is considered canonical, so the
+# search jumps along straight lines and only stops (and pushes a node) where the
+# canonical path may turn: at the goal, where a horizontal run passes the end of a
+# wall beside it, and on a vertical run wherever a horizontal jump from it would
+# stop. Same contract and result lengths as astar, with far fewer heap operations on
+# open maps.
+def jps(grid: GridLike, start: Coord, goal: Coord, occupied: AbstractSet[Coord] = frozenset(), stats: Optional[SearchStats] = None) -> Optional[List[Coord]]:
+	gx, gy = goal
+	if isinstance(grid, Grid):
+		# Inlined Grid.walkable: the jumps probe several cells per step
+		w = grid.width
+		h = grid.height
+		walls = grid.blocked if not occupied else grid.blocked | (set(occupied) - {goal})
+
+		def passable(x: int, y: int) -> bool:
+			return 0 <= x < w and 0 <= y < h and (x, y) not in walls
+	elif occupied:
+		walkable = grid.walkable
+
+		def passable(x: int, y: int) -> bool:
+			return walkable(x, y) and ((x, y) not in occupied or (x == gx and y == gy))
+	else:
+		passable = grid.walkable
+
+	def jump_h(x: int, y: int, dx: int) -> Optional[Coord]:
+		# up/down: whether the cells above and below the previous step were open
+		up = passable(x, y - 1)
+		down = passable(x, y + 1)
+		while True:
+			x += dx
+			if not passable(x, y):
+				return None
+			if x == gx and y == gy:
+				return (x, y)
+			was_up = up
+			was_down = down
+			up = passable(x, y - 1)
+			down = passable(x, y + 1)
+			if (up and not was_up) or (down and not was_down):
+				return (x, y)
+
+	def jump_v(x: int, y: int, dy: int) -> Optional[Coord]:
+		while True:
+			y += dy
+			if not passable(x, y):
+				return None
+			if (x == gx and y == gy) or jump_h(x, y, 1) is not None or jump_h(x, y, -1) is not None:
+				return (x, y)
+
+	openq: List[Tuple[int, int, int, Coord, Coord]] = [(manhattan(start, goal), 0, 0, start, (0, 0))]
+	came: Dict[Coord, Optional[Coord]] = {start: None}
+	g: Dict[Coord, int] = {start: 0}
+	seq = 1
+	while openq:
+		_, cost, _, cur, (dx, dy) = heapq.heappop(openq)
+		if cur == goal:
+			break
+		if cost > g[cur]:
+			continue
+		if stats is not None:
+			stats.expanded += 1
+		x, y = cur
+		if dx:
+			dirs = [(dx, 0)] + [(0, s) for s in (-1, 1) if passable(x, y + s) and not passable(x - dx, y + s)]
+		elif dy:
+			dirs = [(0, dy), (1, 0), (-1, 0)]
+		else:
+			dirs = list(_STEPS)
+		for ddx, ddy in dirs:
+			nxt = jump_h(x, y, ddx) if ddx else jump_v(x, y, ddy)
+			if nxt is None:
+				continue
+			ng = cost + abs(nxt[0] - x) + abs(nxt[1] - y)
+			if ng < g.get(nxt, ng + 1):
+				g[nxt] = ng
+				came[nxt] = cur
+				heapq.heappush(openq, (ng + abs(nxt[0] - gx) + abs(nxt[1] - gy), ng, seq, nxt, (ddx, ddy)))
+				seq += 1
+	if goal not in came:
+		return None
+	points: List[Coord] = []
+	cur = goal
+	while cur is not None:
+		points.append(cur)
+		cur = came[cur]
+	points.reverse()
+	path: List[Coord] = []
+	for (ax, ay), (bx, by) in zip(points, points[1:]):
+		sx = (bx > ax) - (bx < ax)
+		sy = (by > ay) - (by < ay)
+		while (ax, ay) != (bx, by):
+			ax += sx
+			ay += sy
+			path.append((ax, ay))
+	return path
+
+
+# Hierarchical pathfinding (HPA*). The map is cut into size x size clusters; every
+# run of open cells along a shared cluster edge gets one entrance pair (two for long
+# runs), and entrances of a cluster are linked by their in-cluster walking distance.
+# A long query searches that small abstract graph and then refines each hop with a
+# bounded A* inside one cluster. Clusters and edges are built the first time a
+# search touches them and dropped again by update() when walls change, so a huge or
+# streamed map only pays for the part that is actually travelled.
+class ClusterGraph:
+	def __init__(self, grid: GridLike, size: int = CLUSTER) -> None:
+		self.grid = grid
+		self.size = size
+		self.clusters_wide = (grid.width + size - 1) // size
+		self.clusters_high = (grid.height + size - 1) // size
+		self._borders: Dict[Tuple[ClusterKey, ClusterKey], List[Tuple[Coord, Coord]]] = {}
+		self._intra: Dict[ClusterKey, Dict[Coord, Dict[Coord, int]]] = {}
+		# Refined in-cluster walks between two hops, reused while nothing stands on them
+		self._legs: Dict[ClusterKey, Dict[Tuple[Coord, Coord], List[Coord]]] = {}
+		self.expanded = 0
+
+	def cluster_of(self, cell: Coord) -> ClusterKey:
+		return (cell[0] // self.size, cell[1] // self.size)
+
+	def bounds(self, k: ClusterKey) -> Bounds:
+		x0 = k[0] * self.size
+		y0 = k[1] * self.size
+		return (x0, y0, min(self.grid.width, x0 + self.size) - 1, min(self.grid.height, y0 + self.size) - 1)
+
+	def _neighbour_clusters(self, k: ClusterKey) -> Iterator[ClusterKey]:
+		kx, ky = k
+		for dx, dy in _STEPS:
+			nx = kx + dx
+			ny = ky + dy
+			if 0 <= nx < self.clusters_wide and 0 <= ny < self.clusters_high:
+				yield (nx, ny)
+
+	# Entrance pairs (cell in a, cell in b) across the edge between adjacent clusters
+	def _border(self, a: ClusterKey, b: ClusterKey) -> List[Tuple[Coord, Coord]]:
+		if b < a:
+			return [(cb, ca) for ca, cb in self._border(b, a)]
+		key = (a, b)
+		pairs = self._borders.get(key)
+		if pairs is not None:
+			return pairs
+		ax0, ay0, ax1, ay1 = self.bounds(a)
+		if b[0] != a[0]:
+			line = [((ax1, y), (ax1 + 1, y)) for y in range(ay0, ay1 + 1)]
+		else:
+			line = [((x, ay1), (x, ay1 + 1)) for x in range(ax0, ax1 + 1)]
+		walkable = self.grid.walkable
+		runs: List[List[Tuple[Coord, Coord]]] = [[]]
+		for pair in line:
+			if walkable(*pair[0]) and walkable(*pair[1]):
+				runs[-1].append(pair)
+			elif runs[-1]:
+				runs.append([])
+		pairs = []
+		for run in runs:
+			if len(run) >= 6:
+				pairs += [run[0], run[-1]]
+			elif run:
+				pairs.append(run[len(run) // 2])
+		self._borders[key] = pairs
+		return pairs
+
+	def _entrances(self, k: ClusterKey) -> Set[Coord]:
+		nodes: Set[Coord] = set()
+		for nb in self._neighbour_clusters(k):
+			for mine, _ in self._border(k, nb):
+				nodes.add(mine)
+		return nodes
+
+	# Breadth-first distances from src to the given targets without leaving bounds
+	def _distances(self, src: Coord, bounds: Bounds, targets: AbstractSet[Coord]) -> Dict[Coord, int]:
+		x0, y0, x1, y1 = bounds
+		walkable = self.grid.walkable
+		found: Dict[Coord, int] = {}
+		if src in targets:
+			found[src] = 0
+		seen = {src}
+		queue = deque([(src, 0)])
+		while queue and len(found) < len(targets):
+			(cx, cy), d = queue.popleft()
+			for dx, dy in _STEPS:
+				nx = cx + dx
+				ny = cy + dy
+				nxt = (nx, ny)
+				if nxt in seen or not (x0 <= nx <= x1 and y0 <= ny <= y1) or not walkable(nx, ny):
+					continue
+				seen.add(nxt)
+				if nxt in targets:
+					found[nxt] = d + 1
+				queue.append((nxt, d + 1))
+		return found
+
+	# Every entrance of the cluster with its edges: walking distance to the other
+	# entrances it reaches inside the cluster, and 1 to its partner across the border
+	def _cluster(self, k: ClusterKey) -> Dict[Coord, Dict[Coord, int]]:
+		edges = self._intra.get(k)
+		if edges is None:
+			nodes = self._entrances(k)
+			b = self.bounds(k)
+			edges = {}
+			for n in nodes:
+				dist = self._distances(n, b, nodes)
+				dist.pop(n, None)
+				edges[n] = dist
+			for nb in self._neighbour_clusters(k):
+				for mine, theirs in self._border(k, nb):
+					edges[mine][theirs] = 1
+			self._intra[k] = edges
+		return edges
+
+	# Walls changed at these cells: forget the borders and edges they can affect
+	def update(self, cells: Iterable[Coord]) -> None:
+		dirty = {self.cluster_of(c) for c in cells}
+		touched = set(dirty)
+		for k in dirty:
+			for nb in self._neighbour_clusters(k):
+				self._borders.pop((min(k, nb), max(k, nb)), None)
+				touched.add(nb)
+		for k in touched:
+			self._intra.pop(k, None)
+			self._legs.pop(k, None)
+
+	def find_path(self, start: Coord, goal: Coord, occupied: AbstractSet[Coord] = frozenset()) -> Optional[List[Coord]]:
+		if not self.grid.walkable(*goal):
+			return None
+		ks = self.cluster_of(start)
+		kg = self.cluster_of(goal)
+		if ks == kg:
+			local = astar(self.grid, start, goal, occupied, self.bounds(ks))
+			if local is not None:
+				return local
+		hops = self._abstract(start, goal, ks, kg)
+		if hops is None:
+			return None
+		path: List[Coord] = []
+		for a, b in zip(hops, hops[1:]):
+			# An entrance someone stands on is a wall for this search; only the goal
+			# itself may be occupied
+			if b in occupied and b != goal:
+				return astar(self.grid, start, goal, occupied)
+			if manhattan(a, b) == 1:
+				path.append(b)
+				continue
+			leg = self._leg(a, b, goal, occupied)
+			if leg is None:
+				# Something occupies the only way through this cluster
+				return astar(self.grid, start, goal, occupied)
+			path += leg
+		return path
+
+	# Refined path from a to b inside a's cluster. b is never occupied unless it is
+	# the goal (find_path checks), so astar's free pass for its own goal is safe.
+	def _leg(self, a: Coord, b: Coord, goal: Coord, occupied: AbstractSet[Coord]) -> Optional[List[Coord]]:
+		k = self.cluster_of(a)
+		legs = self._legs.setdefault(k, {})
+		leg = legs.get((a, b))
+		if leg is None:
+			leg = astar(self.grid, a, b, bounds=self.bounds(k))
+			if leg is None:
+				return None
+			legs[(a, b)] = leg
+		if occupied and any(c in occupied and c != goal for c in leg):
+			return astar(self.grid, a, b, occupied, self.bounds(k))
+		return leg
+
+	def _abstract(self, start: Coord, goal: Coord, ks: ClusterKey, kg: ClusterKey) -> Optional[List[Coord]]:
+		exits = self._distances(start, self.bounds(ks), self._cluster(ks).keys())
+		entries = self._distances(goal, self.bounds(kg), self._cluster(kg).keys())
+		# Entries are (f, g, tie-break, node); None stands for the goal cell itself
+		openq: List[Tuple[int, int, int, Optional[Coord]]] = []
+		g: Dict[Optional[Coord], int] = {}
+		came: Dict[Optional[Coord], Coord] = {}
+		seq = 0
+		for n, d in exits.items():
+			g[n] = d
+			came[n] = start
+			openq.append((d + manhattan(n, goal), d, seq, n))
+			seq += 1
+		heapq.heapify(openq)
+		while openq:
+			_, cost, _, node = heapq.heappop(openq)
+			if node is None:
+				break
+			if cost > g[node]:
+				continue
+			self.expanded += 1
+			last = entries.get(node)
+			if last is not None and cost + last < g.get(None, cost + last + 1):
+				g[None] = cost + last
+				came[None] = node
+				heapq.heappush(openq, (cost + last, cost + last, seq, None))
+				seq += 1
+			for nxt, d in self._cluster(self.cluster_of(node))[node].items():
+				ng = cost + d
+				if ng < g.get(nxt, ng + 1):
+					g[nxt] = ng
+					came[nxt] = node
+					heapq.heappush(openq, (ng + manhattan(nxt, goal), ng, seq, nxt))
+					seq += 1
+		if None not in came:
+			return None
+		hops = [goal]
+		node = came[None]
+		while node != start:
+			hops.append(node)
+			node = came[node]
+		hops.append(start)
+		hops.reverse()
+		return hops
+
+
+_GRAPHS: "OrderedDict[int, Tuple[GridLike, ClusterGraph]]" = OrderedDict()
+_GRAPHS_KEPT = 8
+
+
+# The cluster graph of a grid, built once and kept for the grid's lifetime (as long
+# as it is among the last few asked for). It subscribes to the grid's wall edits.
+def graph_for(grid: GridLike) -> ClusterGraph:
+	key = id(grid)
+	hit = _GRAPHS.get(key)
+	if hit is not None and hit[0] is grid:
+		_GRAPHS.move_to_end(key)
+		return hit[1]
+	graph = ClusterGraph(grid)
+	grid.on_change = graph.update
+	_GRAPHS[key] = (grid, graph)
+	while len(_GRAPHS) > _GRAPHS_KEPT:
+		_GRAPHS.popitem(last=False)
+	return graph
+
+
+def find_path(grid: GridLike, start: Coord, goal: Coord, occupied: AbstractSet[Coord] = frozenset(), method: Optional[str] = None) -> Optional[List[Coord]]:
+	if method is None:
+		method = ASTAR if grid.width * grid.height < HIERARCHICAL_MIN_CELLS else HIERARCHICAL
+	if method == ASTAR:
+		return astar(grid, start, goal, occupied)
+	if method == JPS:
+		return jps(grid, start, goal, occupied)
+	if method == HIERARCHICAL:
+		return graph_for(grid).find_path(start, goal, occupied)
+	raise ValueError(f"unknown path search method {method!r}")
+
+
+class MapLayout(NamedTuple):
+	map_id: str
+	grid: GridLike
+	arrival: Coord
+	# (portal cell, destination map id) for every usable portal
+	exits: Tuple[Tuple[Coord, str], ...]
+
+
+RouteLeg = Tuple[str, List[Coord]]
+
+
+# Cheapest walk from start on from_map to goal on to_map, through any number of
+# portals. Maps are the nodes of the outer search (Dijkstra over (map, entry cell)),
+# portals its edges; walking distances inside a map come from find_path. Returns one
+# (map id, path) leg per map visited, each but the last ending on a portal.
+def plan_route(layout_of: Callable[[str], MapLayout], from_map: str, start: Coord, to_map: str, goal: Coord) -> Optional[List[RouteLeg]]:
+	openq: List[Tuple[int, int, Tuple[str, Coord]]] = [(0, 0, (from_map, start))]
+	best: Dict[Tuple[str, Coord], int] = {(from_map, start): 0}
+	back: Dict[Tuple[str, Coord], Tuple[Tuple[str, Coord], List[Coord]]] = {}
+	done = ("", goal)
+	seq = 1
+	while openq:
+		cost, _, state = heapq.heappop(openq)
+		if state == done:
+			break
+		if cost > best.get(state, cost):
+			continue
+		map_id, cell = state
+		layout = layout_of(map_id)
+		# (next state, cell to walk to, cost of going on from there)
+		moves: List[Tuple[Tuple[str, Coord], Coord, int]] = []
+		if map_id == to_map:
+			moves.append((done, goal, 0))
+		for portal, dest in layout.exits:
+			moves.append(((dest, layout_of(dest).arrival), portal, 1))
+		for nxt, target, extra in moves:
+			walk = find_path(layout.grid, cell, target)
+			if walk is None:
+				continue
+			ng = cost + len(walk) + extra
+			if ng < best.get(nxt, ng + 1):
+				best[nxt] = ng
+				back[nxt] = (state, walk)
+				heapq.heappush(openq, (ng, seq, nxt))
+				seq += 1
+	if done not in back:
+		return None
+	legs: List[RouteLeg] = []
+	state = done
+	while state in back:
+		prev, walk = back[state]
+		legs.append((prev[0], walk))
+		state = prev
+	legs.reverse()
+	return legs
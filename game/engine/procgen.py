@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import random
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union
+
+from .chunks import CHUNKED_MIN_CELLS, ChunkKey, ChunkedGrid, chunks_from_cells
+from .grid import Coord, Grid
+
+
+# Maps are bytearrays, one byte per cell, 1 = wall, index y * width + x.
+#
+# The cave automaton works on whole rows at once: each row is a Python int with bit
+# x set for a wall, so shifting a row is a neighbour lookup for every cell of it and
+# the neighbour count is kept bit-sliced (one int per bit of the count). A step is a
+# few dozen big-int operations per row instead of nine lookups per cell.
+
+# One byte per bit, for turning a packed row back into cells
+_UNPACK = [bytes((b >> i) & 1 for i in range(8)) for b in range(256)]
+_INVERT = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+
+def _random_row(rng: random.Random, width: int, fill: float) -> int:
+	# Each binary digit of fill (most significant first) ORs or ANDs in a fresh
+	# random word, which gives every bit exactly that probability
+	digits = []
+	f = fill
+	for _ in range(8):
+		f *= 2
+		digits.append(int(f))
+		f -= int(f)
+	row = 0
+	for d in reversed(digits):
+		r = rng.getrandbits(width)
+		row = (row | r) if d else (row & r)
+	return row
+
+
+# Adds the bit vector v, worth 2**bit per set bit, into a bit-sliced counter
+def _add(counter: List[int], v: int, bit: int = 0) -> None:
+	for i in range(bit, len(counter)):
+		carry = counter[i] & v
+		counter[i] ^= v
+		v = carry
+		if not v:
+			break
+
+
+def _ca_step(rows: List[int], width: int) -> List[int]:
+	full = (1 << width) - 1
+	top = 1 << (width - 1)
+	# Horizontal triple sums (cell plus left and right), 2-bit sliced; off-map is wall
+	lo: List[int] = []
+	hi: List[int] = []
+	for r in rows:
+		a = ((r << 1) | 1) & full
+		b = r
+		c = (r >> 1) | top
+		ab = a ^ b
+		lo.append(ab ^ c)
+		hi.append((a & b) | (c & ab))
+	out: List[int] = []
+	height = len(rows)
+	for y in range(height):
+		counter = [0, 0, 0, 0]
+		for ny in (y - 1, y, y + 1):
+			if 0 <= ny < height:
+				_add(counter, lo[ny])
+				_add(counter, hi[ny], 1)
+			else:
+				# Off-map rows are walls: 3 per cell
+				_add(counter, full)
+				_add(counter, full, 1)
+		c0, c1, c2, c3 = counter
+		# Wall when at least 5 of the 9 cells around (and including) it are walls
+		out.append((c3 | (c2 & (c1 | c0))) & full)
+	return out
+
+
+def _rows_to_cells(rows: List[int], width: int) -> bytearray:
+	nbytes = (width + 7) // 8
+	parts = []
+	for r in rows:
+		parts.append(b"".join([_UNPACK[b] for b in r.to_bytes(nbytes, "little")])[:width])
+	return bytearray(b"".join(parts))
+
+
+def _frame(cells: bytearray, width: int, height: int) -> None:
+	cells[0:width] = b"\x01" * width
+	cells[(height - 1) * width:height * width] = b"\x01" * width
+	cells[0::width] = b"\x01" * height
+	cells[width - 1::width] = b"\x01" * height
+
+
+def generate_caves(width: int, height: int, seed: int, fill: float = 0.45, steps: int = 4) -> bytearray:
+	rng = random.Random(seed)
+	rows = [_random_row(rng, width, fill) for _ in range(height)]
+	for _ in range(steps):
+		rows = _ca_step(rows, width)
+	cells = _rows_to_cells(rows, width)
+	_frame(cells, width, height)
+	return cells
+
+
+def _carve(cells: bytearray, width: int, x0: int, y0: int, x1: int, y1: int) -> None:
+	span = bytes(x1 - x0 + 1)
+	for y in range(y0, y1 + 1):
+		cells[y * width + x0:y * width + x1 + 1] = span
+
+
+def generate_rooms(width: int, height: int, seed: int, min_leaf: int = 12, max_depth: int = 12) -> bytearray:
+	rng = random.Random(seed)
+	cells = bytearray(b"\x01") * (width * height)
+
+	# Returns a room centre in the subtree, joining the two halves on the way up
+	def split(x0: int, y0: int, x1: int, y1: int, depth: int) -> Coord:
+		w = x1 - x0 + 1
+		h = y1 - y0 + 1
+		vertical = w > h if w != h else rng.random() < 0.5
+		size = w if vertical else h
+		if depth >= max_depth or size < 2 * min_leaf:
+			rw = rng.randint(max(3, w // 2), max(3, w - 2))
+			rh = rng.randint(max(3, h // 2), max(3, h - 2))
+			rx = x0 + rng.randint(1, max(1, w - rw - 1))
+			ry = y0 + rng.randint(1, max(1, h - rh - 1))
+			rx1 = min(x1 - 1, rx + rw - 1)
+			ry1 = min(y1 - 1, ry + rh - 1)
+			_carve(cells, width, rx, ry, rx1, ry1)
+			return ((rx + rx1) // 2, (ry + ry1) // 2)
+		cut = rng.randint(min_leaf, size - min_leaf)
+		if vertical:
+			a = split(x0, y0, x0 + cut - 1, y1, depth + 1)
+			b = split(x0 + cut, y0, x1, y1, depth + 1)
+		else:
+			a = split(x0, y0, x1, y0 + cut - 1, depth + 1)
+			b = split(x0, y0 + cut, x1, y1, depth + 1)
+		# L-shaped corridor between the two halves
+		_carve(cells, width, min(a[0], b[0]), a[1], max(a[0], b[0]), a[1])
+		_carve(cells, width, b[0], min(a[1], b[1]), b[0], max(a[1], b[1]))
+		return a if rng.random() < 0.5 else b
+
+	split(0, 0, width - 1, height - 1, 0)
+	_frame(cells, width, height)
+	return cells
+
+
+# Scanline flood fill over free (1 = open and not yet visited), clearing what it
+# reaches and recording it as (start, end) index spans. Spans are found with
+# bytearray.find, so the work is per span, not per cell.
+def _fill(free: bytearray, width: int, height: int, start: int, spans: List[Tuple[int, int]]) -> int:
+	size = 0
+	stack = [start]
+	while stack:
+		i = stack.pop()
+		if not free[i]:
+			continue
+		y = i // width
+		row = y * width
+		left = free.rfind(0, row, i) + 1
+		if left <= row:
+			left = row
+		right = free.find(0, i, row + width)
+		if right < 0:
+			right = row + width
+		free[left:right] = bytes(right - left)
+		size += right - left
+		spans.append((left, right))
+		for ny in (y - 1, y + 1):
+			if not 0 <= ny < height:
+				continue
+			base = ny * width - row
+			j = free.find(1, left + base, right + base)
+			while j >= 0:
+				stack.append(j)
+				end = free.find(0, j, right + base)
+				if end < 0:
+					break
+				j = free.find(1, end, right + base)
+	return size
+
+
+# Keeps the largest open region and walls in the rest, so every open cell is
+# reachable. Returns the region's first open cell in reading order.
+def connect(cells: bytearray, width: int, height: int) -> Coord:
+	regions: List[Tuple[int, int, List[Tuple[int, int]]]] = []
+	free = bytearray(cells.translate(_INVERT))
+	i = free.find(1)
+	while i >= 0:
+		spans: List[Tuple[int, int]] = []
+		regions.append((_fill(free, width, height, i, spans), i, spans))
+		i = free.find(1, i)
+	if not regions:
+		raise ValueError("generated map has no open cells")
+	keeper = max(regions, key=lambda region: region[0])
+	for region in regions:
+		if region is not keeper:
+			for left, right in region[2]:
+				cells[left:right] = b"\x01" * (right - left)
+	first = keeper[1]
+	return (first % width, first // width)
+
+
+@dataclass(frozen=True)
+class GeneratedZone:
+	width: int
+	height: int
+	chunks: Dict[ChunkKey, bytes]
+	start: Coord
+
+	# Each call gets its own copy of the chunk table, so edits to one grid never
+	# reach the cached zone
+	def grid(self) -> Union[Grid, ChunkedGrid]:
+		chunked = ChunkedGrid.from_chunks(self.width, self.height, dict(self.chunks))
+		if self.width * self.height > CHUNKED_MIN_CELLS:
+			return chunked
+		return Grid(width=self.width, height=self.height, blocked=set(chunked.blocked))
+
+
+GENERATORS = {
+	"caves": generate_caves,
+	"rooms": generate_rooms,
+}
+
+
+@lru_cache(maxsize=16)
+def generate_zone(kind: str, width: int, height: int, seed: int) -> GeneratedZone:
+	cells = GENERATORS[kind](width, height, seed)
+	start = connect(cells, width, height)
+	return GeneratedZone(width, height, chunks_from_cells(width, height, cells), start)
+
+
+def zone_seed(world_seed: int, zone_id: str) -> int:
+	return zlib.crc32(f"{world_seed}:{zone_id}".encode())
+
+
+# The walkable cell closest to pos (by rings of growing Chebyshev distance), for
+# placing things on maps nobody laid out by hand
+def nearest_open(grid: Union[Grid, ChunkedGrid], pos: Coord, avoid: Tuple[Coord, ...] = (), max_radius: int = 64) -> Coord:
+	px, py = pos
+	for radius in range(max_radius + 1):
+		for y in range(py - radius, py + radius + 1):
+			for x in range(px - radius, px + radius + 1):
+				if max(abs(x - px), abs(y - py)) == radius and grid.walkable(x, y) and (x, y) not in avoid:
+					return (x, y)
+	raise ValueError(f"no open cell within {max_radius} of {pos}")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
 
 from .stats import Stats
 
@@ -11,6 +11,8 @@ class WeaponSkills:
 	melee_damage: int = 0
 	ranged_damage: int = 0
 	magic_damage: int = 0
+	version: int = field(default=0, repr=False, compare=False)
+	on_change: Optional[Callable[[], None]] = field(default=None, repr=False, compare=False)
 	
 	def add_experience(self, skill_type: str, amount: int = 1) -> None:
 		if skill_type == "melee":
@@ -19,6 +21,11 @@ class WeaponSkills:
 			self.ranged_damage += amount
 		elif skill_type == "magic":
 			self.magic_damage += amount
+		else:
+			return
+		self.version += 1
+		if self.on_change is not None:
+			self.on_change()
 
 
 @dataclass
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from enum import Enum
 
 from .inventory import Item
@@ -21,7 +21,7 @@ class ObjectiveType(Enum):
 	TALK_TO_NPC = "talk_to_npc"
 
 
-@dataclass
+@dataclass(slots=True)
 class QuestObjective:
 	id: str
 	description: str
@@ -43,7 +43,7 @@ class QuestObjective:
 		return False
 
 
-@dataclass
+@dataclass(slots=True)
 class QuestReward:
 	xp: int = 0
 	gold: int = 0
@@ -51,7 +51,7 @@ class QuestReward:
 	skill_points: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Quest:
 	id: str
 	name: str
@@ -69,11 +69,19 @@ class QuestLog:
 	active_quests: Dict[str, Quest] = field(default_factory=dict)
 	completed_quests: List[str] = field(default_factory=list)
 	failed_quests: List[str] = field(default_factory=list)
+	version: int = field(default=0, repr=False, compare=False)
+	on_change: Optional[Callable[[], None]] = field(default=None, repr=False, compare=False)
+	
+	def _changed(self) -> None:
+		self.version += 1
+		if self.on_change is not None:
+			self.on_change()
 	
 	def add_quest(self, quest: Quest) -> bool:
 		if quest.id in self.active_quests or quest.id in self.completed_quests:
 			return False
 		self.active_quests[quest.id] = quest
+		self._changed()
 		return True
 	
 	def complete_quest(self, quest_id: str) -> Optional[QuestReward]:
@@ -86,6 +94,7 @@ class QuestLog:
 		
 		self.completed_quests.append(quest_id)
 		del self.active_quests[quest_id]
+		self._changed()
 		return quest.rewards
 	
 	def update_objective(self, quest_id: str, objective_id: str, amount: int = 1) -> bool:
@@ -95,7 +104,9 @@ class QuestLog:
 		quest = self.active_quests[quest_id]
 		for objective in quest.objectives:
 			if objective.id == objective_id:
-				return objective.update_progress(amount)
+				completed = objective.update_progress(amount)
+				self._changed()
+				return completed
 		return False
 	
 	def get_quest_progress(self, quest_id: str) -> Optional[Dict[str, Any]]:
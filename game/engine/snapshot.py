@@ -0,0 +1,602 @@
+from __future__ import annotations
+
+import copy
+import struct
+from dataclasses import fields
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .stats import Stats
+from .chunks import ChunkedGrid, make_grid
+from .grid import Grid
+from .entities import Entity, Player, Monster, Merchant, Npc, Portal
+from .progression import Progression, WeaponSkills
+from .inventory import Item, Equipment, Consumable, Weapon, Inventory, EquipmentSlots
+from .quests import QuestLog, get_quest_by_id
+from .combat import CombatState, CombatArena, IntentLog
+
+
+# Container layout: MAGIC, u16 format version, u16 section count, then for each
+# section a 4-byte tag, u32 payload length and the payload. Every payload starts
+# with its own string table so sections can be decoded (and rewritten) alone.
+MAGIC = b"TDSV"
+FORMAT_VERSION = 2
+
+SECTION_PLAYER = "PLYR"
+SECTION_INVENTORY = "INVT"
+SECTION_EQUIPMENT = "EQUP"
+SECTION_QUESTS = "QLOG"
+SECTION_COMBAT = "CMBT"
+
+_HEADER = struct.Struct("<4sHH")
+_SECTION = struct.Struct("<4sI")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_POS = struct.Struct("<ii")
+_STATS = struct.Struct("<8i")
+_SKILLS = struct.Struct("<3i")
+_ITEM = struct.Struct("<BdiBii")
+_OBJECTIVE = struct.Struct("<iB")
+_COMBAT = struct.Struct("<iiiBBB")
+_TURN = struct.Struct("<ii")
+_ARENA = struct.Struct("<6i")
+
+_KIND_ITEM = 0
+_KIND_EQUIPMENT = 1
+_KIND_CONSUMABLE = 2
+_KIND_WEAPON = 3
+
+_ENTITY_MONSTER = 0
+_ENTITY_MERCHANT = 1
+_ENTITY_NPC = 2
+_ENTITY_PORTAL = 3
+_ENTITY_PLAIN = 4
+
+_NONE = 0xFFFFFFFF
+
+
+class SnapshotWriter:
+	def __init__(self) -> None:
+		self._body = bytearray()
+		self._index: Dict[str, int] = {}
+		self._strings: List[str] = []
+
+	def u8(self, value: int) -> None:
+		self._body += _U8.pack(value)
+
+	def u32(self, value: int) -> None:
+		self._body += _U32.pack(value)
+
+	def i32(self, value: int) -> None:
+		self._body += _I32.pack(value)
+
+	def i64(self, value: int) -> None:
+		self._body += _I64.pack(value)
+
+	def f64(self, value: float) -> None:
+		self._body += _F64.pack(value)
+
+	def pack(self, record: struct.Struct, *values) -> None:
+		self._body += record.pack(*values)
+
+	def raw(self, data: bytes) -> None:
+		self.u32(len(data))
+		self._body += data
+
+	def ref(self, value: str) -> int:
+		idx = self._index.get(value)
+		if idx is None:
+			idx = len(self._strings)
+			self._index[value] = idx
+			self._strings.append(value)
+		return idx
+
+	def string(self, value: str) -> None:
+		self._body += _U32.pack(self.ref(value))
+
+	def opt_string(self, value: Optional[str]) -> None:
+		self._body += _U32.pack(_NONE if value is None else self.ref(value))
+
+	def strings(self, values: Iterable[str]) -> None:
+		refs = [self.ref(v) for v in values]
+		self._body += _U32.pack(len(refs))
+		self._body += struct.pack(f"<{len(refs)}I", *refs)
+
+	def getvalue(self) -> bytes:
+		out = bytearray(_U32.pack(len(self._strings)))
+		for s in self._strings:
+			data = s.encode("utf-8")
+			out += _U16.pack(len(data)) if len(data) < 0xFFFF else _U16.pack(0xFFFF) + _U32.pack(len(data))
+			out += data
+		out += self._body
+		return bytes(out)
+
+
+class SnapshotReader:
+	def __init__(self, data: bytes) -> None:
+		self._data = memoryview(data)
+		self._pos = 0
+		count = self.u32()
+		strings: List[str] = []
+		for _ in range(count):
+			length = self.unpack(_U16)[0]
+			if length == 0xFFFF:
+				length = self.u32()
+			start = self._pos
+			self._pos += length
+			strings.append(str(self._data[start:self._pos], "utf-8"))
+		self._strings = strings
+
+	def unpack(self, record: struct.Struct) -> tuple:
+		values = record.unpack_from(self._data, self._pos)
+		self._pos += record.size
+		return values
+
+	def u8(self) -> int:
+		return self.unpack(_U8)[0]
+
+	def u32(self) -> int:
+		return self.unpack(_U32)[0]
+
+	def i32(self) -> int:
+		return self.unpack(_I32)[0]
+
+	def i64(self) -> int:
+		return self.unpack(_I64)[0]
+
+	def f64(self) -> float:
+		return self.unpack(_F64)[0]
+
+	def raw(self) -> bytes:
+		length = self.u32()
+		start = self._pos
+		self._pos += length
+		return bytes(self._data[start:self._pos])
+
+	def string(self) -> str:
+		return self._strings[self.u32()]
+
+	def opt_string(self) -> Optional[str]:
+		idx = self.u32()
+		return None if idx == _NONE else self._strings[idx]
+
+	def strings(self) -> List[str]:
+		count = self.u32()
+		refs = struct.unpack_from(f"<{count}I", self._data, self._pos)
+		self._pos += 4 * count
+		table = self._strings
+		return [table[i] for i in refs]
+
+
+def pack_sections(sections: Dict[str, bytes]) -> bytes:
+	out = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections)))
+	for tag, payload in sections.items():
+		out += _SECTION.pack(_tag_bytes(tag), len(payload))
+		out += payload
+	return bytes(out)
+
+
+def unpack_sections(data: bytes) -> Dict[str, bytes]:
+	if len(data) < _HEADER.size:
+		raise ValueError("Invalid snapshot: truncated header")
+	magic, version, count = _HEADER.unpack_from(data, 0)
+	if magic != MAGIC:
+		raise ValueError("Invalid snapshot: bad magic")
+	if version != FORMAT_VERSION:
+		raise ValueError(f"Unsupported snapshot version {version}")
+	pos = _HEADER.size
+	sections: Dict[str, bytes] = {}
+	for _ in range(count):
+		tag, length = _SECTION.unpack_from(data, pos)
+		pos += _SECTION.size
+		if pos + length > len(data):
+			raise ValueError(f"Invalid snapshot: section {tag!r} truncated")
+		sections[tag.decode("ascii")] = bytes(data[pos:pos + length])
+		pos += length
+	return sections
+
+
+def _tag_bytes(tag: str) -> bytes:
+	raw = tag.encode("ascii")
+	if len(raw) != 4:
+		raise ValueError(f"Section tag must be 4 ASCII characters: {tag!r}")
+	return raw
+
+
+def write_stats(w: SnapshotWriter, stats: Stats) -> None:
+	w.pack(_STATS, stats.hp, stats.ap, stats.mp, stats.atk, stats.res, stats.current_hp, stats.current_mp, stats.armor)
+
+
+def read_stats(r: SnapshotReader) -> Stats:
+	hp, ap, mp, atk, res, current_hp, current_mp, armor = r.unpack(_STATS)
+	stats = Stats(hp=hp, ap=ap, mp=mp, atk=atk, res=res, armor=armor)
+	# __post_init__ refills zeroed pools, so restore the saved values verbatim
+	stats.current_hp = current_hp
+	stats.current_mp = current_mp
+	return stats
+
+
+def write_grid(w: SnapshotWriter, grid: Grid | ChunkedGrid) -> None:
+	w.pack(_POS, grid.width, grid.height)
+	mask = bytearray((grid.width * grid.height + 7) // 8)
+	outside: List[Tuple[int, int]] = []
+	for x, y in grid.blocked:
+		if grid.in_bounds(x, y):
+			i = y * grid.width + x
+			mask[i >> 3] |= 1 << (i & 7)
+		else:
+			outside.append((x, y))
+	w.raw(bytes(mask))
+	w.u32(len(outside))
+	for c in outside:
+		w.pack(_POS, *c)
+
+
+def read_grid(r: SnapshotReader) -> Grid | ChunkedGrid:
+	width, height = r.unpack(_POS)
+	mask = r.raw()
+	blocked: Set[Tuple[int, int]] = set()
+	for byte_idx, byte in enumerate(mask):
+		if not byte:
+			continue
+		base = byte_idx << 3
+		for bit in range(8):
+			if byte & (1 << bit):
+				i = base + bit
+				blocked.add((i % width, i // width))
+	for _ in range(r.u32()):
+		blocked.add(r.unpack(_POS))
+	return make_grid(width, height, blocked)
+
+
+def write_entity(w: SnapshotWriter, entity: Entity) -> None:
+	if isinstance(entity, Monster):
+		w.u8(_ENTITY_MONSTER)
+	elif isinstance(entity, Merchant):
+		w.u8(_ENTITY_MERCHANT)
+	elif isinstance(entity, Npc):
+		w.u8(_ENTITY_NPC)
+	elif isinstance(entity, Portal):
+		w.u8(_ENTITY_PORTAL)
+	else:
+		w.u8(_ENTITY_PLAIN)
+	w.string(entity.id)
+	w.string(entity.name)
+	write_stats(w, entity.stats)
+	w.pack(_POS, *entity.position)
+	w.strings(sorted(entity.tags))
+	if isinstance(entity, Monster):
+		w.strings(entity.abilities)
+		w.pack(_TURN, entity.combat_ap, entity.combat_mp)
+	elif isinstance(entity, Merchant):
+		w.string(entity.shop_id)
+	elif isinstance(entity, Npc):
+		w.string(entity.dialogue_id)
+	elif isinstance(entity, Portal):
+		w.string(entity.destination_id)
+		w.string(entity.kind)
+		w.string(entity.state)
+
+
+def read_entity(r: SnapshotReader) -> Entity:
+	kind = r.u8()
+	common = dict(
+		id=r.string(),
+		name=r.string(),
+		stats=read_stats(r),
+		position=r.unpack(_POS),
+		tags=set(r.strings()),
+	)
+	if kind == _ENTITY_MONSTER:
+		abilities = r.strings()
+		combat_ap, combat_mp = r.unpack(_TURN)
+		return Monster(**common, abilities=abilities, combat_ap=combat_ap, combat_mp=combat_mp)
+	if kind == _ENTITY_MERCHANT:
+		return Merchant(**common, shop_id=r.string())
+	if kind == _ENTITY_NPC:
+		return Npc(**common, dialogue_id=r.string())
+	if kind == _ENTITY_PORTAL:
+		return Portal(**common, destination_id=r.string(), kind=r.string(), state=r.string())
+	if kind == _ENTITY_PLAIN:
+		return Entity(**common)
+	raise ValueError(f"Invalid snapshot: unknown entity kind {kind}")
+
+
+def write_entities(w: SnapshotWriter, entities: Iterable[Entity]) -> None:
+	entities = list(entities)
+	w.u32(len(entities))
+	for e in entities:
+		write_entity(w, e)
+
+
+def read_entities(r: SnapshotReader) -> List[Entity]:
+	return [read_entity(r) for _ in range(r.u32())]
+
+
+def write_item(w: SnapshotWriter, item: Item) -> None:
+	if isinstance(item, Weapon):
+		kind = _KIND_WEAPON
+	elif isinstance(item, Equipment):
+		kind = _KIND_EQUIPMENT
+	elif isinstance(item, Consumable):
+		kind = _KIND_CONSUMABLE
+	else:
+		kind = _KIND_ITEM
+	w.pack(_ITEM, kind, item.weight, item.value, item.stackable, item.max_stack, item.quantity)
+	w.string(item.id)
+	w.string(item.name)
+	w.string(item.description)
+	if kind == _KIND_WEAPON:
+		w.string(item.weapon_type)
+		w.i32(item.base_damage)
+		w.strings(item.abilities)
+	elif kind == _KIND_EQUIPMENT:
+		w.string(item.slot)
+		write_stats(w, item.stats_bonus)
+	elif kind == _KIND_CONSUMABLE:
+		w.string(item.effect_type)
+		w.i32(item.effect_value)
+
+
+def read_item(r: SnapshotReader) -> Item:
+	kind, weight, value, stackable, max_stack, quantity = r.unpack(_ITEM)
+	common = dict(
+		id=r.string(),
+		name=r.string(),
+		description=r.string(),
+		weight=weight,
+		value=value,
+		stackable=bool(stackable),
+		max_stack=max_stack,
+		quantity=quantity,
+	)
+	if kind == _KIND_WEAPON:
+		return Weapon(**common, weapon_type=r.string(), base_damage=r.i32(), abilities=r.strings())
+	if kind == _KIND_EQUIPMENT:
+		return Equipment(**common, slot=r.string(), stats_bonus=read_stats(r))
+	if kind == _KIND_CONSUMABLE:
+		return Consumable(**common, effect_type=r.string(), effect_value=r.i32())
+	if kind == _KIND_ITEM:
+		return Item(**common)
+	raise ValueError(f"Invalid snapshot: unknown item kind {kind}")
+
+
+def _write_opt_item(w: SnapshotWriter, item: Optional[Item]) -> None:
+	if item is None:
+		w.u8(0)
+		return
+	w.u8(1)
+	write_item(w, item)
+
+
+def _read_opt_item(r: SnapshotReader) -> Optional[Item]:
+	return read_item(r) if r.u8() else None
+
+
+def encode_player(player: Player) -> bytes:
+	w = SnapshotWriter()
+	w.string(player.id)
+	w.string(player.name)
+	write_stats(w, player.stats)
+	w.pack(_POS, *player.position)
+	w.strings(sorted(player.tags))
+	skills = player.progression.weapon_skills
+	w.pack(_SKILLS, skills.melee_damage, skills.ranged_damage, skills.magic_damage)
+	w.opt_string(player.progression.equipped_weapon)
+	w.i64(player.gold)
+	return w.getvalue()
+
+
+def decode_player(data: bytes, inventory: Inventory, equipment: EquipmentSlots, quest_log: QuestLog) -> Player:
+	r = SnapshotReader(data)
+	player_id = r.string()
+	name = r.string()
+	stats = read_stats(r)
+	position = r.unpack(_POS)
+	tags = set(r.strings())
+	melee, ranged, magic = r.unpack(_SKILLS)
+	equipped = r.opt_string()
+	gold = r.i64()
+	return Player(
+		id=player_id,
+		name=name,
+		stats=stats,
+		position=position,
+		tags=tags,
+		progression=Progression(
+			weapon_skills=WeaponSkills(melee_damage=melee, ranged_damage=ranged, magic_damage=magic),
+			equipped_weapon=equipped,
+		),
+		inventory=inventory,
+		equipment=equipment,
+		quest_log=quest_log,
+		gold=gold,
+	)
+
+
+def _item_template_key(item: Item) -> tuple:
+	key = (type(item), item.id, item.name, item.description, item.weight, item.value, item.stackable, item.max_stack)
+	if isinstance(item, Weapon):
+		return key + (item.weapon_type, item.base_damage, tuple(item.abilities))
+	if isinstance(item, Equipment):
+		s = item.stats_bonus
+		return key + (item.slot, s.hp, s.ap, s.mp, s.atk, s.res, s.current_hp, s.current_mp, s.armor)
+	if isinstance(item, Consumable):
+		return key + (item.effect_type, item.effect_value)
+	return key
+
+
+def encode_inventory(inventory: Inventory) -> bytes:
+	# Stacks of the same item share one template record; each stack is then (template, quantity)
+	w = SnapshotWriter()
+	w.f64(inventory.total_weight)
+	w.f64(inventory.max_weight)
+	templates: Dict[tuple, int] = {}
+	template_items: List[Item] = []
+	stacks: List[int] = []
+	for item in inventory.items:
+		key = _item_template_key(item)
+		idx = templates.get(key)
+		if idx is None:
+			idx = len(template_items)
+			templates[key] = idx
+			template_items.append(item)
+		stacks.append(idx)
+		stacks.append(item.quantity)
+	w.u32(len(template_items))
+	for item in template_items:
+		write_item(w, item)
+	w.u32(len(inventory.items))
+	w.pack(struct.Struct(f"<{len(stacks)}i"), *stacks)
+	return w.getvalue()
+
+
+def decode_inventory(data: bytes) -> Inventory:
+	r = SnapshotReader(data)
+	total_weight = r.f64()
+	max_weight = r.f64()
+	templates = []
+	for _ in range(r.u32()):
+		item = read_item(r)
+		templates.append((type(item), {f.name: getattr(item, f.name) for f in fields(item)}))
+	count = r.u32()
+	stacks = r.unpack(struct.Struct(f"<{2 * count}i"))
+	items: List[Item] = []
+	for i in range(0, 2 * count, 2):
+		cls, kwargs = templates[stacks[i]]
+		item = cls(**kwargs)
+		item.quantity = stacks[i + 1]
+		if cls is Weapon:
+			item.abilities = list(item.abilities)
+		items.append(item)
+	return Inventory(items=items, total_weight=total_weight, max_weight=max_weight)
+
+
+def encode_equipment(equipment: EquipmentSlots) -> bytes:
+	w = SnapshotWriter()
+	for item in (equipment.weapon, equipment.armor, equipment.helmet, equipment.boots):
+		_write_opt_item(w, item)
+	return w.getvalue()
+
+
+def decode_equipment(data: bytes) -> EquipmentSlots:
+	r = SnapshotReader(data)
+	return EquipmentSlots(
+		weapon=_read_opt_item(r),
+		armor=_read_opt_item(r),
+		helmet=_read_opt_item(r),
+		boots=_read_opt_item(r),
+	)
+
+
+def encode_quest_log(quest_log: QuestLog) -> bytes:
+	# Quest definitions live in the QUESTS catalog; only per-objective progress is stored
+	w = SnapshotWriter()
+	w.u32(len(quest_log.active_quests))
+	for quest_id, quest in quest_log.active_quests.items():
+		w.string(quest_id)
+		w.u32(len(quest.objectives))
+		for obj in quest.objectives:
+			w.string(obj.id)
+			w.pack(_OBJECTIVE, obj.current_amount, obj.completed)
+	w.strings(quest_log.completed_quests)
+	w.strings(quest_log.failed_quests)
+	return w.getvalue()
+
+
+def decode_quest_log(data: bytes) -> QuestLog:
+	r = SnapshotReader(data)
+	quest_log = QuestLog()
+	for _ in range(r.u32()):
+		quest_id = r.string()
+		template = get_quest_by_id(quest_id)
+		if template is None:
+			raise ValueError(f"Invalid snapshot: unknown quest {quest_id}")
+		quest = copy.deepcopy(template)
+		objectives = {obj.id: obj for obj in quest.objectives}
+		for _ in range(r.u32()):
+			obj_id = r.string()
+			current, completed = r.unpack(_OBJECTIVE)
+			obj = objectives.get(obj_id)
+			if obj is not None:
+				obj.current_amount = current
+				obj.completed = bool(completed)
+		quest_log.active_quests[quest_id] = quest
+	quest_log.completed_quests = r.strings()
+	quest_log.failed_quests = r.strings()
+	return quest_log
+
+
+def encode_combat(combat_state: Optional[CombatState]) -> bytes:
+	w = SnapshotWriter()
+	if combat_state is None:
+		w.u8(0)
+		return w.getvalue()
+	w.u8(1)
+	cs = combat_state
+	w.pack(
+		_COMBAT,
+		cs.current_turn,
+		cs.player_ap,
+		cs.player_mp,
+		cs.is_active,
+		cs.can_move,
+		cs.can_cast,
+	)
+	w.string(cs.current_phase)
+	a = cs.arena
+	w.pack(_ARENA, a.width, a.height, a.player_start[0], a.player_start[1], a.monster_start[0], a.monster_start[1])
+	write_grid(w, cs.combat_grid)
+	write_entities(w, cs.monsters)
+	return w.getvalue()
+
+
+def decode_combat(data: bytes, player: Player, log: IntentLog) -> Optional[CombatState]:
+	r = SnapshotReader(data)
+	if not r.u8():
+		return None
+	turn, player_ap, player_mp, is_active, can_move, can_cast = r.unpack(_COMBAT)
+	phase = r.string()
+	aw, ah, psx, psy, msx, msy = r.unpack(_ARENA)
+	grid = read_grid(r)
+	monsters = [e for e in read_entities(r) if isinstance(e, Monster)]
+	return CombatState(
+		player=player,
+		monsters=monsters,
+		current_turn=turn,
+		player_ap=player_ap,
+		player_mp=player_mp,
+		log=log,
+		arena=CombatArena(width=aw, height=ah, player_start=(psx, psy), monster_start=(msx, msy)),
+		combat_grid=grid,
+		is_active=bool(is_active),
+		current_phase=phase,
+		can_move=bool(can_move),
+		can_cast=bool(can_cast),
+	)
+
+
+def encode_player_sections(player: Player) -> Dict[str, bytes]:
+	return {
+		SECTION_PLAYER: encode_player(player),
+		SECTION_INVENTORY: encode_inventory(player.inventory),
+		SECTION_EQUIPMENT: encode_equipment(player.equipment),
+		SECTION_QUESTS: encode_quest_log(player.quest_log),
+	}
+
+
+def decode_player_sections(sections: Dict[str, bytes]) -> Player:
+	try:
+		return decode_player(
+			sections[SECTION_PLAYER],
+			decode_inventory(sections[SECTION_INVENTORY]),
+			decode_equipment(sections[SECTION_EQUIPMENT]),
+			decode_quest_log(sections[SECTION_QUESTS]),
+		)
+	except KeyError as e:
+		raise ValueError(f"Invalid snapshot: missing section {e.args[0]}")
+	except struct.error as e:
+		raise ValueError(f"Invalid snapshot: {e}")
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Stats:
 	hp: int
 	ap: int
@@ -38,4 +38,11 @@ class Stats:
 	def is_alive(self) -> bool:
 		return self.current_hp > 0
 
+	# New base values (from reloaded content), keeping the damage already taken
+	def rebase(self, hp: int, ap: int, mp: int, atk: int, res: int) -> None:
+		if self.current_hp > 0:
+			self.current_hp = max(1, hp - (self.hp - self.current_hp))
+		self.current_mp = min(mp, self.current_mp)
+		self.hp, self.ap, self.mp, self.atk, self.res = hp, ap, mp, atk, res
+
 
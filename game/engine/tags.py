@@ -1,26 +1,88 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Iterable, Set
+from dataclasses import InitVar, dataclass, field
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Union
 
 
-@dataclass
+# Tag names are interned to bit positions the first time they are seen (content
+# load, in practice); entities and abilities carry an int mask so tag checks are a
+# single bitwise test. Bits are never reassigned, so a mask stays valid for the
+# life of the process.
+TAG_BITS: Dict[str, int] = {}
+TAG_NAMES: List[str] = []
+
+
+def tag_bit(name: str) -> int:
+	bit = TAG_BITS.get(name)
+	if bit is None:
+		bit = TAG_BITS[name] = 1 << len(TAG_NAMES)
+		TAG_NAMES.append(name)
+	return bit
+
+
+def tag_mask(names: Iterable[str]) -> int:
+	mask = 0
+	for name in names:
+		mask |= tag_bit(name)
+	return mask
+
+
+@lru_cache(maxsize=1024)
+def tag_names(mask: int) -> FrozenSet[str]:
+	return frozenset(name for i, name in enumerate(TAG_NAMES) if mask >> i & 1)
+
+
+TagsLike = Union[int, Iterable[str]]
+
+
+# For queries: names never interned cannot be set on anything, so they map to 0
+# instead of taking a bit.
+def as_mask(tags: TagsLike) -> int:
+	if isinstance(tags, int):
+		return tags
+	mask = 0
+	for name in tags:
+		mask |= TAG_BITS.get(name, 0)
+	return mask
+
+
+MELEE = tag_bit("melee")
+RANGED = tag_bit("ranged")
+BOSS = tag_bit("boss")
+
+
+# `tags` is an init-only argument and a read-only string view; what is stored is
+# the mask, so slotted subclasses carry one int instead of a set. The view is
+# installed after the dataclass is built so it does not become a field.
+@dataclass(slots=True)
 class TaggableMixin:
-	tags: Set[str] = field(default_factory=set, kw_only=True)
+	tag_mask: int = field(default=0, kw_only=True)
+	tags: InitVar[Optional[Iterable[str]]] = field(default=None, kw_only=True)
+
+	def __post_init__(self, tags: Optional[Iterable[str]]) -> None:
+		if tags is not None:
+			self.tag_mask = tag_mask(tags)
 
 	def has_tag(self, tag: str) -> bool:
-		return tag in self.tags
+		return bool(self.tag_mask & TAG_BITS.get(tag, 0))
 
-	def has_any(self, tags: Iterable[str]) -> bool:
-		for t in tags:
-			if t in self.tags:
-				return True
-		return False
+	def has_any(self, tags: TagsLike) -> bool:
+		return bool(self.tag_mask & as_mask(tags))
 
 
-def damage_multiplier_for_target(target_tags: Set[str]) -> float:
-	if "boss" in target_tags:
-		return 1.1
-	return 1.0
+def _get_tags(self: TaggableMixin) -> FrozenSet[str]:
+	return tag_names(self.tag_mask)
+
 
+def _set_tags(self: TaggableMixin, names: Iterable[str]) -> None:
+	self.tag_mask = tag_mask(names)
 
+
+TaggableMixin.tags = property(_get_tags, _set_tags)  # type: ignore[assignment]
+
+
+def damage_multiplier_for_target(target_tags: TagsLike) -> float:
+	if as_mask(target_tags) & BOSS:
+		return 1.1
+	return 1.0
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .ability import Ability
+from .combat import has_line_of_sight
+from .grid import Grid
+from .tags import MELEE, RANGED
+
+
+Coord = Tuple[int, int]
+
+
+@lru_cache(maxsize=None)
+def ring_offsets(radius: int) -> Tuple[Coord, ...]:
+	if radius == 0:
+		return ((0, 0),)
+	offsets: List[Coord] = []
+	for dx in range(-radius, radius + 1):
+		dy = radius - abs(dx)
+		offsets.append((dx, dy))
+		if dy:
+			offsets.append((dx, -dy))
+	return tuple(offsets)
+
+
+# Legal target cells of one ability from one caster cell: bit y * width + x is set
+# when the cell is in bounds, walkable, within range and (for ranged) in sight.
+# Close-quarters melee (range_max <= 1) needs an adjacent target, never the caster's
+# own cell, whatever its range_min.
+@dataclass(frozen=True)
+class CastOverlay:
+	width: int
+	bits: int
+	cells: Tuple[Coord, ...]
+
+	def contains(self, pos: Coord) -> bool:
+		x, y = pos
+		if x < 0 or y < 0 or x >= self.width:
+			return False
+		return bool(self.bits >> (y * self.width + x) & 1)
+
+	def __len__(self) -> int:
+		return len(self.cells)
+
+
+def compute_overlay(grid: Grid, ability: Ability, src: Coord) -> CastOverlay:
+	sx, sy = src
+	ranged = ability.tag_mask & RANGED
+	first = ability.range_min
+	if ability.tag_mask & MELEE and ability.range_max <= 1:
+		first = max(1, first)
+	bits = 0
+	cells: List[Coord] = []
+	for radius in range(first, ability.range_max + 1):
+		for dx, dy in ring_offsets(radius):
+			x = sx + dx
+			y = sy + dy
+			if not grid.walkable(x, y):
+				continue
+			if ranged and not has_line_of_sight(grid, src, (x, y)):
+				continue
+			bits |= 1 << (y * grid.width + x)
+			cells.append((x, y))
+	return CastOverlay(width=grid.width, bits=bits, cells=tuple(cells))
+
+
+EMPTY_OVERLAY = CastOverlay(width=0, bits=0, cells=())
+
+
+# Overlays for the abilities on the player's bar, rebuilt only when the grid, caster
+# cell, remaining AP or the bar itself changes.
+@dataclass
+class OverlayCache:
+	key: Optional[tuple] = None
+	grid: Optional[Grid] = field(default=None, repr=False)
+	overlays: Dict[str, CastOverlay] = field(default_factory=dict)
+	rebuilds: int = 0
+
+	def refresh(self, grid: Grid, src: Coord, ap: int, abilities: Sequence[Ability]) -> Dict[str, CastOverlay]:
+		key = (src, ap, tuple(ab.id for ab in abilities))
+		if grid is self.grid and key == self.key:
+			return self.overlays
+		self.grid = grid
+		self.key = key
+		self.overlays = {
+			ab.id: compute_overlay(grid, ab, src) if ab.cost_ap <= ap else EMPTY_OVERLAY
+			for ab in abilities
+		}
+		self.rebuilds += 1
+		return self.overlays
+
+	# Abilities changed under the same ids (content reload)
+	def invalidate(self) -> None:
+		self.key = None
@@ -0,0 +1,40 @@
+from game.app.game_loop import load_content_and_init, start_combat
+from game.engine.ai import AiWorker, SearchPolicy, execute_monster_plans, plan_monster_phase
+from game.engine.combat import end_combat_turn
+from game.engine.combat_sim import snapshot_combat
+
+
+def make_combat():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0])
+	return state.combat_state
+
+
+def test_monster_attacks_from_range_within_budget():
+	cs = make_combat()
+	monster = cs.monsters[0]
+	cs.player.position = (monster.position[0] - 3, monster.position[1])
+	cs.ai_policy = SearchPolicy(budget_ms=50.0)
+	hp = cs.player.stats.current_hp
+	end_combat_turn(cs)
+
+	report = cs.ai_policy.last_report
+	assert cs.player.stats.current_hp < hp
+	assert cs.current_phase == "player_turn"
+	assert 0 < report.nodes and report.depth >= 1
+	assert report.elapsed_ms < report.budget_ms + 25.0
+
+
+def test_worker_plan_matches_inline_plan():
+	cs = make_combat()
+	cs.current_phase = "monster_turn"
+	policy = SearchPolicy(budget_ms=1000.0, max_depth=4)
+	inline = plan_monster_phase(policy, snapshot_combat(cs))
+	worker = AiWorker(policy)
+	cs.ai_policy = policy
+	plans = worker.submit(cs).result(timeout=5)
+	worker.shutdown()
+	assert plans == inline
+
+	execute_monster_plans(cs, plans)
+	assert cs.current_phase == "player_turn"
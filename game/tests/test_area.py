@@ -0,0 +1,42 @@
+from game.app.game_loop import load_content_and_init, start_combat
+from game.engine.ability import REGISTRY, Ability
+from game.engine.area import shape_offsets
+from game.engine.combat import area_cells, resolve_ability_effects
+from game.engine.combat_sim import Cast, apply, snapshot_combat
+from game.engine.effects import Damage
+from game.engine.grid import Grid
+
+
+def test_shape_tables_are_cached_and_oriented():
+	assert len(shape_offsets("cross", 2)) == 9
+	assert len(shape_offsets("circle", 1)) == 5
+	assert shape_offsets("line", 2, (0, 1)) == ((0, 0), (0, 1), (0, 2))
+	assert sorted(shape_offsets("cone", 1, (-1, 0))) == [(-1, -1), (-1, 0), (-1, 1), (0, 0)]
+	assert shape_offsets("circle", 3) is shape_offsets("circle", 3)
+
+
+def test_area_respects_walls_and_line_of_sight():
+	grid = Grid(width=9, height=9, blocked={(5, 4)})
+	blast = Ability(id="blast", name="Blast", tags=["ranged"], cost_ap=1, range_min=1, range_max=6, effects=[Damage(amount=1)], area_shape="cross", area_size=2)
+	cells = area_cells(grid, blast, (0, 4), (4, 4))
+	assert (5, 4) not in cells and (6, 4) not in cells
+	assert (3, 4) in cells and (4, 2) in cells
+
+
+def test_fireball_hits_the_pack_like_the_simulator():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0], size=5)
+	cs = state.combat_state
+	fireball = REGISTRY["fireball"]
+	for m in cs.monsters:
+		m.stats.hp = m.stats.current_hp = 500
+	center = cs.monsters[0].position
+	cs.player.position = (center[0] - 3, center[1])
+	expected = {m.position for m in cs.monsters if abs(m.position[0] - center[0]) + abs(m.position[1] - center[1]) <= 1}
+	assert len(expected) > 1
+	snap = apply(snapshot_combat(cs), Cast(0, "fireball", center))
+
+	resolve_ability_effects(fireball, cs.player, center, cs)
+
+	assert {m.position for m in cs.monsters if m.stats.current_hp < 500} == expected
+	assert list(snap.hp[1:]) == [m.stats.current_hp for m in cs.monsters]
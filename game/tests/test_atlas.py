@@ -0,0 +1,21 @@
+import pygame
+
+from game.app.ui.atlas import SPRITES, atlas_for, blit_sorted
+
+
+def test_sprites_are_centred_on_their_tile():
+	atlas = atlas_for(64, 24, 1.0)
+	screen = pygame.Surface((200, 120))
+	for kind, (color, _, _, _) in SPRITES.items():
+		screen.fill((0, 0, 40))
+		blit_sorted(screen, [((0, 0, 0), atlas.draw(kind, 40, 30))])
+		assert tuple(screen.get_at((40 + 32, 30 + 12)))[:3] == color
+
+
+def test_nearer_entities_are_drawn_last():
+	atlas = atlas_for(64, 24, 1.0)
+	screen = pygame.Surface((200, 120))
+	far = ((3, 0, 0), atlas.draw("player", 40, 30))
+	near = ((5, 3, 0), atlas.draw("monster", 40, 30))
+	blit_sorted(screen, [near, far])
+	assert tuple(screen.get_at((72, 42)))[:3] == SPRITES["monster"][0]
@@ -0,0 +1,51 @@
+from game.app.game_loop import build_grid_from_map
+from game.engine.chunks import CHUNK, ChunkDirectory, ChunkedGrid, make_grid
+from game.engine.combat import has_line_of_sight
+from game.engine.content import MapModel
+from game.engine.grid import Grid
+from game.engine.snapshot import SnapshotReader, SnapshotWriter, read_grid, write_grid
+
+
+def _wall_across_boundary():
+	# A vertical wall on the first column of the second chunk, with one gap
+	return [(CHUNK, y) for y in range(0, 100) if y != 40]
+
+
+def test_chunked_grid_matches_grid_across_boundaries():
+	blocked = _wall_across_boundary()
+	plain = Grid(width=100, height=100, blocked=set(blocked))
+	chunked = ChunkedGrid.from_blocked(100, 100, blocked, capacity=4)
+	for y in range(100):
+		for x in range(-1, 101):
+			assert chunked.walkable(x, y) == plain.walkable(x, y)
+	assert set(chunked.blocked) == plain.blocked
+	assert (CHUNK, 3) in chunked.blocked
+	assert not has_line_of_sight(chunked, (CHUNK - 2, 10), (CHUNK + 2, 10))
+	assert has_line_of_sight(chunked, (CHUNK - 2, 40), (CHUNK + 2, 40))
+	assert sorted(chunked.blocked_in(CHUNK, 38, CHUNK, 42)) == [(CHUNK, 38), (CHUNK, 39), (CHUNK, 41), (CHUNK, 42)]
+
+
+def test_resident_chunks_stay_bounded_and_edits_survive_eviction(tmp_path):
+	source = ChunkDirectory(tmp_path)
+	grid = ChunkedGrid(4096, 4096, source, capacity=9)
+	grid.add_blocked([(5, 5)])
+	for x in range(0, 4096, 7):
+		grid.stream_around((x, x), radius=1)
+		assert len(grid.resident) <= 9
+	assert grid.evictions > 0
+	assert (tmp_path / "chunk_0_0.z").exists()
+	assert grid.is_blocked(5, 5)
+	assert not grid.is_blocked(6, 5)
+
+
+def test_large_maps_and_snapshots_load_chunked():
+	model = MapModel(name="wide", width=512, height=512, blocked=[{"x": 300, "y": 7}])
+	grid = build_grid_from_map(model)
+	assert isinstance(grid, ChunkedGrid)
+	assert grid.is_blocked(300, 7)
+	assert isinstance(make_grid(40, 20, []), Grid)
+	w = SnapshotWriter()
+	write_grid(w, grid)
+	restored = read_grid(SnapshotReader(w.getvalue()))
+	assert isinstance(restored, ChunkedGrid)
+	assert list(restored.blocked) == [(300, 7)]
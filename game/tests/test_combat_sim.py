@@ -0,0 +1,44 @@
+from game.app.game_loop import load_content_and_init, start_combat
+from game.engine.combat import resolve_ability_effects
+from game.engine.ability import REGISTRY
+from game.engine.combat_sim import Cast, EndTurn, Move, apply, legal_actions, snapshot_combat
+
+
+def make_combat():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0])
+	return state.combat_state
+
+
+def test_apply_returns_new_snapshot_and_shares_static_parts():
+	cs = make_combat()
+	snap = snapshot_combat(cs)
+	moves = [a for a in legal_actions(snap) if isinstance(a, Move)]
+	nxt = apply(snap, moves[0])
+
+	assert snap.positions[0] == cs.player.position
+	assert nxt.positions[0] == moves[0].dest
+	assert nxt.mp[0] == snap.mp[0] - 1
+	assert nxt.grid is snap.grid and nxt.roster is snap.roster
+	assert nxt.hp is snap.hp
+
+
+def test_cast_matches_live_resolution():
+	cs = make_combat()
+	monster = cs.monsters[0]
+	cs.player.position = (monster.position[0] - 1, monster.position[1])
+	snap = snapshot_combat(cs)
+
+	nxt = apply(snap, Cast(0, "slash", monster.position))
+	resolve_ability_effects(REGISTRY["slash"], cs.player, monster.position, cs)
+
+	assert nxt.hp[1] == monster.stats.current_hp
+	assert nxt.ap[0] == cs.player_ap
+
+
+def test_end_turn_refills_next_actor():
+	cs = make_combat()
+	snap = snapshot_combat(cs)._replace(ap=(0, 0), mp=(0, 0))
+	nxt = apply(snap, EndTurn(0))
+	assert nxt.active == 1
+	assert nxt.ap[1] == cs.monsters[0].stats.ap
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from game.app.game_loop import CONTENT_DIR, build_grid_from_map
+from game.engine.chunks import ChunkedGrid
+from game.engine.content import MapModel, load_abilities, load_catalog, load_map, load_monsters, load_spells
+from game.engine.grid import Grid
+
+
+def test_map_walls_decode_to_mask_matching_file():
+	path = CONTENT_DIR / "maps" / "zone_001.json"
+	raw = json.loads(path.read_text())
+	model = load_map(path)
+	expected = {(c["x"], c["y"]) for c in raw["blocked"]}
+	assert set(model.blocked_cells()) == expected
+	assert all(model.is_blocked(x, y) for x, y in expected)
+	assert not model.is_blocked(-1, 0)
+	grid = build_grid_from_map(model)
+	assert isinstance(grid, Grid)
+	assert grid.blocked == expected
+
+
+def test_large_map_builds_chunked_grid_from_mask():
+	blocked = [(x, 5) for x in range(0, 300, 3)] + [(299, 299)]
+	model = MapModel(name="big", width=300, height=300, blocked=[{"x": x, "y": y} for x, y in blocked])
+	grid = build_grid_from_map(model)
+	assert isinstance(grid, ChunkedGrid)
+	assert set(grid.blocked) == set(blocked)
+
+
+def test_bad_content_still_reports_file(tmp_path):
+	bad_map = tmp_path / "bad.json"
+	bad_map.write_text(json.dumps({"name": "bad", "width": 4, "height": 4, "blocked": [{"x": 9, "y": 0}]}))
+	with pytest.raises(ValueError, match="Invalid map at .*bad.json"):
+		load_map(bad_map)
+	bad_spells = tmp_path / "spells.json"
+	bad_spells.write_text(json.dumps([{"id": "x", "name": "X", "tags": [], "cost_ap": 1, "range_max": 1, "effects": [], "area": {"shape": "blob"}}]))
+	with pytest.raises(ValueError, match="Invalid spells"):
+		load_spells(bad_spells)
+
+
+def test_catalog_loads_tree_and_rejects_duplicates(tmp_path):
+	catalog = load_catalog(CONTENT_DIR)
+	assert "zone_001" in catalog.maps
+	assert "slime" in catalog.monsters
+	assert set(catalog.abilities) == {a.id for a in load_abilities(CONTENT_DIR / "abilities" / "weapons.json")}
+	assert set(catalog.spells) == {s.id for s in load_spells(CONTENT_DIR / "spells" / "basic.json")}
+	assert "general_store" in catalog.shops
+	assert catalog.sources[("monsters", "slime")].name == "slime.json"
+
+	(tmp_path / "monsters").mkdir()
+	slime = json.loads((CONTENT_DIR / "monsters" / "slime.json").read_text())
+	(tmp_path / "monsters" / "a.json").write_text(json.dumps([slime, dict(slime, id="slime2")]))
+	assert [m.id for m in load_monsters(tmp_path / "monsters" / "a.json")] == ["slime", "slime2"]
+	(tmp_path / "monsters" / "b.json").write_text(json.dumps(slime))
+	with pytest.raises(ValueError, match="Duplicate monsters entry 'slime'"):
+		load_catalog(tmp_path, workers=2)
@@ -0,0 +1,69 @@
+from dataclasses import replace
+
+from game.app.game_loop import load_content_and_init, start_combat
+from game.engine.ai import SearchPolicy
+from game.engine.combat import monster_ai_turn
+from game.engine.distance_field import DistanceField, UNREACHABLE
+from game.engine.entities import Monster
+from game.engine.grid import Grid
+
+
+def test_field_routes_around_walls():
+	wall = {(3, y) for y in range(0, 6)}
+	grid = Grid(width=8, height=8, blocked=wall)
+	field = DistanceField(grid, [(6, 2)])
+	assert field.distance((6, 2)) == 0
+	assert field.distance((3, 2)) == UNREACHABLE
+	assert field.distance((1, 2)) == 13
+
+	pos = (1, 2)
+	path = []
+	while field.distance(pos) > 0:
+		pos = field.descend(pos)
+		path.append(pos)
+	assert len(path) == 13
+	assert all(p not in wall for p in path)
+
+
+def test_pack_shares_field_without_stacking():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0])
+	cs = state.combat_state
+	cs.ai_policy = None
+	cs.combat_grid = Grid(width=30, height=12, blocked={(8, y) for y in range(1, 12)})
+	template = cs.monsters[0]
+	cs.monsters = [
+		Monster(id=f"{template.id}_{i}", name=template.name, position=(20 + i % 5, 2 + i // 5), stats=replace(template.stats))
+		for i in range(20)
+	]
+	for _ in range(8):
+		monster_ai_turn(cs)
+	positions = [m.position for m in cs.monsters]
+	assert len(set(positions)) == len(positions)
+	assert cs.player.position not in positions
+	assert all(cs.combat_grid.walkable(*p) for p in positions)
+	assert any(abs(p[0] - cs.player.position[0]) + abs(p[1] - cs.player.position[1]) == 1 for p in positions)
+
+
+def test_search_policy_walks_the_field_when_out_of_reach():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0])
+	cs = state.combat_state
+	assert isinstance(cs.ai_policy, SearchPolicy)
+	cs.combat_grid = Grid(width=40, height=12, blocked={(20, y) for y in range(1, 12)})
+	template = cs.monsters[0]
+	cs.monsters = [
+		Monster(id=f"{template.id}_{i}", name=template.name, position=(32 + i % 4, 2 + i // 4), stats=replace(template.stats), abilities=list(template.abilities))
+		for i in range(12)
+	]
+	cs.index_monsters()
+	field = DistanceField(cs.combat_grid, [cs.player.position])
+	before = [field.distance(m.position) for m in cs.monsters]
+	monster_ai_turn(cs)
+	after = [field.distance(m.position) for m in cs.monsters]
+	# Every monster was far out of reach, so none searched and each walked down the field
+	assert cs.ai_policy.last_report.nodes == 0
+	assert all(a < b for a, b in zip(after, before))
+	positions = [m.position for m in cs.monsters]
+	assert len(set(positions)) == len(positions)
+	assert all(cs.combat_grid.walkable(*p) for p in positions)
@@ -0,0 +1,29 @@
+from game.app.game_loop import load_content_and_init, start_combat
+from game.engine.ability import REGISTRY, Ability, register
+from game.engine.combat import resolve_ability_effects
+from game.engine.combat_sim import Cast, apply, snapshot_combat
+from game.engine.effects import Damage, Push
+
+
+def test_register_compiles_every_pipeline():
+	load_content_and_init()
+	ab = Ability(id="test_jab", name="Jab", tags=["melee"], cost_ap=1, range_min=1, range_max=1, effects=[Damage(amount=3), Push(distance=1)])
+	register(ab)
+	assert set(ab.compiled) >= {"live", "sim"}
+	assert [h.args[0] for h in ab.compiled["live"]] == ab.effects
+	del REGISTRY["test_jab"]
+
+
+def test_push_in_a_pack_matches_simulator():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0], size=5)
+	cs = state.combat_state
+	target = cs.monsters[0]
+	cs.player.position = (target.position[0] - 2, target.position[1])
+	snap = apply(snapshot_combat(cs), Cast(0, "push_shot", target.position))
+
+	resolve_ability_effects(REGISTRY["push_shot"], cs.player, target.position, cs)
+
+	assert snap.positions[1] == target.position
+	assert snap.hp[1] == target.stats.current_hp
+	assert cs.monster_at(target.position) is target
@@ -0,0 +1,69 @@
+from game.app.game_loop import after_player_cast, load_content_and_init, start_combat
+from game.engine.ability import REGISTRY
+from game.engine.ai import SearchPolicy, plan_monster_phase
+from game.engine.combat import end_combat_turn, resolve_ability_effects
+from game.engine.combat_sim import snapshot_combat
+
+
+def test_group_encounter_places_every_monster_on_its_own_cell():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0], size=30)
+	cs = state.combat_state
+	cells = [m.position for m in cs.monsters]
+	assert len(cs.monsters) == 30
+	assert len(set(cells)) == 30
+	assert cs.player.position not in cells
+	assert all(cs.combat_grid.walkable(*c) for c in cells)
+	assert all(cs.monster_at(m.position) is m for m in cs.monsters)
+
+
+def test_monster_phase_uses_initiative_and_per_monster_budgets():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0], size=5)
+	cs = state.combat_state
+	cs.ai_policy = None
+	cs.monsters[3].stats.mp += 2
+	cs.begin_monster_phase()
+	assert cs.next_monster() is cs.monsters[3]
+	assert cs.next_monster() is cs.monsters[0]
+
+	fast = cs.monsters[3]
+	start = fast.position
+	end_combat_turn(cs)
+	assert fast.position != start
+	assert fast.combat_mp < fast.stats.mp
+	assert all(cs.monster_at(m.position) is m for m in cs.monsters)
+
+
+def test_each_kill_in_a_group_is_rewarded():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0], size=3)
+	cs = state.combat_state
+	gold = state.player.gold
+	victims = list(cs.monsters[:2])
+	for m in victims:
+		m.stats.current_hp = 1
+		resolve_ability_effects(REGISTRY["slash"], state.player, m.position, cs)
+	after_player_cast(state)
+	assert state.in_combat
+	assert len(cs.monsters) == 1
+	assert all(cs.monster_at(m.position) is not m for m in victims)
+	assert state.player.gold > gold + 2 * 5
+
+
+def test_planner_follows_the_live_initiative_queue():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0], size=5)
+	cs = state.combat_state
+	cs.monsters[3].stats.mp += 2
+	cs.monsters[1].stats.ap += 1
+	cs.begin_monster_phase()
+	live = []
+	monster = cs.next_monster()
+	while monster is not None:
+		live.append(cs.monsters.index(monster) + 1)
+		monster = cs.next_monster()
+	plans = plan_monster_phase(SearchPolicy(budget_ms=5.0, max_depth=1), snapshot_combat(cs))
+	planned = [actor for actor, _ in plans]
+	assert planned == live[:len(planned)]
+	assert live[:2] == [4, 2]
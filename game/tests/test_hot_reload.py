@@ -0,0 +1,129 @@
+import json
+import os
+import shutil
+import time
+
+import pytest
+
+from game.app.game_loop import CONTENT_DIR, abilities_bar, apply_content_changes, castable_overlays, load_content_and_init, start_combat
+from game.engine.ability import REGISTRY
+from game.engine.content import ContentWatcher
+from game.engine.monster_store import MonsterStore
+
+
+@pytest.fixture
+def content(tmp_path):
+	saved = dict(REGISTRY)
+	for kind in ("abilities", "monsters", "spells"):
+		shutil.copytree(CONTENT_DIR / kind, tmp_path / kind)
+	yield tmp_path
+	REGISTRY.clear()
+	REGISTRY.update(saved)
+
+
+def _edit(path, change):
+	data = json.loads(path.read_text())
+	change(data)
+	path.write_text(json.dumps(data))
+	# Coarse filesystem clocks: make sure the stamp moves
+	st = path.stat()
+	os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_ability_edit_swaps_registry_and_bar(content):
+	state = load_content_and_init()
+	watcher = ContentWatcher(content)
+	assert watcher.check() == []
+	first = json.loads((content / "abilities" / "weapons.json").read_text())[0]["id"]
+	before = REGISTRY[first]
+
+	def cost_five(data):
+		data[0]["cost_ap"] = 5
+		data[0]["name"] = "Retuned"
+
+	_edit(content / "abilities" / "weapons.json", cost_five)
+	changes = watcher.check()
+	assert [c.path.name for c in changes] == ["weapons.json"]
+	apply_content_changes(state, watcher.drain())
+	assert REGISTRY[first] is not before
+	assert REGISTRY[first].cost_ap == 5
+	assert REGISTRY[first].compiled
+	assert "Retuned[5]" in abilities_bar(state)
+	assert state.chat.entries[-1].text == "Reloaded weapons.json"
+
+	_edit(content / "abilities" / "weapons.json", lambda data: data.pop(0))
+	apply_content_changes(state, watcher.check())
+	assert first not in REGISTRY
+
+
+def test_first_edit_can_delete_an_entry(content):
+	state = load_content_and_init()
+	watcher = ContentWatcher(content)
+	path = content / "abilities" / "weapons.json"
+	dropped = json.loads(path.read_text())[0]["id"]
+	assert dropped in REGISTRY
+	_edit(path, lambda data: data.pop(0))
+	changes = watcher.check()
+	assert changes[0].removed == {dropped}
+	apply_content_changes(state, changes)
+	assert dropped not in REGISTRY
+
+
+def test_invalid_edit_keeps_old_content(content):
+	state = load_content_and_init()
+	watcher = ContentWatcher(content)
+	before = dict(REGISTRY)
+	(content / "spells" / "basic.json").write_text('[{"id": "bolt"')
+	changes = watcher.check()
+	assert changes[0].error
+	apply_content_changes(state, changes)
+	assert REGISTRY == before
+	assert "failed" in state.chat.entries[-1].text
+
+
+def test_monster_edit_refreshes_live_monsters_keeping_damage(content):
+	state = load_content_and_init()
+	watcher = ContentWatcher(content)
+	start_combat(state, state.monsters[0])
+	fighter = state.combat_state.monsters[0]
+	fighter.stats.take_damage(20)
+	taken = fighter.stats.hp - fighter.stats.current_hp
+	idle = state.monsters[1]
+
+	def buff(data):
+		data["stats"]["hp"] = 500
+		data["abilities"] = ["bolt", "push"]
+
+	_edit(content / "monsters" / "slime.json", buff)
+	apply_content_changes(state, watcher.check())
+	assert fighter.stats.hp == 500
+	assert fighter.stats.current_hp == 500 - taken
+	assert fighter.abilities == ["bolt", "push"]
+	assert idle.stats.current_hp == 500
+
+	store = MonsterStore()
+	store.spawn(idle, [(1, 1)])
+	state.monsters = store
+	state.combat_state = None
+	_edit(content / "monsters" / "slime.json", lambda data: data["stats"].update(hp=90, atk=1))
+	apply_content_changes(state, watcher.check())
+	assert store[0].stats.hp == 90
+	assert store[0].stats.atk == 1
+
+
+def test_watcher_thread_picks_up_edits(content):
+	state = load_content_and_init()
+	watcher = ContentWatcher(content, interval=0.01)
+	watcher.start()
+	try:
+		_edit(content / "spells" / "basic.json", lambda data: data[0].update(range_max=9))
+		deadline = time.monotonic() + 5
+		changes = []
+		while not changes and time.monotonic() < deadline:
+			time.sleep(0.01)
+			changes = watcher.drain()
+	finally:
+		watcher.stop()
+	apply_content_changes(state, changes)
+	assert REGISTRY["bolt"].range_max == 9
+	assert castable_overlays(state) == {}
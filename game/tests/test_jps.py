@@ -0,0 +1,52 @@
+import random
+
+from game.app.game_loop import load_content_and_init, path_to
+from game.engine.chunks import ChunkedGrid
+from game.engine.grid import Grid
+from game.engine.pathfinding import JPS, SearchStats, astar, find_path, jps
+
+
+def _check(grid, start, path, goal, occupied=frozenset()):
+	cells = [start] + path
+	assert cells[-1] == goal
+	for a, b in zip(cells, cells[1:]):
+		assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+		assert grid.walkable(*b)
+		assert b not in occupied or b == goal
+
+
+def test_jps_matches_astar_lengths_on_random_maps():
+	rng = random.Random(0)
+	for _ in range(60):
+		w, h = rng.randint(5, 30), rng.randint(5, 30)
+		blocked = {(x, y) for x in range(w) for y in range(h) if rng.random() < 0.3}
+		grids = [Grid(width=w, height=h, blocked=blocked), ChunkedGrid.from_blocked(w, h, blocked)]
+		cells = [(x, y) for x in range(w) for y in range(h) if (x, y) not in blocked]
+		if len(cells) < 4:
+			continue
+		for _ in range(5):
+			start, goal, monster = rng.sample(cells, 3)
+			occupied = {monster}
+			for grid in grids:
+				exact = astar(grid, start, goal, occupied)
+				jumped = jps(grid, start, goal, occupied)
+				assert (exact is None) == (jumped is None)
+				if jumped is not None:
+					assert len(jumped) == len(exact)
+					_check(grid, start, jumped, goal, occupied)
+
+
+def test_jps_expands_far_fewer_nodes_on_open_ground():
+	grid = Grid(width=64, height=64, blocked={(32, y) for y in range(10, 50)})
+	a, j = SearchStats(), SearchStats()
+	assert len(astar(grid, (2, 30), (60, 31), stats=a)) == len(jps(grid, (2, 30), (60, 31), stats=j))
+	assert j.expanded * 5 < a.expanded
+
+
+def test_method_is_selectable_per_query():
+	state = load_content_and_init()
+	goal = (30, 8)
+	path = path_to(state, goal, method=JPS)
+	_check(state.grid, state.player.position, path, goal)
+	assert len(path) == len(path_to(state, goal))
+	assert find_path(state.grid, (2, 2), (2, 2), method=JPS) == []
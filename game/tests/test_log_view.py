@@ -0,0 +1,47 @@
+import pygame
+
+from game.app.ui.log_view import LogView, wrap_text
+
+
+def _fmt(line):
+	return line, (200, 200, 210)
+
+
+def _view():
+	pygame.font.init()
+	return LogView(capacity=64)
+
+
+def test_long_log_only_renders_visible_entries():
+	view = _view()
+	screen = pygame.Surface((300, 200))
+	log = [f"event {i}" for i in range(100_000)]
+	assert view.draw(screen, log, _fmt, 0, 0, 280, 180, 0) == 0
+	assert view.misses == 10
+	view.draw(screen, log, _fmt, 0, 0, 280, 180, 0)
+	assert view.misses == 10 and view.hits == 10
+	assert view.draw(screen, log, _fmt, 0, 0, 280, 180, 50_000) == 50_000
+	assert view.misses == 20
+	assert view.draw(screen, log, _fmt, 0, 0, 280, 180, 10**9) == len(log) - 1
+	assert len(view.cache) <= 64
+
+
+def test_entries_are_wrapped_once_to_the_panel_width():
+	view = _view()
+	font = pygame.font.SysFont(None, 20)
+	text = "the quick brown fox jumps over the lazy dog " * 4
+	parts = wrap_text(font, text.strip(), 120)
+	assert len(parts) > 1 and all(font.size(p)[0] <= 120 for p in parts)
+	view.draw(pygame.Surface((300, 200)), [text.strip()], _fmt, 0, 0, 120, 180, 0)
+	assert len(view.cache[0]) == len(parts)
+
+
+def test_truncated_log_drops_stale_surfaces():
+	view = _view()
+	screen = pygame.Surface((300, 200))
+	log = ["a", "b", "c"]
+	view.draw(screen, log, _fmt, 0, 0, 280, 180, 0)
+	log.clear()
+	log.append("d")
+	view.draw(screen, log, _fmt, 0, 0, 280, 180, 0)
+	assert list(view.cache) == [0] and view.misses == 4
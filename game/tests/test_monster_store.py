@@ -0,0 +1,58 @@
+from dataclasses import replace
+
+from game.app.game_loop import load_content_and_init, render_ascii, try_move
+from game.engine.combat import check_combat_trigger
+from game.engine.monster_store import MonsterStore
+from game.engine.tags import BOSS, tag_bit
+
+
+def _store_state():
+	state = load_content_and_init()
+	template = state.monsters[0]
+	store = MonsterStore()
+	store.spawn(template, [(10, 10), (12, 3), (40, 40)])
+	state.monsters = store
+	return state, template
+
+
+def test_store_views_read_like_monsters():
+	state, template = _store_state()
+	store = state.monsters
+	assert len(store) == 3
+	view = store[0]
+	assert view.position == (10, 10)
+	assert view.name == template.name
+	assert view.stats.current_hp == template.stats.current_hp
+	assert view.tags == template.tags
+	view.position = (11, 10)
+	assert store.at((11, 10)) == view.row
+	assert store.at((10, 10)) is None
+
+
+def test_store_bulk_damage_move_and_queries():
+	state, template = _store_state()
+	store = state.monsters
+	rows = store.rows()
+	store.move_many(rows, [(1, 1), (2, 1), (100, 100)])
+	assert sorted(store.in_rect(0, 0, 5, 5)) == rows[:2]
+	killed = store.damage(rows[:2], template.stats.hp + 100)
+	assert killed == rows[:2]
+	assert len(store) == 1
+	assert store.in_rect(0, 0, 5, 5) == []
+	reused = store.spawn(template, [(3, 3)])
+	assert reused[0] in rows[:2]
+	boss_rows = store.spawn(replace(template, id="boss", tags={"boss"}), [(4, 4)])
+	assert store.with_tags(BOSS) == boss_rows
+	assert store.with_tags(tag_bit("never_set_on_a_monster")) == []
+
+
+def test_store_drives_trigger_render_and_combat():
+	state, template = _store_state()
+	assert any("M" in line for line in render_ascii(state))
+	assert check_combat_trigger((12, 3), state.monsters).position == (12, 3)
+	assert check_combat_trigger((13, 3), state.monsters) is None
+	state.player.position = (10, 9)
+	try_move(state, 0, 1)
+	assert state.in_combat
+	assert state.combat_state.monsters[0].name == template.name
+	assert type(state.combat_state.monsters[0]) is type(template)
@@ -0,0 +1,70 @@
+import os
+from dataclasses import replace
+
+import pygame
+
+from game.app.game_loop import CONTENT_DIR, load_content_and_init
+from game.app.ui.panels import PANEL_CACHES, draw_inventory_panel, draw_profile_panel, draw_shop_panel
+from game.engine.ability import REGISTRY, swap_abilities
+from game.engine.inventory import get_item_by_id
+
+
+def test_panels_rebuild_only_when_inputs_change():
+	pygame.font.init()
+	state = load_content_and_init()
+	screen = pygame.Surface((1200, 800))
+	inv_cache = PANEL_CACHES["inventory"]
+	prof_cache = PANEL_CACHES["profile"]
+	inv_before = inv_cache.builds
+	prof_before = prof_cache.builds
+
+	for _ in range(5):
+		draw_inventory_panel(screen, state, 10, 10, 520, 300, 0, 0, False)
+		draw_profile_panel(screen, state, 10, 320, 700, 300)
+	assert inv_cache.builds == inv_before + 1
+	assert prof_cache.builds == prof_before + 1
+
+	version = state.player.inventory.version
+	state.player.inventory.add_item(get_item_by_id("health_potion"))
+	assert state.player.inventory.version > version
+	draw_inventory_panel(screen, state, 40, 10, 520, 300, 0, 0, False)
+	draw_inventory_panel(screen, state, 40, 10, 520, 300, 0, 1, False)
+	assert inv_cache.builds == inv_before + 3
+
+	state.player.add_gold(5)
+	draw_profile_panel(screen, state, 10, 320, 700, 300)
+	state.player.stats.current_hp -= 1
+	draw_profile_panel(screen, state, 10, 320, 700, 300)
+	assert prof_cache.builds == prof_before + 3
+
+
+def test_panels_rebuild_on_content_changes():
+	pygame.font.init()
+	state = load_content_and_init()
+	screen = pygame.Surface((1200, 800))
+	prof_cache = PANEL_CACHES["profile"]
+	shop_cache = PANEL_CACHES["shop"]
+
+	draw_profile_panel(screen, state, 10, 320, 700, 300)
+	before = prof_cache.builds
+	slash = REGISTRY["slash"]
+	try:
+		swap_abilities([replace(slash, name="Renamed")])
+		draw_profile_panel(screen, state, 10, 320, 700, 300)
+		assert prof_cache.builds == before + 1
+	finally:
+		swap_abilities([slash])
+
+	merchant = state.merchants[0]
+	state.player.position = (merchant.position[0], merchant.position[1] - 1)
+	draw_shop_panel(screen, state, 10, 10, 400, 300, 0)
+	draw_shop_panel(screen, state, 10, 10, 400, 300, 0)
+	before = shop_cache.builds
+	path = CONTENT_DIR / "shops" / f"{merchant.shop_id}.json"
+	st = path.stat()
+	try:
+		os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+		draw_shop_panel(screen, state, 10, 10, 400, 300, 0)
+		assert shop_cache.builds == before + 1
+	finally:
+		os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
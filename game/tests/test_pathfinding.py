@@ -0,0 +1,86 @@
+import random
+
+from game.app.game_loop import load_content_and_init, path_to, plan_travel, travel_to_map, zone_terrain
+from game.engine.grid import Grid
+from game.engine.pathfinding import HIERARCHICAL, ClusterGraph, astar, find_path, graph_for
+from game.engine.procgen import generate_zone
+
+
+def _valid(grid, start, path, goal):
+	cells = [start] + path
+	assert cells[-1] == goal
+	for a, b in zip(cells, cells[1:]):
+		assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+		assert grid.walkable(*b)
+
+
+
+def test_hierarchical_never_walks_through_occupied_cells():
+	for seed in range(150):
+		rng = random.Random(seed)
+		w, h = rng.randint(20, 60), rng.randint(20, 60)
+		blocked = {(x, y) for x in range(w) for y in range(h) if rng.random() < 0.3}
+		grid = Grid(width=w, height=h, blocked=blocked)
+		cells = [(x, y) for x in range(w) for y in range(h) if (x, y) not in blocked]
+		if len(cells) < 8:
+			continue
+		start, goal, *monsters = rng.sample(cells, 7)
+		# Monsters on cluster entrances too, where the abstract graph routes
+		graph = ClusterGraph(grid)
+		entrances = sorted({c for kx in range(graph.clusters_wide) for ky in range(graph.clusters_high) for c in graph._entrances((kx, ky))})
+		occupied = (set(monsters) | set(rng.sample(entrances, min(5, len(entrances))))) - {start}
+		exact = astar(grid, start, goal, occupied)
+		path = find_path(grid, start, goal, occupied, method=HIERARCHICAL)
+		assert (exact is None) == (path is None), seed
+		if path is not None:
+			_valid(grid, start, path, goal)
+			assert all(c not in occupied or c == goal for c in path), seed
+
+def test_hierarchical_paths_are_valid_and_near_optimal():
+	zone = generate_zone("caves", 160, 160, 4)
+	grid = zone.grid()
+	graph = ClusterGraph(grid)
+	rng = random.Random(2)
+	open_cells = [(x, y) for y in range(160) for x in range(160) if grid.walkable(x, y)]
+	for _ in range(20):
+		start, goal = rng.sample(open_cells, 2)
+		exact = astar(grid, start, goal)
+		path = graph.find_path(start, goal)
+		assert (exact is None) == (path is None)
+		if path is not None:
+			_valid(grid, start, path, goal)
+			assert len(path) <= len(exact) * 1.3 + 16
+
+
+def test_graph_follows_wall_edits():
+	grid = generate_zone("rooms", 128, 128, 3).grid()
+	graph = graph_for(grid)
+	start = generate_zone("rooms", 128, 128, 3).start
+	goal = max((c for c in ((x, y) for y in range(128) for x in range(128)) if grid.walkable(*c)), key=lambda c: c[0] + c[1])
+	path = find_path(grid, start, goal)
+	_valid(grid, start, path, goal)
+	# Wall off a cell on the route; the cached clusters around it must be rebuilt
+	cut = path[len(path) // 2]
+	grid.add_blocked([cut])
+	assert graph.cluster_of(cut) not in graph._intra
+	rerouted = find_path(grid, start, goal)
+	assert rerouted is None or cut not in rerouted
+	if rerouted is not None:
+		_valid(grid, start, rerouted, goal)
+
+
+def test_routes_cross_portals():
+	state = load_content_and_init()
+	dungeon_arrival = zone_terrain("zone_dungeon", state.world_seed)[2]
+	legs = plan_travel(state, "zone_dungeon", dungeon_arrival)
+	assert [m for m, _ in legs] == ["zone_001", "zone_dungeon"]
+	assert legs[0][1][-1] == (6, 12)
+	assert legs[1][1] == []
+	travel_to_map(state, "zone_exploration")
+	exploration_goal = state.monsters[0].position
+	legs = plan_travel(state, "zone_dungeon", dungeon_arrival)
+	assert [m for m, _ in legs] == ["zone_exploration", "zone_001", "zone_dungeon"]
+	assert legs[0][1][-1] == state.portals[0].position
+	assert legs[1][1][-1] == (6, 12)
+	path = path_to(state, exploration_goal)
+	_valid(state.grid, state.player.position, path, exploration_goal)
@@ -0,0 +1,43 @@
+from game.app.game_loop import create_player_with_progression
+from game.app.persistence import ProfileStore
+from game.engine.inventory import get_item_by_id
+
+
+def test_profile_roundtrip_through_writer_thread(tmp_path):
+	store = ProfileStore(tmp_path / "profiles.db")
+	player = create_player_with_progression()
+	store.attach(player)
+	# Persist the initial profile so each change below reaches the DB only through
+	# its own section's hook
+	store.flush()
+	player.add_gold(25)
+	player.inventory.add_item(get_item_by_id("mana_potion"))
+	player.equipment.equip_item(get_item_by_id("wooden_bow"))
+	player.progression.equipped_weapon = "bow"
+	player.progression.weapon_skills.add_experience("ranged", 3)
+	player.quest_log.update_objective("first_blood", "kill_slime", 1)
+	player.quest_log.complete_quest("first_blood")
+	store.close()
+
+	fresh = create_player_with_progression()
+	fresh.inventory.items.clear()
+	reader = ProfileStore(tmp_path / "profiles.db")
+	assert reader.load_into(fresh)
+	reader.close()
+	assert fresh.gold == player.gold
+	assert [(i.id, i.quantity) for i in fresh.inventory.items] == [(i.id, i.quantity) for i in player.inventory.items]
+	assert fresh.equipment.weapon.id == "wooden_bow"
+	assert fresh.progression.equipped_weapon == "bow"
+	assert fresh.progression.weapon_skills.ranged_damage == 3
+	assert fresh.quest_log.completed_quests == ["first_blood"]
+
+
+def test_commit_coalesces_repeated_mutations(tmp_path):
+	store = ProfileStore(tmp_path / "profiles.db")
+	player = create_player_with_progression()
+	store.attach(player)
+	store.flush()
+	for _ in range(100):
+		player.add_gold(1)
+	assert store.commit() == 1
+	store.close()
@@ -0,0 +1,56 @@
+from collections import deque
+
+from game.app.game_loop import load_content_and_init, travel_to_map
+from game.engine.chunks import ChunkedGrid
+from game.engine.procgen import connect, generate_caves, generate_rooms, generate_zone, zone_seed
+
+
+def _reachable(cells, width, height, start):
+	seen = {start}
+	queue = deque([start])
+	while queue:
+		x, y = queue.popleft()
+		for n in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+			if 0 <= n[0] < width and 0 <= n[1] < height and n not in seen and not cells[n[1] * width + n[0]]:
+				seen.add(n)
+				queue.append(n)
+	return seen
+
+
+def test_generated_maps_are_framed_and_fully_connected():
+	for generate in (generate_caves, generate_rooms):
+		cells = generate(80, 50, seed=9)
+		start = connect(cells, 80, 50)
+		open_cells = {(i % 80, i // 80) for i, c in enumerate(cells) if not c}
+		assert open_cells
+		assert _reachable(cells, 80, 50, start) == open_cells
+		assert all(cells[x] and cells[49 * 80 + x] for x in range(80))
+		assert all(cells[y * 80] and cells[y * 80 + 79] for y in range(50))
+
+
+def test_zones_are_reproducible_and_cached_per_seed():
+	a = generate_zone("caves", 128, 96, 1)
+	assert generate_zone("caves", 128, 96, 1) is a
+	generate_zone.cache_clear()
+	assert generate_zone("caves", 128, 96, 1).chunks == a.chunks
+	assert generate_zone("caves", 128, 96, 2).chunks != a.chunks
+	# Grids handed out are independent copies of the cached terrain
+	g1 = a.grid()
+	g2 = a.grid()
+	x, y = a.start
+	g1.add_blocked([(x, y)])
+	assert not g2.is_blocked(x, y)
+	assert zone_seed(0, "zone_dungeon") != zone_seed(1, "zone_dungeon")
+
+
+def test_portals_lead_to_generated_zones():
+	state = load_content_and_init()
+	travel_to_map(state, "zone_exploration")
+	assert isinstance(state.grid, ChunkedGrid)
+	assert state.grid.walkable(*state.player.position)
+	assert state.grid.walkable(*state.portals[0].position)
+	assert state.grid.walkable(*state.monsters[0].position)
+	first = state.player.position
+	travel_to_map(state, "zone_001")
+	travel_to_map(state, "zone_exploration")
+	assert state.player.position == first
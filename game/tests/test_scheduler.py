@@ -0,0 +1,40 @@
+import pygame
+
+from game.app.ui.scheduler import ACTIVE_FPS, IDLE_FPS, RenderScheduler
+
+
+def _presented(monkeypatch):
+	calls = []
+	monkeypatch.setattr(pygame.display, "flip", lambda: calls.append("flip"))
+	monkeypatch.setattr(pygame.display, "update", lambda rects: calls.append(list(rects)))
+	return calls
+
+
+def test_idle_frames_are_skipped_at_low_rate(monkeypatch):
+	calls = _presented(monkeypatch)
+	sched = RenderScheduler()
+	assert sched.dirty
+	assert sched.present() == ACTIVE_FPS
+	assert calls == ["flip"]
+	assert not sched.dirty
+	assert sched.idle() == IDLE_FPS
+	sched.wake()
+	assert not sched.dirty
+	assert sched.idle() == ACTIVE_FPS
+	assert sched.idle() == IDLE_FPS
+	assert sched.skipped == 3
+
+
+def test_partial_reasons_update_only_their_rects(monkeypatch):
+	calls = _presented(monkeypatch)
+	sched = RenderScheduler()
+	sched.present()
+	sched.mark("hover", pygame.Rect(10, 10, 40, 20))
+	sched.mark("hover", pygame.Rect(0, 0, 0, 0))
+	assert sched.dirty
+	sched.present()
+	assert calls[-1] == [pygame.Rect(10, 10, 40, 20)]
+	sched.mark("hover", pygame.Rect(10, 10, 40, 20))
+	sched.mark("log")
+	sched.present()
+	assert calls[-1] == "flip"
@@ -0,0 +1,25 @@
+from game.app.game_loop import load_content_and_init
+from game.engine.dr_types import Element, State, StateKind, Unit, UnitStats
+from game.engine.effects import Damage
+from game.engine.quests import get_quest_by_id
+
+
+def test_engine_value_types_have_no_instance_dict():
+	state = load_content_and_init()
+	unit = Unit(id="u", name="U", element=Element.T, stats=UnitStats(hp=1, atk=1, df=1, spd=1, wis=1, pow=1), position=(0, 0))
+	quest = get_quest_by_id("first_blood")
+	values = [
+		state.player,
+		state.player.stats,
+		state.monsters[0],
+		state.merchants[0],
+		unit,
+		unit.stats,
+		State(kind=StateKind.DAZED, duration_beats=1),
+		quest,
+		quest.objectives[0],
+		Damage(amount=1),
+	]
+	values += state.player.inventory.items
+	for value in values:
+		assert not hasattr(value, "__dict__"), type(value).__name__
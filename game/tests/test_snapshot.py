@@ -0,0 +1,60 @@
+import pytest
+
+from game.app.game_loop import load_content_and_init, start_combat
+from game.app.save import Autosave, decode_game_state, encode_game_state, load_game, save_game
+from game.engine.snapshot import decode_player_sections, encode_player_sections
+
+
+def test_player_roundtrip_keeps_inventory_and_quests():
+	state = load_content_and_init()
+	player = state.player
+	player.add_gold(42)
+	player.quest_log.update_objective("first_blood", "kill_slime", 1)
+	player.quest_log.completed_quests.append("collector")
+	player.equipment.equip_item(player.inventory.items[1])
+
+	restored = decode_player_sections(encode_player_sections(player))
+
+	assert restored.gold == player.gold
+	assert restored.inventory == player.inventory
+	assert restored.equipment == player.equipment
+	assert restored.quest_log.completed_quests == ["collector"]
+	assert restored.quest_log.active_quests["first_blood"].objectives[0].completed
+	assert restored.progression == player.progression
+
+
+def test_save_and_load_game_with_combat(tmp_path):
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0])
+	path = tmp_path / "slot1.sav"
+	save_game(state, path)
+
+	loaded = load_game(path)
+
+	assert loaded.in_combat
+	assert loaded.grid.blocked == state.grid.blocked
+	assert loaded.combat_state.monsters[0].position == state.combat_state.monsters[0].position
+	assert loaded.combat_state.player is loaded.player
+	assert loaded.log.entries == state.log.entries
+
+
+def test_autosave_rewrites_only_changed_sections(tmp_path):
+	state = load_content_and_init()
+	autosave = Autosave(tmp_path / "auto")
+	assert len(autosave.save(state)) > 1
+
+	state.player.add_gold(5)
+	assert autosave.save(state) == ["PLYR"]
+	assert autosave.save(state) == []
+	assert Autosave(tmp_path / "auto").load().player.gold == state.player.gold
+
+
+def test_truncated_sections_raise_invalid_save():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0])
+	sections = encode_game_state(state)
+	for name in ("WRLD", "CMBT", "LOG_", "CHAT", "ZONE"):
+		cut = dict(sections)
+		cut[name] = sections[name][:len(sections[name]) // 2]
+		with pytest.raises(ValueError, match="Invalid save"):
+			decode_game_state(cut)
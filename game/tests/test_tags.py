@@ -1,4 +1,9 @@
-from game.engine.tags import TaggableMixin, damage_multiplier_for_target
+from dataclasses import replace
+
+from game.engine.ability import Ability
+from game.engine.entities import Monster
+from game.engine.stats import Stats
+from game.engine.tags import BOSS, MELEE, RANGED, TaggableMixin, damage_multiplier_for_target, tag_bit
 
 
 class T(TaggableMixin):
@@ -19,3 +24,16 @@ def test_damage_multiplier_boss():
 	assert damage_multiplier_for_target({"monster"}) == 1.0
 
 
+def test_tags_are_interned_to_a_mask():
+	m = Monster(id="m", name="M", stats=Stats(hp=1, ap=1, mp=1, atk=1, res=0), position=(0, 0), tags={"boss", "undead"})
+	assert m.tag_mask == BOSS | tag_bit("undead")
+	assert m.tags == {"boss", "undead"}
+	assert m.has_any(BOSS) and not m.has_tag("never_seen_tag")
+	assert damage_multiplier_for_target(m.tag_mask) == 1.1
+	twin = replace(m)
+	assert twin.tag_mask == m.tag_mask and twin == m
+
+
+def test_ability_carries_tag_mask():
+	ab = Ability(id="x", name="X", tags=["ranged", "damage"], cost_ap=1, range_min=1, range_max=3, effects=[])
+	assert ab.tag_mask & RANGED and not ab.tag_mask & MELEE
@@ -0,0 +1,63 @@
+from dataclasses import replace
+
+from game.app.game_loop import begin_targeting, castable_overlays, confirm_target_and_cast, load_content_and_init, move_target_cursor, start_combat
+from game.engine.ability import REGISTRY, in_range
+from game.engine.combat import has_line_of_sight
+from game.engine.targeting import compute_overlay
+
+
+def test_overlay_matches_per_cell_checks():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0])
+	cs = state.combat_state
+	grid = cs.combat_grid
+	grid.add_blocked([(4, 2), (4, 3)])
+	src = cs.player.position
+	for ab in (REGISTRY["precise_shot"], REGISTRY["slash"], REGISTRY["fireball"]):
+		overlay = compute_overlay(grid, ab, src)
+		for y in range(grid.height):
+			for x in range(grid.width):
+				legal = grid.walkable(x, y) and in_range(ab, src, (x, y)) and ("ranged" not in ab.tags or has_line_of_sight(grid, src, (x, y)))
+				assert overlay.contains((x, y)) == legal
+
+
+def test_close_melee_never_targets_own_cell():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0])
+	cs = state.combat_state
+	src = cs.player.position
+	jab = replace(REGISTRY["slash"], id="jab", range_min=0, range_max=1, tags=["melee"])
+	overlay = compute_overlay(cs.combat_grid, jab, src)
+	assert not overlay.contains(src)
+	assert all(abs(x - src[0]) + abs(y - src[1]) == 1 for x, y in overlay.cells)
+	# Longer-reach abilities keep range_min 0 as written
+	reach = replace(jab, id="reach", range_max=2)
+	assert compute_overlay(cs.combat_grid, reach, src).contains(src)
+
+
+def test_overlays_rebuild_only_on_position_or_ap_change():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0])
+	first = castable_overlays(state)
+	assert castable_overlays(state) is first
+	rebuilds = state.cast_overlays.rebuilds
+	state.combat_state.player_ap -= 2
+	assert castable_overlays(state) is not first
+	assert state.cast_overlays.rebuilds == rebuilds + 1
+
+
+def test_cursor_skips_to_castable_cells():
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0])
+	cs = state.combat_state
+	monster = cs.monsters[0]
+	cs.player.position = (monster.position[0] - 3, monster.position[1])
+	begin_targeting(state, REGISTRY["slash"])
+	state.target_cursor = cs.player.position
+	move_target_cursor(state, 1, 0)
+	assert state.target_cursor == (cs.player.position[0] + 1, cs.player.position[1])
+	state.target_cursor = (monster.position[0], monster.position[1])
+	hp = monster.stats.current_hp
+	confirm_target_and_cast(state)
+	assert monster.stats.current_hp == hp
+	assert state.log.entries[-1] == "Target not adjacent for melee ability"
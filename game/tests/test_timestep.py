@@ -0,0 +1,28 @@
+from game.app.timestep import FixedTimestep, lerp2
+
+
+def _run(fps: int, seconds: float) -> FixedTimestep:
+	clock = FixedTimestep()
+	for _ in range(round(fps * seconds)):
+		clock.advance(1.0 / fps)
+	return clock
+
+
+def test_simulation_rate_is_independent_of_frame_rate():
+	ticks = {fps: _run(fps, 2.0).ticks for fps in (30, 60, 144)}
+	assert all(abs(t - 120) <= 1 for t in ticks.values())
+
+
+def test_catch_up_is_capped_after_a_stall():
+	clock = FixedTimestep(max_steps=4)
+	assert clock.advance(1.0) == 4
+	assert clock.dropped > 0.9
+	assert clock.advance(1.0 / 60) == 1
+
+
+def test_alpha_interpolates_between_slices():
+	clock = FixedTimestep()
+	assert clock.advance(clock.dt * 2.5) == 2
+	assert abs(clock.alpha - 0.5) < 1e-6
+	x, y = lerp2((0.0, 0.0), (4.0, 2.0), clock.alpha)
+	assert abs(x - 2.0) < 1e-6 and abs(y - 1.0) < 1e-6
@@ -0,0 +1,38 @@
+from game.app.iso import SCREEN_H, SCREEN_W, iso_coords_scaled, screen_to_cell, visible_rows
+
+
+def _brute(cam_x, cam_y, tw, th, width, height):
+	cells = set()
+	for y in range(height):
+		for x in range(width):
+			sx, sy = iso_coords_scaled(x, y, tw, th)
+			sx -= cam_x
+			sy -= cam_y
+			if sx + tw >= 0 and sx <= SCREEN_W and sy + th >= 0 and sy <= SCREEN_H:
+				cells.add((x, y))
+	return cells
+
+
+def _culled(cam_x, cam_y, tw, th, width, height):
+	return {(x, y) for y, x0, x1 in visible_rows(cam_x, cam_y, tw, th, width, height) for x in range(x0, x1 + 1)}
+
+
+def test_visible_rows_cover_every_on_screen_tile():
+	for tw, th in ((64, 24), (16, 8), (140, 52)):
+		for cam in ((0, 0), (-900, -500), (1500, 2000), (-4000, 3000), (3000, 300)):
+			visible = _culled(cam[0], cam[1], tw, th, 120, 90)
+			assert _brute(cam[0], cam[1], tw, th, 120, 90) <= visible
+
+
+def test_visible_rows_scale_with_screen_not_map():
+	small = _culled(500, 800, 64, 24, 150, 150)
+	large = _culled(500, 800, 64, 24, 500, 500)
+	assert small and len(large) == len(small)
+	assert len(large) < 500 * 500 // 20
+
+
+def test_screen_to_cell_inverts_tile_origin():
+	for tw, th in ((64, 24), (32, 12)):
+		for x, y in ((0, 0), (5, 3), (40, 71)):
+			sx, sy = iso_coords_scaled(x, y, tw, th)
+			assert screen_to_cell(sx + 1, sy + th // 2, tw, th) == (x, y)
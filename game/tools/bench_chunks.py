@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+from ..engine.chunks import ChunkedGrid
+from ..engine.grid import Grid
+
+
+def _measure(build: Callable[[], object]) -> tuple[object, float]:
+	gc.collect()
+	tracemalloc.start()
+	before = tracemalloc.get_traced_memory()[0]
+	built = build()
+	after = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	return built, (after - before) / 1024.0 / 1024.0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="World grid memory and lookups: set Grid vs chunked LRU grid")
+	parser.add_argument("--size", type=int, default=2048)
+	parser.add_argument("--walls", type=float, default=0.1)
+	parser.add_argument("--steps", type=int, default=20_000)
+	args = parser.parse_args(argv)
+
+	n = args.size
+	rng = random.Random(3)
+	blocked = [(x, y) for y in range(n) for x in range(n) if rng.random() < args.walls]
+	plain, plain_mb = _measure(lambda: Grid(width=n, height=n, blocked=set(blocked)))
+	chunked, chunked_mb = _measure(lambda: ChunkedGrid.from_blocked(n, n, blocked))
+
+	# A wandering walk that probes its neighbourhood each step, like pathing and LoS
+	x = y = n // 2
+	walk = []
+	for _ in range(args.steps):
+		x = max(0, min(n - 1, x + rng.choice((-1, 0, 1)) * 3))
+		y = max(0, min(n - 1, y + rng.choice((-1, 0, 1)) * 3))
+		walk.append((x, y))
+
+	def probe(grid) -> float:
+		t0 = time.perf_counter()
+		for px, py in walk:
+			stream = getattr(grid, "stream_around", None)
+			if stream is not None:
+				stream((px, py))
+			for dy in (-2, -1, 0, 1, 2):
+				for dx in (-2, -1, 0, 1, 2):
+					grid.walkable(px + dx, py + dy)
+		return (time.perf_counter() - t0) * 1e6 / len(walk)
+
+	plain_us = probe(plain)
+	chunked_us = probe(chunked)
+	print(f"{n}x{n} world, {len(blocked)} walls")
+	print(f"set Grid     {plain_mb:7.1f} MiB             {plain_us:6.1f} us/step")
+	print(f"ChunkedGrid  {chunked_mb:7.1f} MiB compressed  {chunked_us:6.1f} us/step  resident {chunked.resident_bytes() / 1024:.0f} KiB, {chunked.loads} loads")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import sys
+import time
+from typing import Optional
+
+from ..app.game_loop import load_content_and_init, start_combat
+from ..engine.combat_sim import Move, apply, legal_actions, snapshot_combat
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Combat snapshot clone/apply cost versus deepcopy")
+	parser.add_argument("--iterations", type=int, default=100000)
+	args = parser.parse_args(argv)
+
+	state = load_content_and_init()
+	start_combat(state, state.monsters[0])
+	cs = state.combat_state
+	n = args.iterations
+
+	t0 = time.perf_counter()
+	for _ in range(n // 100):
+		copy.deepcopy(cs)
+	deep_us = (time.perf_counter() - t0) / max(1, n // 100) * 1e6
+
+	t0 = time.perf_counter()
+	for _ in range(n // 10):
+		snapshot_combat(cs)
+	snap_us = (time.perf_counter() - t0) / max(1, n // 10) * 1e6
+
+	snap = snapshot_combat(cs)
+	move = next(a for a in legal_actions(snap) if isinstance(a, Move))
+	t0 = time.perf_counter()
+	for _ in range(n):
+		apply(snap, move)
+	apply_us = (time.perf_counter() - t0) / n * 1e6
+
+	t0 = time.perf_counter()
+	for _ in range(n // 10):
+		legal_actions(snap)
+	legal_us = (time.perf_counter() - t0) / max(1, n // 10) * 1e6
+
+	print(f"deepcopy(CombatState)  {deep_us:9.2f} us")
+	print(f"snapshot_combat        {snap_us:9.2f} us")
+	print(f"apply(Move)            {apply_us:9.2f} us")
+	print(f"legal_actions          {legal_us:9.2f} us")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from ..engine.content import AbilityModel, BlockedCellModel, MonsterModel, SpellModel, load_abilities, load_catalog, load_map, load_monsters, load_spells
+from .synth import write_catalog
+
+
+# The loading path before bulk validation: json.load, then one model per entry
+# and one model per blocked cell
+class _CellListMap(BaseModel):
+	name: str
+	width: int
+	height: int
+	blocked: List[BlockedCellModel] = Field(default_factory=list)
+
+
+def _per_entry(path: Path, model: type) -> list:
+	with path.open("r", encoding="utf-8") as f:
+		return [model(**d) for d in json.load(f)]
+
+
+def _per_cell_map(path: Path) -> _CellListMap:
+	with path.open("r", encoding="utf-8") as f:
+		return _CellListMap(**json.load(f))
+
+
+def _time(fn) -> float:
+	t0 = time.perf_counter()
+	fn()
+	return (time.perf_counter() - t0) * 1000.0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Content loading time, per-entry models vs bulk validation")
+	parser.add_argument("--entries", type=int, default=10000, help="monsters, spells and abilities each")
+	parser.add_argument("--files", type=int, default=8, help="files per content directory")
+	parser.add_argument("--map-size", type=int, default=512)
+	parser.add_argument("--workers", type=int, default=4)
+	parser.add_argument("--seed", type=int, default=1)
+	args = parser.parse_args(argv)
+
+	with tempfile.TemporaryDirectory() as tmp:
+		root = Path(tmp)
+		write_catalog(
+			root, seed=args.seed, monsters=args.entries, spells=args.entries, abilities=args.entries,
+			shops=0, maps=1, map_width=args.map_size, map_height=args.map_size, map_kind="noise", files=args.files,
+		)
+		mb = sum(p.stat().st_size for p in root.rglob("*.json")) / 1e6
+		print(f"catalog: {args.entries} entries x 3 kinds in {args.files} files each, {args.map_size}x{args.map_size} map, {mb:.1f} MB")
+
+		rows = [
+			("monsters", MonsterModel, load_monsters),
+			("spells", SpellModel, load_spells),
+			("abilities", AbilityModel, load_abilities),
+		]
+		for kind, model, bulk in rows:
+			paths = sorted((root / kind).glob("*.json"))
+			old = _time(lambda: [_per_entry(p, model) for p in paths])
+			new = _time(lambda: [bulk(p) for p in paths])
+			print(f"{kind:9s} per-entry {old:8.1f} ms   bulk {new:8.1f} ms   x{old / max(new, 1e-9):.1f}")
+		big = root / "maps" / "synth_map_000.json"
+		old = _time(lambda: _per_cell_map(big))
+		new = _time(lambda: load_map(big))
+		print(f"{'map':9s} per-cell  {old:8.1f} ms   mask {new:8.1f} ms   x{old / max(new, 1e-9):.1f}")
+
+		serial = _time(lambda: load_catalog(root, workers=1))
+		threaded = _time(lambda: load_catalog(root, workers=args.workers))
+		print(f"catalog   1 worker  {serial:8.1f} ms   {args.workers} workers {threaded:8.1f} ms")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
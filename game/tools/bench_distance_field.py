@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Optional
+
+from ..engine.distance_field import DistanceField
+from ..engine.grid import Grid
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Shared distance field cost per monster phase by pack size")
+	parser.add_argument("--size", type=int, default=40)
+	parser.add_argument("--iterations", type=int, default=200)
+	args = parser.parse_args(argv)
+
+	n = args.size
+	blocked = {(n // 2, y) for y in range(n - 4)}
+	grid = Grid(width=n, height=n, blocked=blocked)
+	goal = (2, 2)
+	for pack in (1, 5, 20, 50):
+		starts = [(n - 2 - i % 10, n - 2 - i // 10) for i in range(pack)]
+		t0 = time.perf_counter()
+		for _ in range(args.iterations):
+			field = DistanceField(grid, [goal])
+			field.occupy(goal)
+			for p in starts:
+				field.occupy(p)
+			for p in starts:
+				pos = p
+				for _ in range(3):
+					nxt = field.descend(pos)
+					if nxt is None:
+						break
+					field.move(pos, nxt)
+					pos = nxt
+		phase_us = (time.perf_counter() - t0) / args.iterations * 1e6
+		print(f"{pack:3d} monsters  {phase_us:9.2f} us/phase  ({n}x{n} grid)")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from dataclasses import replace
+from typing import Optional
+
+from ..app.game_loop import load_content_and_init, start_combat
+from ..engine.ability import REGISTRY
+from ..engine.combat import resolve_ability_effects
+from ..engine.combat_sim import Cast, apply, snapshot_combat
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Ability resolution throughput against growing monster packs")
+	parser.add_argument("--iterations", type=int, default=20000)
+	args = parser.parse_args(argv)
+
+	n = args.iterations
+	for size in (1, 10, 30, 100):
+		state = load_content_and_init()
+		start_combat(state, state.monsters[0], size=size)
+		cs = state.combat_state
+		ability = REGISTRY["push_shot"]
+		for m in cs.monsters:
+			m.stats = replace(m.stats, hp=10**9, current_hp=10**9)
+		target = cs.monsters[-1]
+		cs.player.position = (target.position[0] - 3, target.position[1])
+		cs.combat_grid.blocked.clear()
+
+		cast_pos = target.position
+		t0 = time.perf_counter()
+		for _ in range(n):
+			cs.player_ap = 100
+			resolve_ability_effects(ability, state.player, target.position, cs)
+			cs.place_monster(target, cast_pos)
+			cs.log.entries.clear()
+		live_rate = n / (time.perf_counter() - t0)
+
+		snap = snapshot_combat(cs)
+		cast = Cast(0, ability.id, target.position)
+		snap = snap._replace(ap=(10**6,) + snap.ap[1:])
+		t0 = time.perf_counter()
+		for _ in range(n):
+			apply(snap, cast)
+		sim_rate = n / (time.perf_counter() - t0)
+		print(f"{size:4d} monsters  live {live_rate:10.0f} casts/s  sim {sim_rate:10.0f} casts/s")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
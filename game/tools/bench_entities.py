@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Optional
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from ..app.iso import SCREEN_H, SCREEN_W, iso_coords_scaled
+from ..app.ui.atlas import atlas_for, blit_sorted
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Entity drawing per frame: shape rasterization vs atlas blits")
+	parser.add_argument("--frames", type=int, default=200)
+	args = parser.parse_args(argv)
+
+	pygame.init()
+	screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+	scale = 1.2
+	tw = int(64 * scale)
+	th = int(24 * scale)
+	atlas = atlas_for(tw, th, scale)
+	rng = random.Random(7)
+	for count in (50, 200, 800):
+		cells = [(rng.randrange(8, 40), rng.randrange(0, 30)) for _ in range(count)]
+		placed = []
+		for x, y in cells:
+			sx, sy = iso_coords_scaled(x, y, tw, th)
+			placed.append((x, y, sx - 300, sy))
+
+		t0 = time.perf_counter()
+		for _ in range(args.frames):
+			for x, y, sx, sy in placed:
+				pygame.draw.ellipse(screen, (0, 0, 0), pygame.Rect(sx + tw // 2 - 9, sy + th // 2 + 4, 18, 6))
+				pygame.draw.circle(screen, (200, 60, 60), (sx + tw // 2, sy + th // 2), max(6, int(10 * scale)))
+		shapes_ms = (time.perf_counter() - t0) * 1000.0 / args.frames
+
+		t0 = time.perf_counter()
+		for _ in range(args.frames):
+			blit_sorted(screen, [((x + y, x, 0), atlas.draw("monster", sx, sy)) for x, y, sx, sy in placed])
+		atlas_ms = (time.perf_counter() - t0) * 1000.0 / args.frames
+		print(f"{count:4d} entities  shapes {shapes_ms:7.2f} ms/frame  atlas {atlas_ms:7.2f} ms/frame")
+	pygame.quit()
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import Callable, List, Optional, Tuple
+
+from ..app.game_loop import CONTENT_DIR, build_grid_from_map
+from ..engine.content import load_map
+from ..engine.grid import Grid
+from ..engine.pathfinding import GridLike, SearchStats, astar, jps
+
+
+def _run(search: Callable, grid: GridLike, pairs: List[Tuple]) -> Tuple[float, float]:
+	stats = SearchStats()
+	t0 = time.perf_counter()
+	for a, b in pairs:
+		search(grid, a, b, stats=stats)
+	ms = (time.perf_counter() - t0) * 1000.0 / len(pairs)
+	return ms, stats.expanded / len(pairs)
+
+
+def _pairs(grid: GridLike, count: int, rng: random.Random) -> List[Tuple]:
+	cells = [(x, y) for y in range(grid.height) for x in range(grid.width) if grid.walkable(x, y)]
+	return [tuple(rng.sample(cells, 2)) for _ in range(count)]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Nodes expanded and time per query: A* vs Jump Point Search")
+	parser.add_argument("--queries", type=int, default=50)
+	parser.add_argument("--sizes", type=int, nargs="*", default=[64, 256])
+	parser.add_argument("--walls", type=float, default=0.05)
+	args = parser.parse_args(argv)
+
+	rng = random.Random(5)
+	maps: List[Tuple[str, GridLike]] = []
+	for path in sorted((CONTENT_DIR / "maps").glob("*.json")):
+		maps.append((path.stem, build_grid_from_map(load_map(path))))
+	for n in args.sizes:
+		blocked = {(x, y) for y in range(n) for x in range(n) if rng.random() < args.walls}
+		maps.append((f"open {n}x{n}", Grid(width=n, height=n, blocked=blocked)))
+
+	print(f"{'map':18s} {'A* ms':>8s} {'expanded':>9s} {'JPS ms':>8s} {'expanded':>9s}")
+	for name, grid in maps:
+		pairs = _pairs(grid, args.queries, rng)
+		a_ms, a_n = _run(astar, grid, pairs)
+		j_ms, j_n = _run(jps, grid, pairs)
+		print(f"{name:18s} {a_ms:8.2f} {a_n:9.1f} {j_ms:8.2f} {j_n:9.1f}")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from typing import Callable, Optional
+
+from ..engine.dr_types import Element, Unit, UnitStats
+from ..engine.entities import Monster
+from ..engine.inventory import ITEMS
+from ..engine.stats import Stats
+
+
+def _measure(n: int, build: Callable[[int], object]) -> float:
+	gc.collect()
+	tracemalloc.start()
+	before = tracemalloc.get_traced_memory()[0]
+	objs = [build(i) for i in range(n)]
+	after = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	# The list itself holds one pointer per object
+	per = (after - before - sys.getsizeof(objs)) / n
+	del objs
+	return per
+
+
+def _unslotted(cls: type) -> type:
+	return make_dataclass(f"Dict{cls.__name__}", [(f.name, f.type, f) for f in fields(cls)])
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Bytes per instance of engine value types")
+	parser.add_argument("--count", type=int, default=100_000)
+	args = parser.parse_args(argv)
+
+	n = args.count
+	potion = ITEMS["health_potion"]
+	stack_fields = {f.name: getattr(potion, f.name) for f in fields(potion)}
+	DictStats = _unslotted(Stats)
+	DictMonster = _unslotted(Monster)
+	DictStack = _unslotted(type(potion))
+	DictUnitStats = _unslotted(UnitStats)
+	DictUnit = _unslotted(Unit)
+
+	rows = [
+		(
+			"Monster (+ Stats)",
+			lambda i: Monster(id="slime", name="Slime", stats=Stats(hp=70, ap=6, mp=3, atk=12, res=3), position=(i, i), tags={"monster"}),
+			lambda i: DictMonster(tag_mask=1, id="slime", name="Slime", stats=DictStats(hp=70, ap=6, mp=3, atk=12, res=3, current_hp=70, current_mp=3, armor=0), position=(i, i), abilities=[], combat_ap=0, combat_mp=0),
+		),
+		(
+			"inventory stack",
+			lambda i: type(potion)(**{**stack_fields, "quantity": i % 10 + 1}),
+			lambda i: DictStack(**{**stack_fields, "quantity": i % 10 + 1}),
+		),
+		(
+			"dr Unit (+ UnitStats)",
+			lambda i: Unit(id="u", name="Unit", element=Element.T, stats=UnitStats(hp=100, atk=10, df=15, spd=22, wis=5, pow=5), position=(i, i)),
+			lambda i: DictUnit(id="u", name="Unit", element=Element.T, stats=DictUnitStats(hp=100, atk=10, df=15, spd=22, wis=5, pow=5), position=(i, i), states=[], directive=Unit.__dataclass_fields__["directive"].default, focus=0, ap=0),
+		),
+	]
+	print(f"{n} instances each")
+	for label, slotted, plain in rows:
+		a = _measure(n, slotted)
+		b = _measure(n, plain)
+		print(f"{label:24s} slots {a:7.1f} B   __dict__ {b:7.1f} B   ({100.0 * (b - a) / b:4.1f}% less)")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
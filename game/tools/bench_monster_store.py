@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import replace
+from typing import Callable, Optional
+
+from ..engine.combat import check_combat_trigger
+from ..engine.entities import Monster
+from ..engine.monster_store import MonsterStore
+from ..engine.stats import Stats
+
+
+def _measure(build: Callable[[], object]) -> tuple[object, float]:
+	gc.collect()
+	tracemalloc.start()
+	before = tracemalloc.get_traced_memory()[0]
+	built = build()
+	after = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	return built, (after - before) / 1024.0 / 1024.0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Roaming monsters: List[Monster] vs column store")
+	parser.add_argument("--count", type=int, default=50_000)
+	parser.add_argument("--size", type=int, default=1024)
+	parser.add_argument("--queries", type=int, default=2_000)
+	args = parser.parse_args(argv)
+
+	n = args.count
+	rng = random.Random(11)
+	cells = [(rng.randrange(args.size), rng.randrange(args.size)) for _ in range(n)]
+	steps = [(x + rng.choice((-1, 0, 1)), y + rng.choice((-1, 0, 1))) for x, y in cells]
+	probes = [(rng.randrange(args.size), rng.randrange(args.size)) for _ in range(args.queries)]
+	template = Monster(id="slime", name="Slime", stats=Stats(hp=70, ap=6, mp=3, atk=12, res=3), position=(0, 0), tags={"monster"}, abilities=["bite"])
+
+	def build_list():
+		return [replace(template, stats=replace(template.stats), abilities=list(template.abilities), position=c) for c in cells]
+
+	def build_store():
+		store = MonsterStore()
+		store.spawn(template, cells)
+		return store
+
+	t0 = time.perf_counter()
+	objects, list_mb = _measure(build_list)
+	list_spawn = time.perf_counter() - t0
+	t0 = time.perf_counter()
+	store, store_mb = _measure(build_store)
+	store_spawn = time.perf_counter() - t0
+	print(f"{n} monsters on {args.size}x{args.size}")
+	print(f"spawn      list {list_spawn * 1000:8.1f} ms {list_mb:6.1f} MiB   store {store_spawn * 1000:8.1f} ms {store_mb:6.1f} MiB")
+
+	t0 = time.perf_counter()
+	for m, pos in zip(objects, steps):
+		m.position = pos
+	list_move = time.perf_counter() - t0
+	t0 = time.perf_counter()
+	store.move_many(range(n), steps)
+	store_move = time.perf_counter() - t0
+	print(f"move all   list {list_move * 1000:8.1f} ms              store {store_move * 1000:8.1f} ms")
+
+	t0 = time.perf_counter()
+	for p in probes:
+		check_combat_trigger(p, objects)
+	list_q = (time.perf_counter() - t0) * 1e6 / len(probes)
+	t0 = time.perf_counter()
+	for p in probes:
+		check_combat_trigger(p, store)
+	store_q = (time.perf_counter() - t0) * 1e6 / len(probes)
+	print(f"trigger    list {list_q:8.1f} us/query         store {store_q:8.1f} us/query")
+
+	t0 = time.perf_counter()
+	for p in probes[:200]:
+		store.in_rect(p[0], p[1], p[0] + 24, p[1] + 24)
+	rect_q = (time.perf_counter() - t0) * 1e6 / min(200, len(probes))
+	print(f"25x25 view                             store {rect_q:8.1f} us/query")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
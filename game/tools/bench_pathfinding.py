@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import Optional
+
+from ..app.game_loop import load_content_and_init, plan_travel, travel_to_map, zone_terrain
+from ..engine.pathfinding import ClusterGraph, astar
+from ..engine.procgen import generate_zone
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Long click-to-move queries: A* vs hierarchical (HPA*)")
+	parser.add_argument("--size", type=int, default=512)
+	parser.add_argument("--queries", type=int, default=30)
+	parser.add_argument("--seed", type=int, default=1)
+	args = parser.parse_args(argv)
+
+	n = args.size
+	grid = generate_zone("caves", n, n, args.seed).grid()
+	rng = random.Random(args.seed)
+	open_cells = [(x, y) for y in range(n) for x in range(n) if grid.walkable(x, y)]
+	pairs = []
+	while len(pairs) < args.queries:
+		a, b = rng.sample(open_cells, 2)
+		if abs(a[0] - b[0]) + abs(a[1] - b[1]) >= n // 2:
+			pairs.append((a, b))
+
+	t0 = time.perf_counter()
+	exact = [astar(grid, a, b) for a, b in pairs]
+	astar_ms = (time.perf_counter() - t0) * 1000.0 / len(pairs)
+
+	graph = ClusterGraph(grid)
+	t0 = time.perf_counter()
+	for a, b in pairs:
+		graph.find_path(a, b)
+	cold_ms = (time.perf_counter() - t0) * 1000.0 / len(pairs)
+	t0 = time.perf_counter()
+	hpa = [graph.find_path(a, b) for a, b in pairs]
+	warm_ms = (time.perf_counter() - t0) * 1000.0 / len(pairs)
+	t0 = time.perf_counter()
+	for a, b in pairs:
+		graph._abstract(a, b, graph.cluster_of(a), graph.cluster_of(b))
+	abstract_ms = (time.perf_counter() - t0) * 1000.0 / len(pairs)
+
+	ratio = [len(p) / max(1, len(e)) for p, e in zip(hpa, exact) if p is not None and e is not None]
+	print(f"caves {n}x{n}, {len(pairs)} queries of at least {n // 2} steps")
+	print(f"A*                {astar_ms:8.2f} ms/query")
+	print(f"HPA* first touch  {cold_ms:8.2f} ms/query  (builds clusters on the way)")
+	print(f"HPA* warm         {warm_ms:8.2f} ms/query  abstract search alone {abstract_ms:6.2f} ms  path length x{sum(ratio) / max(1, len(ratio)):.3f} of optimal")
+
+	state = load_content_and_init()
+	travel_to_map(state, "zone_exploration")
+	goal = zone_terrain("zone_dungeon", state.world_seed)[2]
+	plan_travel(state, "zone_dungeon", goal)
+	t0 = time.perf_counter()
+	legs = plan_travel(state, "zone_dungeon", goal)
+	route_ms = (time.perf_counter() - t0) * 1000.0
+	print(f"exploration -> hub -> dungeon route {route_ms:8.2f} ms  ({' -> '.join(m for m, _ in legs or [])})")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
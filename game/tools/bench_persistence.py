@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from ..app.game_loop import create_player_with_progression
+from ..app.persistence import ProfileStore
+from ..engine.inventory import get_item_by_id
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Batched SQLite profile writes under sustained mutation load")
+	parser.add_argument("--players", type=int, default=2000)
+	parser.add_argument("--ticks", type=int, default=50)
+	parser.add_argument("--db", type=Path, default=None)
+	parser.add_argument("--seed", type=int, default=1)
+	args = parser.parse_args(argv)
+
+	rng = random.Random(args.seed)
+	with tempfile.TemporaryDirectory() as tmp:
+		db = args.db or Path(tmp) / "profiles.db"
+		store = ProfileStore(db)
+		players = []
+		for i in range(args.players):
+			p = create_player_with_progression()
+			p.id = f"player_{i}"
+			store.attach(p)
+			players.append(p)
+		store.flush()
+
+		potion = get_item_by_id("health_potion")
+		updates = 0
+		commit_time = 0.0
+		t0 = time.perf_counter()
+		for _ in range(args.ticks):
+			for p in players:
+				roll = rng.random()
+				if roll < 0.5:
+					p.add_gold(rng.randint(-5, 20))
+				elif roll < 0.8:
+					p.inventory.add_item(potion)
+				elif roll < 0.9:
+					p.inventory.remove_item("health_potion", 1)
+				else:
+					p.quest_log.update_objective("first_blood", "kill_slime", 1)
+				updates += 1
+			c0 = time.perf_counter()
+			store.commit()
+			commit_time += time.perf_counter() - c0
+		game_time = time.perf_counter() - t0
+		store.flush()
+		total = time.perf_counter() - t0
+		store.close()
+
+		s = store.stats
+		print(f"players={args.players} ticks={args.ticks} updates={updates}")
+		print(f"game-thread time {game_time * 1000:.1f} ms (commit {commit_time * 1000:.1f} ms, {commit_time * 1000 / args.ticks:.2f} ms/tick)")
+		print(f"durable after {total * 1000:.1f} ms -> {updates / total:,.0f} updates/s")
+		print(f"batches={s.batches} mutations={s.mutations} coalesced={s.coalesced} rows={s.rows}")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Optional
+
+from ..engine.procgen import GENERATORS, generate_zone
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Procedural zone generation time per map size")
+	parser.add_argument("--sizes", type=int, nargs="*", default=[128, 512, 1024])
+	parser.add_argument("--seed", type=int, default=1)
+	args = parser.parse_args(argv)
+
+	for kind in GENERATORS:
+		for n in args.sizes:
+			generate_zone.cache_clear()
+			t0 = time.perf_counter()
+			zone = generate_zone(kind, n, n, args.seed)
+			cold = (time.perf_counter() - t0) * 1000.0
+			t0 = time.perf_counter()
+			generate_zone(kind, n, n, args.seed).grid()
+			warm = (time.perf_counter() - t0) * 1000.0
+			print(f"{kind:6s} {n:5d}x{n:<5d} generate {cold:8.1f} ms   cached grid {warm:6.2f} ms   {len(zone.chunks)} chunks")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import argparse
+import pickle
+import sys
+import time
+from dataclasses import replace
+from typing import Callable, Optional
+
+from ..engine.entities import Player
+from ..engine.inventory import Inventory, EquipmentSlots, Consumable, ITEMS
+from ..engine.progression import Progression, WeaponSkills
+from ..engine.quests import QuestLog, QUESTS
+from ..engine.stats import Stats
+from ..engine.snapshot import encode_player_sections, decode_player_sections, pack_sections, unpack_sections
+
+
+def build_player(stacks: int, quests: int) -> Player:
+	inventory = Inventory(max_weight=float("inf"))
+	catalog = list(ITEMS.values())
+	for i in range(stacks):
+		if i % 4 == 0:
+			inventory.items.append(Consumable(
+				id=f"potion_{i % 50}",
+				name=f"Potion {i % 50}",
+				description="Restores a little HP",
+				weight=0.5,
+				value=10,
+				effect_type="heal",
+				effect_value=25,
+				quantity=5,
+			))
+		else:
+			inventory.items.append(replace(catalog[i % len(catalog)]))
+	quest_log = QuestLog()
+	for quest in QUESTS.values():
+		quest_log.add_quest(quest)
+	quest_log.completed_quests = [f"quest_{i}" for i in range(quests)]
+	player = Player(
+		id="player",
+		name="Hero",
+		stats=Stats(hp=100, ap=6, mp=3, atk=10, res=5),
+		position=(2, 2),
+		tags={"player"},
+		progression=Progression(weapon_skills=WeaponSkills(melee_damage=12), equipped_weapon="sword"),
+		inventory=inventory,
+		equipment=EquipmentSlots(weapon=ITEMS["iron_sword"], armor=ITEMS["leather_armor"]),
+		quest_log=quest_log,
+		gold=123456,
+	)
+	return player
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+	best = float("inf")
+	for _ in range(repeat):
+		t0 = time.perf_counter()
+		fn()
+		best = min(best, time.perf_counter() - t0)
+	return best * 1000.0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Snapshot size and encode/decode timings")
+	parser.add_argument("--repeat", type=int, default=5)
+	parser.add_argument("--sizes", type=int, nargs="*", default=[100, 1000, 10000])
+	args = parser.parse_args(argv)
+
+	print(f"{'stacks':>8} {'quests':>8} {'snap KB':>9} {'pickle KB':>10} {'encode ms':>10} {'decode ms':>10} {'pickle ms':>10} {'unpickle ms':>12}")
+	for n in args.sizes:
+		player = build_player(n, n)
+		blob = pack_sections(encode_player_sections(player))
+		pickled = pickle.dumps(player, protocol=pickle.HIGHEST_PROTOCOL)
+		enc = _time(lambda: pack_sections(encode_player_sections(player)), args.repeat)
+		dec = _time(lambda: decode_player_sections(unpack_sections(blob)), args.repeat)
+		penc = _time(lambda: pickle.dumps(player, protocol=pickle.HIGHEST_PROTOCOL), args.repeat)
+		pdec = _time(lambda: pickle.loads(pickled), args.repeat)
+		print(f"{n:>8} {n:>8} {len(blob) / 1024:>9.1f} {len(pickled) / 1024:>10.1f} {enc:>10.2f} {dec:>10.2f} {penc:>10.2f} {pdec:>12.2f}")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..engine.area import SHAPES
+from ..engine.inventory import ITEMS
+from ..engine.procgen import GENERATORS, connect
+
+
+# Writes a content tree (maps/, monsters/, spells/, abilities/, shops/) of any size
+# that validates against the models in engine.content, for stress runs and
+# benchmarks. Every kind draws from its own generator seeded with "<seed>:<kind>",
+# so the same seed always writes the same bytes and changing one count leaves the
+# other kinds alone.
+
+WEAPON_TYPES = ("sword", "bow", "staff")
+MONSTER_TAGS = ("monster", "beast", "undead", "elemental", "boss")
+_SYLLABLES = ("ka", "ro", "mi", "th", "ul", "ve", "zar", "gon", "li", "sha", "dra", "mo")
+
+
+def _rng(seed: int, kind: str) -> random.Random:
+	return random.Random(f"{seed}:{kind}")
+
+
+def _name(rng: random.Random) -> str:
+	return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def _effect(rng: random.Random) -> dict:
+	kind = rng.choice(("damage", "damage", "push", "buff_ap", "charge"))
+	if kind == "push":
+		return {"type": "push", "distance": rng.randint(1, 3)}
+	if kind == "buff_ap":
+		return {"type": "buff_ap", "amount": rng.randint(1, 3), "duration": rng.randint(1, 3)}
+	return {"type": kind, "amount": rng.randint(5, 60)}
+
+
+def _area(rng: random.Random) -> dict:
+	shape = rng.choice(SHAPES)
+	return {"shape": shape, "size": 0 if shape == "cell" else rng.randint(1, 3)}
+
+
+def _action(rng: random.Random, prefix: str, i: int) -> dict:
+	range_min = rng.randint(0, 2)
+	return {
+		"id": f"{prefix}_{i}",
+		"name": _name(rng),
+		"tags": rng.sample(("melee", "ranged", "projectile", "magic", "control", "buff"), 2),
+		"cost_ap": rng.randint(1, 5),
+		"range_min": range_min,
+		"range_max": range_min + rng.randint(0, 6),
+		"effects": [_effect(rng) for _ in range(rng.randint(1, 3))],
+		"area": _area(rng),
+	}
+
+
+def synth_spells(count: int, seed: int) -> List[dict]:
+	rng = _rng(seed, "spells")
+	return [_action(rng, "synth_spell", i) for i in range(count)]
+
+
+def synth_abilities(count: int, seed: int) -> List[dict]:
+	rng = _rng(seed, "abilities")
+	out = []
+	for i in range(count):
+		ability = _action(rng, "synth_ability", i)
+		ability["weapon_type"] = rng.choice(WEAPON_TYPES)
+		out.append(ability)
+	return out
+
+
+# Monsters only use spells that exist in the same catalog
+def synth_monsters(count: int, seed: int, spell_ids: List[str]) -> List[dict]:
+	rng = _rng(seed, "monsters")
+	pool = spell_ids or ["bolt"]
+	out = []
+	for i in range(count):
+		tags = ["monster"] + rng.sample(MONSTER_TAGS[1:], rng.randint(0, 2))
+		out.append({
+			"id": f"synth_monster_{i}",
+			"name": _name(rng),
+			"tags": tags,
+			"stats": {
+				"hp": rng.randint(20, 400) * (5 if "boss" in tags else 1),
+				"ap": rng.randint(4, 8),
+				"mp": rng.randint(2, 5),
+				"atk": rng.randint(5, 40),
+				"res": rng.randint(0, 15),
+			},
+			"abilities": rng.sample(pool, min(len(pool), rng.randint(1, 3))),
+		})
+	return out
+
+
+def synth_shops(count: int, items_per_shop: int, seed: int) -> List[dict]:
+	rng = _rng(seed, "shops")
+	item_ids = sorted(ITEMS)
+	shops = []
+	for i in range(count):
+		items = []
+		for _ in range(items_per_shop):
+			item = {"item_id": rng.choice(item_ids), "price": rng.randint(5, 500)}
+			if rng.random() < 0.3:
+				item["stock"] = rng.randint(1, 20)
+			items.append(item)
+		shops.append({"id": f"synth_shop_{i}", "name": f"{_name(rng)} Trading Post", "items": items})
+	return shops
+
+
+# One byte per cell (1 = wall). "noise" is independent walls at the given density;
+# the procgen kinds are connected like generated zones.
+def synth_cells(kind: str, width: int, height: int, seed: int, density: float = 0.2) -> bytearray:
+	if kind == "noise":
+		rng = _rng(seed, "maps")
+		n = width * height
+		threshold = int(density * 256)
+		return bytearray(1 if b < threshold else 0 for b in rng.randbytes(n))
+	cells = GENERATORS[kind](width, height, seed)
+	connect(cells, width, height)
+	return cells
+
+
+# Map files list walls as {"x", "y"} objects; built as text because at millions of
+# cells a dict per wall is most of the cost
+def map_json(name: str, width: int, height: int, cells: bytearray) -> str:
+	parts = []
+	i = cells.find(1)
+	while i >= 0:
+		parts.append(f'{{"x":{i % width},"y":{i // width}}}')
+		i = cells.find(1, i + 1)
+	return f'{{"name":{json.dumps(name)},"width":{width},"height":{height},"blocked":[{",".join(parts)}]}}'
+
+
+def _write_parts(directory: Path, stem: str, entries: List[dict], files: int) -> int:
+	if not entries:
+		return 0
+	directory.mkdir(parents=True, exist_ok=True)
+	files = max(1, min(files, len(entries)))
+	per_file = -(-len(entries) // files)
+	written = 0
+	for f in range(files):
+		part = entries[f * per_file:(f + 1) * per_file]
+		if part:
+			(directory / f"{stem}_{f:03d}.json").write_text(json.dumps(part, separators=(",", ":")))
+			written += 1
+	return written
+
+
+def write_catalog(
+	root: Path,
+	seed: int = 1,
+	monsters: int = 1000,
+	spells: int = 1000,
+	abilities: int = 1000,
+	shops: int = 10,
+	shop_items: int = 20,
+	maps: int = 1,
+	map_width: int = 256,
+	map_height: int = 256,
+	map_kind: str = "caves",
+	density: float = 0.2,
+	files: int = 1,
+) -> Dict[str, int]:
+	root = Path(root)
+	spell_list = synth_spells(spells, seed)
+	counts = {
+		"spells": _write_parts(root / "spells", "synth", spell_list, files),
+		"abilities": _write_parts(root / "abilities", "synth", synth_abilities(abilities, seed), files),
+		"monsters": _write_parts(root / "monsters", "synth", synth_monsters(monsters, seed, [s["id"] for s in spell_list]), files),
+		"shops": 0,
+		"maps": 0,
+	}
+	if shops:
+		(root / "shops").mkdir(parents=True, exist_ok=True)
+		for shop in synth_shops(shops, shop_items, seed):
+			(root / "shops" / f"{shop['id']}.json").write_text(json.dumps(shop, separators=(",", ":")))
+			counts["shops"] += 1
+	if maps:
+		(root / "maps").mkdir(parents=True, exist_ok=True)
+		for m in range(maps):
+			cells = synth_cells(map_kind, map_width, map_height, seed + m, density)
+			(root / "maps" / f"synth_map_{m:03d}.json").write_text(map_json(f"Synthetic {m}", map_width, map_height, cells))
+			counts["maps"] += 1
+	return counts
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Write a deterministic synthetic content catalog")
+	parser.add_argument("out", type=Path, help="content root to write into")
+	parser.add_argument("--seed", type=int, default=1)
+	parser.add_argument("--monsters", type=int, default=1000)
+	parser.add_argument("--spells", type=int, default=1000)
+	parser.add_argument("--abilities", type=int, default=1000)
+	parser.add_argument("--shops", type=int, default=10)
+	parser.add_argument("--shop-items", type=int, default=20)
+	parser.add_argument("--maps", type=int, default=1)
+	parser.add_argument("--map-size", type=int, nargs=2, default=[256, 256], metavar=("WIDTH", "HEIGHT"))
+	parser.add_argument("--map-kind", choices=["noise", *GENERATORS], default="caves")
+	parser.add_argument("--density", type=float, default=0.2, help="wall density for noise maps")
+	parser.add_argument("--files", type=int, default=1, help="files per monster/spell/ability directory")
+	args = parser.parse_args(argv)
+
+	counts = write_catalog(
+		args.out,
+		seed=args.seed,
+		monsters=args.monsters,
+		spells=args.spells,
+		abilities=args.abilities,
+		shops=args.shops,
+		shop_items=args.shop_items,
+		maps=args.maps,
+		map_width=args.map_size[0],
+		map_height=args.map_size[1],
+		map_kind=args.map_kind,
+		density=args.density,
+		files=args.files,
+	)
+	size = sum(p.stat().st_size for p in args.out.rglob("*.json"))
+	print(f"wrote {', '.join(f'{n} {kind} files' for kind, n in counts.items())} to {args.out} ({size / 1e6:.1f} MB)")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())